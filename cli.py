@@ -0,0 +1,450 @@
+# cli.py
+# Headless entry point for batch jobs (cron, containers, scripts).
+# It is built on the core modules only and must never import PyQt6, so it starts
+# instantly and runs without a display. Accounts are authorized in the GUI first.
+#
+# Examples:
+#   python cli.py accounts
+#   python cli.py orgs
+#   python cli.py sync --account 1
+#   python cli.py list drafts --account 1 --org 600000001 --json
+#   python cli.py create-invoices invoices.json --account 1 --org 600000001
+#   python cli.py import-contacts contacts.xlsx --account 1 --org 600000001
+#   python cli.py import-invoices invoice_lines.csv --account 1 --org 600000001
+#   python cli.py export invoices invoices.parquet --account 1
+#   python cli.py send-drafts --dry-run
+#   python cli.py send-drafts --account 1 --org 600000001
+#   python cli.py resume
+
+import argparse
+import json
+import sys
+from dataclasses import asdict
+
+from core.config_manager import ConfigManager
+from core.auth_manager import AuthManager
+from core.invoice_api import InvoiceApi
+from core.local_store import LocalStore
+from core.models import Organization, parse_records
+from core.delta_sync import DeltaSync
+from core.token_provider import TokenProvider
+from core.bulk_sender import BulkInvoiceSender
+from core.send_queue import SendQueue, PENDING, IN_FLIGHT, FAILED
+from core.contact_importer import ContactImporter, ContactIndex, CREATED, SKIPPED, FAILED as IMPORT_FAILED
+from core.file_import import InvoiceImporter, import_customers_file
+from core.file_export import EXPORTS, RecordExporter, api_pages, store_pages
+
+# list command name -> (local store entity, invoice status filter, columns printed per record)
+_LISTS = {
+    'items': ('items', None, ('item_id', 'name', 'rate')),
+    'contacts': ('contacts', None, ('contact_id', 'contact_name', 'email')),
+    'invoices': ('invoices', None, ('invoice_id', 'invoice_number', 'customer_name', 'status', 'total')),
+    'drafts': ('invoices', 'draft', ('invoice_id', 'invoice_number', 'customer_name', 'total')),
+}
+
+class CliController:
+    """Runs the batch operations of the dashboard for one or many accounts and organizations."""
+
+    def __init__(self):
+        self.config_manager = ConfigManager()
+        self.auth_manager = AuthManager()
+        self.token_provider = TokenProvider(self.config_manager, self.auth_manager)
+        self.invoice_api = InvoiceApi()
+        self.delta_sync = DeltaSync(self.invoice_api)
+        self.send_queue = SendQueue()
+        self.failures = 0
+
+    def fail(self, message: str):
+        """Reports a failure on stderr; the process exits non-zero at the end."""
+        self.failures += 1
+        print(f"Error: {message}", file=sys.stderr)
+
+    # --- Target selection ---
+
+    def target_accounts(self, requested: list | None) -> list[int]:
+        """The requested account indexes, or every authorized account."""
+        available = sorted(self.config_manager.discover_credentials())
+        if requested:
+            for index in requested:
+                if index not in available:
+                    self.fail(f"Account {index} does not exist.")
+            return [index for index in requested if index in available]
+        return [index for index in available if self.config_manager.load_credentials(index).get('refresh_token')]
+
+    def organizations(self, account_index: int, refresh: bool = False) -> list[dict]:
+        """
+        Returns the account's organizations, from the list cached in its account file
+        unless `refresh` is set or nothing was cached yet. They are cached in the same
+        shape the dashboard uses (an Organization as a dict).
+        """
+        cached_organizations = self.config_manager.load_credentials(account_index).get('organizations')
+        if cached_organizations and not refresh:
+            return [asdict(org) for org in parse_records(Organization, cached_organizations)]
+        access_token = self.token_provider.get_token(account_index)
+        org_data = self.invoice_api.get_organizations(access_token)
+        if org_data.get('code') != 0:
+            raise ConnectionError(org_data.get('message', 'Could not fetch organizations.'))
+        organizations_list = [asdict(org) for org in parse_records(Organization, org_data.get('organizations', []))]
+        if organizations_list != cached_organizations:
+            self.config_manager.save_credentials(account_index, {'organizations': organizations_list})
+        return organizations_list
+
+    def targets(self, args) -> list[tuple[int, dict]]:
+        """Every (account index, organization) pair selected by --account and --org."""
+        pairs = []
+        for account_index in self.target_accounts(args.account):
+            try:
+                organizations_list = self.organizations(account_index)
+            except (ValueError, ConnectionError) as e:
+                self.fail(f"Account {account_index}: {e}")
+                continue
+            for org in organizations_list:
+                if not args.org or org['organization_id'] in args.org:
+                    pairs.append((account_index, org))
+        if args.org:
+            found = {org['organization_id'] for _, org in pairs}
+            for org_id in args.org:
+                if org_id not in found:
+                    self.fail(f"Organization {org_id} was not found in the selected account(s).")
+        return pairs
+
+    def single_target(self, args) -> tuple[int, dict] | None:
+        """The one (account, organization) pair a write command works on."""
+        pairs = self.targets(args)
+        if len(pairs) != 1:
+            if pairs:
+                self.fail("This command needs exactly one organization; narrow it down with --account and --org.")
+            return None
+        return pairs[0]
+
+    def sync_entity(self, account_index: int, org: dict, entity: str, force_full: bool = False,
+                    status: str = None) -> LocalStore:
+        """
+        Brings the organization's local mirror of `entity` (only invoices of `status`,
+        if given) up to date and returns the store.
+        """
+        store = LocalStore(org['organization_id'])
+        access_token = self.token_provider.get_token(account_index)
+        self.delta_sync.sync(access_token, org['organization_id'], store, entity, force_full=force_full, status=status)
+        return store
+
+    # --- Commands ---
+
+    def cmd_accounts(self, args):
+        for index, label in sorted(self.config_manager.discover_credentials().items()):
+            creds = self.config_manager.load_credentials(index)
+            status = "authorized" if creds.get('refresh_token') else "not authorized"
+            print(f"{index}\t{label}\t{status}\t{len(creds.get('organizations') or [])} organization(s)")
+
+    def cmd_orgs(self, args):
+        for account_index in self.target_accounts(args.account):
+            try:
+                organizations_list = self.organizations(account_index, refresh=True)
+            except (ValueError, ConnectionError) as e:
+                self.fail(f"Account {account_index}: {e}")
+                continue
+            for org in organizations_list:
+                print(f"{account_index}\t{org['organization_id']}\t{org.get('name', '')}")
+
+    def cmd_sync(self, args):
+        for account_index, org in self.targets(args):
+            for entity in args.entity or ('items', 'contacts', 'invoices'):
+                try:
+                    store = LocalStore(org['organization_id'])
+                    access_token = self.token_provider.get_token(account_index)
+                    changed_count, was_full = self.delta_sync.sync(
+                        access_token, org['organization_id'], store, entity, force_full=args.full
+                    )
+                except (ValueError, ConnectionError) as e:
+                    self.fail(f"{org.get('name')} ({org['organization_id']}) {entity}: {e}")
+                    continue
+                kind = "full" if was_full else "delta"
+                print(f"{org.get('name')} ({org['organization_id']}): {entity} {kind} sync, "
+                      f"{changed_count} change(s), {store.count(entity)} stored.")
+
+    def cmd_list(self, args):
+        entity, status, columns = _LISTS[args.what]
+        for account_index, org in self.targets(args):
+            try:
+                if args.offline:
+                    store = LocalStore(org['organization_id'])
+                else:
+                    store = self.sync_entity(account_index, org, entity, status=status)
+            except (ValueError, ConnectionError) as e:
+                self.fail(f"{org.get('name')} ({org['organization_id']}) {args.what}: {e}")
+                continue
+            for record in store.load(entity, status=status):
+                if args.json:
+                    print(json.dumps({'account': account_index, 'organization_id': org['organization_id'], **record}))
+                else:
+                    print("\t".join([org['organization_id'], *(str(record.get(c, '')) for c in columns)]))
+
+    def cmd_create_invoices(self, args):
+        """Creates every invoice in a JSON file holding one invoice payload or a list of them."""
+        try:
+            with open(args.file, 'r') as f:
+                payloads = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            self.fail(f"Could not read {args.file}: {e}")
+            return
+        if isinstance(payloads, dict):
+            payloads = [payloads]
+        target = self.single_target(args)
+        if target is None:
+            return
+        account_index, org = target
+        store = LocalStore(org['organization_id'])
+        for number, invoice_data in enumerate(payloads, start=1):
+            try:
+                access_token = self.token_provider.get_token(account_index)
+                response = self.invoice_api.create_invoice(access_token, org['organization_id'], invoice_data)
+            except (ValueError, ConnectionError) as e:
+                self.fail(f"Invoice {number}: {e}")
+                continue
+            if response.get('code') == 0:
+                store.upsert('invoices', [response['invoice']])
+                print(f"Invoice {number}: created {response['invoice']['invoice_id']}")
+            else:
+                self.fail(f"Invoice {number}: {response.get('message', 'An unknown API error occurred.')}")
+
+    def cmd_import_contacts(self, args):
+        """Creates the contacts listed in a CSV/XLSX file (display_name, email), skipping existing ones."""
+        target = self.single_target(args)
+        if target is None:
+            return
+        account_index, org = target
+        try:
+            store = self.sync_entity(account_index, org, 'contacts')
+            access_token = self.token_provider.get_token(account_index)
+
+            def on_result(result: dict):
+                if result['contact']:
+                    store.upsert('contacts', [result['contact']])
+                self.report_import_row(result, f"'{result['contact_name']}'")
+
+            counts = import_customers_file(ContactImporter(self.invoice_api), access_token, org['organization_id'],
+                                           args.file, ContactIndex(store.load('contacts')), on_result=on_result)
+        except (OSError, ValueError, ConnectionError) as e:
+            self.fail(f"Could not import {args.file}: {e}")
+            return
+        print(f"Created {counts[CREATED]}, skipped {counts[SKIPPED]}, failed {counts[IMPORT_FAILED]}.")
+
+    def cmd_import_invoices(self, args):
+        """Creates invoices from a CSV/XLSX file with one row per line item, grouped by its 'invoice' column."""
+        target = self.single_target(args)
+        if target is None:
+            return
+        account_index, org = target
+        try:
+            self.sync_entity(account_index, org, 'contacts')
+            store = self.sync_entity(account_index, org, 'items')
+            access_token = self.token_provider.get_token(account_index)
+
+            def on_result(result: dict):
+                if result['invoice']:
+                    store.upsert('invoices', [result['invoice']])
+                self.report_import_row(result, f"invoice '{result['invoice_key']}'")
+
+            counts = InvoiceImporter(self.invoice_api, store).run(access_token, org['organization_id'],
+                                                                  args.file, on_result=on_result)
+        except (OSError, ValueError, ConnectionError) as e:
+            self.fail(f"Could not import {args.file}: {e}")
+            return
+        print(f"Created {counts[CREATED]}, failed {counts[IMPORT_FAILED]}.")
+
+    def cmd_export(self, args):
+        """
+        Writes items, contacts, invoices or drafts of the selected organizations to one
+        CSV/Parquet file, a page at a time. By default the local mirror is synced first
+        and read back; --from-api streams the API's pages without touching the mirror.
+        """
+        entity, status = EXPORTS[args.what]
+        pairs = self.targets(args)
+        if not pairs:
+            return
+        try:
+            with RecordExporter(args.file, entity) as exporter:
+                for account_index, org in pairs:
+                    organization_id = org['organization_id']
+                    if args.from_api:
+                        pages = api_pages(self.invoice_api, self.token_provider.get_token(account_index),
+                                          organization_id, args.what)
+                    elif args.offline:
+                        pages = store_pages(LocalStore(organization_id), args.what)
+                    else:
+                        pages = store_pages(self.sync_entity(account_index, org, entity, status=status), args.what)
+                    before = exporter.count
+                    for page in pages:
+                        exporter.write_page(organization_id, page)
+                    print(f"{org.get('name')} ({organization_id}): {exporter.count - before} {args.what} exported.")
+        except (OSError, ValueError, ConnectionError) as e:
+            self.fail(f"Could not export to {args.file}: {e}")
+            return
+        print(f"Wrote {exporter.count} {args.what} to {args.file}.")
+
+    def report_import_row(self, result: dict, label: str):
+        if result['status'] == SKIPPED:
+            print(f"Row {result['row']} {label}: skipped, {result['detail']}")
+        elif result['status'] == IMPORT_FAILED:
+            self.fail(f"Row {result['row']} {label}: {result['detail']}")
+
+    def cmd_send_drafts(self, args):
+        """
+        Emails every draft invoice whose customer has an email address, like the dashboard's send.
+        Sending needs one organization named with --account/--org, or --all for every
+        selected one; a dry run may look at all of them.
+        """
+        if args.all or args.dry_run:
+            pairs = self.targets(args)
+        elif not args.org:
+            self.fail("send-drafts emails customers; name the organization with --account and --org, "
+                      "or pass --all to send the drafts of every organization.")
+            return
+        else:
+            target = self.single_target(args)
+            pairs = [target] if target else []
+        for account_index, org in pairs:
+            org_label = f"{org.get('name')} ({org['organization_id']})"
+            try:
+                self.sync_entity(account_index, org, 'contacts')
+                # A delta sync of drafts does not see drafts that were sent meanwhile
+                # (they are no longer listed as drafts), so re-list them all before sending.
+                store = self.sync_entity(account_index, org, 'invoices', force_full=True, status='draft')
+            except (ValueError, ConnectionError) as e:
+                self.fail(f"{org_label}: {e}")
+                continue
+            drafts = store.load('invoices', status='draft')
+            if args.invoice:
+                drafts = [inv for inv in drafts if inv['invoice_id'] in args.invoice]
+            sendable_invoices = []
+            for inv_data in drafts:
+                customer = store.get('contacts', inv_data.get('customer_id')) or {}
+                if customer.get('email'):
+                    sendable_invoices.append({
+                        'invoice_id': inv_data['invoice_id'],
+                        'customer_email': customer.get('email'),
+                        'customer_name': customer.get('contact_name')
+                    })
+                else:
+                    self.fail(f"{org_label}: '{inv_data.get('customer_name', 'Unknown Customer')}' has no email address.")
+            if args.dry_run:
+                for invoice_info in sendable_invoices:
+                    print(f"{org_label}: would send {invoice_info['invoice_id']} to {invoice_info['customer_email']}")
+                continue
+            if not sendable_invoices:
+                print(f"{org_label}: no draft invoices to send.")
+                continue
+            job_id, skipped_invoices = self.send_queue.create_job(account_index, org['organization_id'], sendable_invoices)
+            for invoice_info in skipped_invoices:
+                if invoice_info['state'] == IN_FLIGHT:
+                    print(f"{org_label}: {invoice_info['invoice_id']} may have been sent by an interrupted run "
+                          f"that could not be confirmed, skipping; check it in Zoho.")
+                else:
+                    print(f"{org_label}: {invoice_info['invoice_id']} was already sent, skipping.")
+            if job_id is not None:
+                self.run_send_job(job_id, org_label)
+
+    def cmd_resume(self, args):
+        """Finishes open send jobs left by an interrupted or partly failed run, retrying failures."""
+        jobs = [job for job in self.send_queue.open_jobs() if not args.job or job['job_id'] in args.job]
+        if not jobs:
+            print("No unfinished send jobs.")
+        for job in jobs:
+            counts = job['counts']
+            print(f"Job {job['job_id']} (Account {job['account_index']}, organization {job['organization_id']}): "
+                  f"{counts[PENDING] + counts[IN_FLIGHT] + counts[FAILED]} invoice(s) left.")
+            self.send_queue.retry_failed(job['job_id'])
+            self.run_send_job(job['job_id'], f"Job {job['job_id']}")
+
+    def run_send_job(self, job_id: int, label: str):
+        """
+        Sends what is left of a send job. The job is closed when everything went out;
+        otherwise it stays open so `resume` can retry the failures.
+        """
+        job = self.send_queue.job(job_id)
+        try:
+            access_token = self.token_provider.get_token(job['account_index'])
+        except (ValueError, ConnectionError) as e:
+            self.fail(f"{label}: {e}")
+            return
+        sender = BulkInvoiceSender(self.invoice_api)
+        success_count, failed_entries = sender.run_job(access_token, self.send_queue, job_id)
+        print(f"{label}: sent {success_count}, failed {len(failed_entries)}.")
+        for entry in failed_entries:
+            self.fail(f"{label}: {entry}")
+        if not failed_entries:
+            self.send_queue.close_job(job_id)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Headless Zoho Invoice batch operations.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    def add_targets(command, orgs: bool = True):
+        command.add_argument('-a', '--account', type=int, action='append',
+                             help="Account index (repeatable). Defaults to every authorized account.")
+        if orgs:
+            command.add_argument('-o', '--org', action='append',
+                                 help="Organization ID (repeatable). Defaults to every organization.")
+
+    commands.add_parser('accounts', help="List configured accounts.")
+    add_targets(commands.add_parser('orgs', help="Fetch and list each account's organizations."), orgs=False)
+
+    sync = commands.add_parser('sync', help="Update the local mirror of items, contacts and invoices.")
+    add_targets(sync)
+    sync.add_argument('-e', '--entity', action='append', choices=('items', 'contacts', 'invoices'),
+                      help="Only sync this entity (repeatable).")
+    sync.add_argument('--full', action='store_true', help="Re-list everything and drop deleted records.")
+
+    list_command = commands.add_parser('list', help="Print items, contacts, invoices or draft invoices.")
+    list_command.add_argument('what', choices=sorted(_LISTS))
+    add_targets(list_command)
+    list_command.add_argument('--offline', action='store_true', help="Print the local mirror without syncing.")
+    list_command.add_argument('--json', action='store_true', help="Print one JSON record per line.")
+
+    create = commands.add_parser('create-invoices', help="Create invoices from a JSON file.")
+    create.add_argument('file', help="JSON file holding one invoice payload or a list of them.")
+    add_targets(create)
+
+    import_contacts = commands.add_parser('import-contacts', help="Create contacts from a CSV/XLSX file.")
+    import_contacts.add_argument('file', help="File with display_name and email columns.")
+    add_targets(import_contacts)
+
+    import_invoices = commands.add_parser('import-invoices', help="Create invoices from a CSV/XLSX file.")
+    import_invoices.add_argument('file', help="File with one row per line item: invoice, customer, date, due_date, item, quantity.")
+    add_targets(import_invoices)
+
+    export = commands.add_parser('export', help="Write items, contacts, invoices or drafts to a CSV/Parquet file.")
+    export.add_argument('what', choices=sorted(EXPORTS))
+    export.add_argument('file', help="Output .csv or .parquet file (Parquet needs pyarrow).")
+    add_targets(export)
+    source = export.add_mutually_exclusive_group()
+    source.add_argument('--offline', action='store_true', help="Export the local mirror without syncing.")
+    source.add_argument('--from-api', action='store_true', help="Stream straight from the API, bypassing the local mirror.")
+
+    send = commands.add_parser('send-drafts', help="Email draft invoices to their customers.")
+    add_targets(send)
+    send.add_argument('-i', '--invoice', action='append', help="Only send this invoice ID (repeatable).")
+    send.add_argument('--dry-run', action='store_true', help="Show what would be sent without sending.")
+    send.add_argument('--all', action='store_true',
+                      help="Send the drafts of every selected organization instead of exactly one given with --org.")
+
+    resume = commands.add_parser('resume', help="Finish interrupted send jobs and retry failed invoices.")
+    resume.add_argument('-j', '--job', type=int, action='append', help="Only resume this job ID (repeatable).")
+    return parser
+
+
+def main(argv: list = None) -> int:
+    args = build_parser().parse_args(argv)
+    controller = CliController()
+    try:
+        getattr(controller, f"cmd_{args.command.replace('-', '_')}")(args)
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        controller.token_provider.shutdown()
+    return 1 if controller.failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
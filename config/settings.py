@@ -16,4 +16,90 @@ REDIRECT_URI = "http://localhost:8000"
 API_BASE_URL = "https://www.zohoapis.com/invoice/v3" # Changed from .in to .com
 
 # The permissions our app requires from the user
-ZOHO_SCOPES = "ZohoInvoice.fullaccess.all"
\ No newline at end of file
+ZOHO_SCOPES = "ZohoInvoice.fullaccess.all"
+
+# --- HTTP Transport ---
+# Connections kept alive per host (zohoapis.com, accounts.zoho.com).
+HTTP_POOL_SIZE = 10
+# Timeouts in seconds, (connect, read).
+HTTP_CONNECT_TIMEOUT = 5
+HTTP_READ_TIMEOUT = 30
+# Retries for failed connects and for idempotent requests that hit a 5xx.
+HTTP_MAX_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.5
+HTTP_RETRY_STATUSES = (500, 502, 503, 504)
+# Seconds a successful GET response is reused for identical GETs (e.g. the organization
+# list requested by both the account and the organization refresh). Writes to an
+# organization end the reuse of its responses straight away.
+HTTP_GET_SHARE_TTL = 3
+
+# --- Pagination ---
+# Records requested per page from list endpoints (Zoho allows up to 200).
+ZOHO_PAGE_SIZE = 200
+
+# --- Bulk Sending ---
+# Invoice emails sent in parallel; keep this at or below HTTP_POOL_SIZE.
+SEND_CONCURRENCY = 8
+# Invoices per request for the bulk email endpoint (Zoho accepts at most 10).
+ZOHO_BULK_EMAIL_CHUNK_SIZE = 10
+
+# --- Imports ---
+# Contacts or invoices created in parallel when submitting or importing many at once.
+IMPORT_CONCURRENCY = 4
+# Rows read and validated together when importing from a CSV/XLSX file.
+IMPORT_CHUNK_SIZE = 500
+# Skipped and failed rows listed in an import report; the rest are only counted.
+IMPORT_REPORT_MAX_ROWS = 50
+
+# --- Exports ---
+# Records read from the local store per page when exporting to CSV/Parquet.
+EXPORT_PAGE_SIZE = 1000
+# Rows per Parquet row group; larger groups load faster, smaller ones use less memory.
+EXPORT_ROW_GROUP_SIZE = 50000
+
+# --- Customer Search ---
+# Matches listed under the invoice's customer selector while typing.
+CUSTOMER_SEARCH_MAX_SUGGESTIONS = 50
+
+# --- Invoice Preview ---
+# Seconds after the item list was last synced with Zoho before the Create Invoice
+# form flags its estimated totals as possibly based on outdated rates.
+ITEM_RATE_MAX_AGE = 15 * 60
+
+# --- Dashboard Refresh ---
+# Refreshes requested within this many milliseconds of each other (by selecting an
+# account, then its organization, or by repeated clicks) are merged into one.
+REFRESH_DEBOUNCE_MS = 200
+
+# --- API Rate Limits ---
+# Client-side budget per organization; corrected from Zoho's X-Rate-Limit-* headers.
+ZOHO_RATE_LIMIT_PER_MINUTE = 100
+ZOHO_RATE_LIMIT_PER_DAY = 1000
+# How often a request that got a 429 is retried, and the pause used without Retry-After.
+ZOHO_RATE_LIMIT_MAX_RETRIES = 5
+ZOHO_RATE_LIMIT_DEFAULT_BACKOFF = 60
+
+# --- Local Sync ---
+# Seconds between full reconciliations that also detect records deleted in Zoho.
+# Syncs in between only fetch records modified since the last one.
+SYNC_RECONCILE_INTERVAL = 24 * 3600
+# The same for lists narrowed to one invoice status (the dashboard's drafts). These
+# cannot see invoices leaving the status, but re-listing one status is cheap.
+SYNC_STATUS_RECONCILE_INTERVAL = 10 * 60
+
+# --- Access Tokens ---
+# A cached token is only handed out if it stays valid for at least this many seconds.
+TOKEN_MIN_VALIDITY = 30
+# Tokens are refreshed in the background this many seconds before they expire.
+TOKEN_REFRESH_AHEAD = 300
+
+# --- Embedded Browser ---
+# QtWebEngine (Chromium) is loaded when the first browser tab opens. With warm-up
+# enabled it is loaded this many milliseconds after the main window is shown, so the
+# first Authorization/Sender Settings tab opens quickly. Set to None to disable.
+WEBENGINE_WARM_UP_DELAY_MS = 2000
+
+# --- Send Jobs ---
+# Invoice statuses that show an invoice was already emailed. Invoices left in flight
+# by an interrupted send are checked against these before they are sent again.
+ZOHO_SENT_INVOICE_STATUSES = ('sent', 'viewed', 'overdue', 'partially_paid', 'paid')
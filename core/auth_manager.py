@@ -4,10 +4,15 @@
 import requests
 import time
 from config import settings
+from core.http_transport import HttpTransport, get_default_transport
 
 class AuthManager:
     """Handles the logic of exchanging and refreshing Zoho OAuth tokens."""
 
+    def __init__(self, transport: HttpTransport = None, token_url: str = None):
+        self.transport = transport or get_default_transport()
+        self.token_url = token_url or settings.ZOHO_TOKEN_URL
+
     def exchange_code_for_tokens(self, client_id: str, client_secret: str, code: str) -> dict:
         """Makes the backend request to get the initial tokens."""
         payload = {
@@ -19,7 +24,7 @@ class AuthManager:
         }
         
         try:
-            response = requests.post(settings.ZOHO_TOKEN_URL, data=payload)
+            response = self.transport.post(self.token_url, data=payload)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -39,7 +44,7 @@ class AuthManager:
         
         try:
             print("Attempting to refresh access token...")
-            response = requests.post(settings.ZOHO_TOKEN_URL, data=payload)
+            response = self.transport.post(self.token_url, data=payload)
             response.raise_for_status()
             print("Successfully refreshed access token.")
             return response.json()
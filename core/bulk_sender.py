@@ -0,0 +1,174 @@
+# core/bulk_sender.py
+# Sends many invoice emails concurrently over a bounded worker pool.
+
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from config import settings
+from core import send_queue
+from core.http_transport import may_have_reached_server
+
+class BulkInvoiceSender:
+    """
+    Dispatches invoice emails over a pool of worker threads.
+
+    Invoices go out through Zoho's bulk email endpoint in chunks, which mails
+    each to its customer's primary contact. At most `max_workers` requests are
+    in flight at once, and cancelling stops new dispatches while the in-flight
+    ones finish.
+    """
+
+    def __init__(self, invoice_api, max_workers: int = None, chunk_size: int = None):
+        self.invoice_api = invoice_api
+        self.max_workers = max_workers or settings.SEND_CONCURRENCY
+        self.chunk_size = chunk_size or settings.ZOHO_BULK_EMAIL_CHUNK_SIZE
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Stops dispatching new sends. Sends already in flight are drained."""
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def _build_batches(self, invoices: list) -> list[list]:
+        """Splits invoices into chunks the bulk email endpoint accepts."""
+        return [invoices[start:start + self.chunk_size] for start in range(0, len(invoices), self.chunk_size)]
+
+    def _send_batch(self, access_token: str, organization_id: str, batch: list) -> str | None:
+        """Sends one chunk. Returns None on success, otherwise the error message."""
+        invoice_ids = [inv['invoice_id'] for inv in batch]
+        [(_, response)] = self.invoice_api.send_invoice_emails_bulk(
+            access_token, organization_id, invoice_ids, chunk_size=len(invoice_ids)
+        )
+        if response.get('code') == 0:
+            return None
+        return response.get('message', 'Unknown API error')
+
+    def run(self, access_token: str, organization_id: str, invoices: list, on_result=None,
+            on_dispatch=None, on_unconfirmed=None) -> tuple[int, list[str]]:
+        """
+        Sends every invoice in `invoices` and blocks until all dispatched sends finish.
+        `on_result(invoice_info, error)` is called from this thread once per invoice as
+        its request completes, with error set to None on success. `on_dispatch(batch)`
+        is called from this thread just before the request for a batch is submitted.
+        When given, `on_unconfirmed(invoice_info, error)` is called instead of on_result
+        for invoices whose request failed after it may have reached Zoho (e.g. a read
+        timeout), so they may have been sent; they still count as failed.
+        Returns (success_count, failed_entries) in the format used by the send report.
+        """
+        success_count = 0
+        failed_entries = []
+        pending = iter(self._build_batches(invoices))
+        in_flight = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            def dispatch_next() -> bool:
+                if self.cancelled:
+                    return False
+                batch = next(pending, None)
+                if batch is None:
+                    return False
+                if on_dispatch:
+                    on_dispatch(batch)
+                future = executor.submit(self._send_batch, access_token, organization_id, batch)
+                in_flight[future] = batch
+                return True
+
+            while len(in_flight) < self.max_workers and dispatch_next():
+                pass
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch = in_flight.pop(future)
+                    unconfirmed = False
+                    try:
+                        error = future.result()
+                    except Exception as e:
+                        error = str(e)
+                        unconfirmed = on_unconfirmed is not None and may_have_reached_server(e)
+                    for invoice_info in batch:
+                        if error is None:
+                            success_count += 1
+                        elif unconfirmed:
+                            failed_entries.append(f"Invoice for '{invoice_info['customer_name']}': {error} "
+                                                  f"(it may have been sent; this is checked before sending it again)")
+                            on_unconfirmed(invoice_info, error)
+                            continue
+                        else:
+                            failed_entries.append(f"Invoice for '{invoice_info['customer_name']}': {error}")
+                        if on_result:
+                            on_result(invoice_info, error)
+                    dispatch_next()
+
+        return success_count, failed_entries
+
+    def check_in_flight(self, access_token: str, queue, job_id: int) -> tuple[list[dict], list[dict]]:
+        """
+        Looks up the invoices a SendQueue job left in flight in Zoho: those it shows as
+        sent are marked sent, those it does not are put back to pending. Invoices that
+        could not be looked up stay in flight.
+        Returns (entries confirmed sent, unchecked entries each with its 'error').
+        """
+        organization_id = queue.job(job_id)['organization_id']
+        confirmed, unchecked = [], []
+        for invoice_info in queue.invoices(job_id, (send_queue.IN_FLIGHT,)):
+            if self.cancelled:
+                break
+            try:
+                response = self.invoice_api.get_invoice(access_token, organization_id, invoice_info['invoice_id'])
+            except ConnectionError as e:
+                unchecked.append({**invoice_info, 'error': f"Could not check whether it was already sent: {e}"})
+                continue
+            status = response.get('invoice', {}).get('status') if response.get('code') == 0 else None
+            if status in settings.ZOHO_SENT_INVOICE_STATUSES:
+                confirmed.append(invoice_info)
+                queue.mark(job_id, [invoice_info['invoice_id']], send_queue.SENT)
+            else:
+                queue.mark(job_id, [invoice_info['invoice_id']], send_queue.PENDING)
+        return confirmed, unchecked
+
+    def run_job(self, access_token: str, queue, job_id: int, on_result=None) -> tuple[int, list[str]]:
+        """
+        Sends what is left of a SendQueue job, recording every invoice's state as it goes.
+        Invoices left in flight by an interrupted run are first looked up in Zoho (see
+        check_in_flight): those it already shows as sent count as sent and the rest are
+        sent again. Those that could not be looked up, and those whose send failed in a
+        way that leaves open whether Zoho sent them, stay in flight and count as failed;
+        the next run looks them up again. Already sent and failed invoices are not
+        touched (see SendQueue.retry_failed).
+        Returns (success_count, failed_entries) for this run, like `run`.
+        """
+        organization_id = queue.job(job_id)['organization_id']
+
+        def on_sent(invoice_info: dict, error: str | None):
+            if error is None:
+                queue.mark(job_id, [invoice_info['invoice_id']], send_queue.SENT)
+            else:
+                queue.mark(job_id, [invoice_info['invoice_id']], send_queue.FAILED, error)
+            if on_result:
+                on_result(invoice_info, error)
+
+        def on_unconfirmed(invoice_info: dict, error: str):
+            queue.mark(job_id, [invoice_info['invoice_id']], send_queue.IN_FLIGHT, error)
+            if on_result:
+                on_result(invoice_info, error)
+
+        confirmed, unchecked = self.check_in_flight(access_token, queue, job_id)
+        if on_result:
+            for invoice_info in confirmed:
+                on_result(invoice_info, None)
+        checked_failed = []
+        for invoice_info in unchecked:
+            checked_failed.append(f"Invoice for '{invoice_info['customer_name']}': {invoice_info['error']}")
+            on_unconfirmed(invoice_info, invoice_info['error'])
+
+        success_count, failed_entries = self.run(
+            access_token, organization_id, queue.invoices(job_id, (send_queue.PENDING,)),
+            on_result=on_sent,
+            on_dispatch=lambda batch: queue.mark(job_id, [inv['invoice_id'] for inv in batch], send_queue.IN_FLIGHT),
+            on_unconfirmed=on_unconfirmed
+        )
+        return len(confirmed) + success_count, checked_failed + failed_entries
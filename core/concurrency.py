@@ -0,0 +1,42 @@
+# core/concurrency.py
+# A bounded worker pool fed from a lazy iterable.
+
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+def run_bounded(tasks, fn, max_workers: int, on_done, is_cancelled=None):
+    """
+    Calls fn(task) for every task of `tasks` on a pool of `max_workers` threads.
+
+    Tasks are pulled from the iterable only when a worker is free, so a generator
+    reading a large file is never more than `max_workers` tasks ahead of the
+    requests. `on_done(task, result, error)` is called from this thread as each call
+    finishes, with error set to the exception message if fn raised. Once
+    `is_cancelled()` returns True no new tasks are pulled; the calls in flight are
+    drained before this returns.
+    """
+    tasks = iter(tasks)
+    in_flight = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        def dispatch_next() -> bool:
+            if is_cancelled and is_cancelled():
+                return False
+            task = next(tasks, None)
+            if task is None:
+                return False
+            in_flight[executor.submit(fn, task)] = task
+            return True
+
+        while len(in_flight) < max_workers and dispatch_next():
+            pass
+
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = in_flight.pop(future)
+                try:
+                    result, error = future.result(), None
+                except Exception as e:
+                    result, error = None, str(e)
+                on_done(task, result, error)
+                dispatch_next()
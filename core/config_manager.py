@@ -3,8 +3,11 @@
 
 import json
 import os
+import threading
 from pathlib import Path
 
+from core.file_lock import FileLock, atomic_write_text
+
 class ConfigManager:
     """Manages multiple account files (account_1.json, etc.)."""
 
@@ -12,6 +15,21 @@ class ConfigManager:
         project_root = Path(__file__).parent.parent
         self.credentials_dir = project_root / 'credentials'
         self.credentials_dir.mkdir(exist_ok=True)
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def lock(self, index: int) -> FileLock:
+        """
+        Returns the inter-process lock guarding account_{index}.json. Hold it around any
+        read-modify-write of the file, e.g. a token refresh, so that other processes
+        running against the same account wait and then reuse the result.
+        """
+        with self._locks_guard:
+            lock = self._locks.get(index)
+            if lock is None:
+                lock = FileLock(self.credentials_dir / f'account_{index}.json.lock')
+                self._locks[index] = lock
+            return lock
 
     def discover_credentials(self) -> dict[int, str]:
         """
@@ -41,14 +59,17 @@ class ConfigManager:
             return {}
 
     def save_credentials(self, index: int, data: dict):
-        """Saves a dictionary of data to a specific account file."""
+        """
+        Merges a dictionary of data into a specific account file. The update runs under
+        the account's file lock and the file is replaced atomically, so concurrent
+        readers never see a partially written file.
+        """
         # Changed 'credentials_' to 'account_'
         filepath = self.credentials_dir / f'account_{index}.json'
-        existing_data = self.load_credentials(index)
-        existing_data.update(data)
-            
-        with open(filepath, 'w') as f:
-            json.dump(existing_data, f, indent=4)
+        with self.lock(index):
+            existing_data = self.load_credentials(index)
+            existing_data.update(data)
+            atomic_write_text(filepath, json.dumps(existing_data, indent=4))
 
     def add_new_credentials(self, client_id: str, client_secret: str) -> int:
         """Adds a new account file."""
@@ -62,8 +83,9 @@ class ConfigManager:
         # Changed 'credentials_' to 'account_'
         filepath = self.credentials_dir / f'account_{index}.json'
         try:
-            if filepath.exists():
-                os.remove(filepath)
+            with self.lock(index):
+                if filepath.exists():
+                    os.remove(filepath)
         except OSError as e:
             print(f"Error deleting file {filepath}: {e}")
             raise
\ No newline at end of file
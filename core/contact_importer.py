@@ -0,0 +1,133 @@
+# core/contact_importer.py
+# Creates many contacts concurrently, skipping ones that already exist.
+
+import threading
+
+from config import settings
+from core.concurrency import run_bounded
+
+# Per-row outcomes
+CREATED = 'created'
+SKIPPED = 'skipped'
+FAILED = 'failed'
+
+def normalize_name(name: str | None) -> str:
+    """'  ACME   Ltd ' -> 'acme ltd'"""
+    return ' '.join((name or '').split()).casefold()
+
+
+def normalize_email(email: str | None) -> str:
+    return (email or '').strip().casefold()
+
+
+def contact_email(contact: dict) -> str | None:
+    """The email of a Zoho contact, or of a create payload carrying it on its primary contact person."""
+    if contact.get('email'):
+        return contact['email']
+    for person in contact.get('contact_persons') or []:
+        if person.get('email'):
+            return person['email']
+    return None
+
+
+class ContactIndex:
+    """Normalized names and emails of known contacts, for duplicate checks."""
+
+    def __init__(self, contacts: list[dict] = ()):
+        self._by_name = {}
+        self._by_email = {}
+        for contact in contacts:
+            self.add(contact)
+
+    def add(self, contact: dict, label: str = None):
+        """Adds a contact; `label` describes it in duplicate messages (defaults to its name)."""
+        label = label or f"'{contact.get('contact_name')}'"
+        self._by_name.setdefault(normalize_name(contact.get('contact_name')), label)
+        email = normalize_email(contact_email(contact))
+        if email:
+            self._by_email.setdefault(email, label)
+
+    def match(self, customer: dict) -> str | None:
+        """Returns why `customer` duplicates a known contact, or None if it is new."""
+        label = self._by_name.get(normalize_name(customer.get('contact_name')))
+        if label:
+            return f"same name as {label}"
+        email = normalize_email(contact_email(customer))
+        if email and email in self._by_email:
+            return f"same email as {self._by_email[email]}"
+        return None
+
+
+class ContactImporter:
+    """
+    Creates contacts from input rows over a pool of worker threads.
+
+    Each row is checked against a ContactIndex of the organization's contacts and of
+    the rows before it, by normalized name and email; duplicates are skipped without
+    an API call. Rows are pulled lazily, so a generator can stream them from a file.
+    At most `max_workers` create requests are in flight at once, and cancelling stops
+    new dispatches while the in-flight ones finish.
+    """
+
+    def __init__(self, invoice_api, max_workers: int = None):
+        self.invoice_api = invoice_api
+        self.max_workers = max_workers or settings.IMPORT_CONCURRENCY
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Stops dispatching new creates. Creates already in flight are drained."""
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def _create(self, access_token: str, organization_id: str, customer: dict) -> tuple[str | None, dict | None]:
+        """Creates one contact. Returns (None, contact) on success, otherwise (error message, None)."""
+        response = self.invoice_api.create_customer(access_token, organization_id, customer)
+        if response.get('code') == 0:
+            return None, response.get('contact')
+        return response.get('message', 'Unknown API error'), None
+
+    def run(self, access_token: str, organization_id: str, rows, index: ContactIndex,
+            on_result=None) -> dict[str, int]:
+        """
+        Creates the contact of every (row number, customer) in `rows` that is not a
+        duplicate, and blocks until all dispatched creates finish. `on_result(result)` is
+        called from this thread once per row as its outcome is known; each result is a
+        dict with 'row', 'contact_name', 'status' (created/skipped/failed), 'detail' (the
+        skip reason or error) and 'contact' (the created Zoho contact).
+        Returns the number of rows per status.
+        """
+        counts = {CREATED: 0, SKIPPED: 0, FAILED: 0}
+
+        def record(row: int, customer: dict, status: str, detail: str = None, contact: dict = None):
+            counts[status] += 1
+            if on_result:
+                on_result({'row': row, 'contact_name': customer.get('contact_name'),
+                           'status': status, 'detail': detail, 'contact': contact})
+
+        def new_rows():
+            for row, customer in rows:
+                reason = index.match(customer)
+                if reason:
+                    record(row, customer, SKIPPED, reason)
+                    continue
+                index.add(customer, f"row {row}")
+                yield row, customer
+
+        def on_done(task: tuple, outcome: tuple | None, error: str | None):
+            row, customer = task
+            if error is None:
+                error, contact = outcome
+            if error is None:
+                record(row, customer, CREATED, contact=contact)
+            else:
+                record(row, customer, FAILED, error)
+
+        run_bounded(
+            new_rows(),
+            lambda task: self._create(access_token, organization_id, task[1]),
+            self.max_workers, on_done, lambda: self.cancelled
+        )
+        return counts
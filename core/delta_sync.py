@@ -0,0 +1,114 @@
+# core/delta_sync.py
+# Incremental synchronisation of a LocalStore using Zoho's last_modified_time.
+
+import time
+from datetime import datetime
+
+from config import settings
+
+def _parse_modified_time(value: str | None) -> datetime | None:
+    """Parses Zoho's '2024-01-31T10:15:00+0530' timestamps."""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%dT%H:%M:%S%z')
+    except ValueError:
+        return None
+
+
+class DeltaSync:
+    """
+    Keeps a LocalStore current by fetching only records modified since the last sync.
+
+    Each entity remembers the newest last_modified_time it has seen (its high-water
+    mark). A delta sync lists records newest-first and stops at the first page that
+    holds nothing newer than that mark. Deletions cannot be seen that way, so every
+    `reconcile_interval` seconds (or when forced) a full pass re-lists everything and
+    drops records that no longer exist in Zoho.
+
+    Zoho does not document last_modified_time as a sort column for every list, so
+    the order is checked as pages arrive; if a listing is not newest-first, the pass
+    carries on to the end and becomes a full one instead of stopping early.
+
+    Invoices can be synced for one status only (e.g. the drafts the dashboard shows),
+    with its own high-water mark. Invoices leaving that status are not listed any
+    more, so a status-scoped sync reconciles every `status_reconcile_interval` seconds;
+    this is cheap since it only re-lists that status. Callers that moved invoices out
+    of the status themselves (e.g. by sending drafts) pass force_full to see it at once.
+    """
+
+    def __init__(self, invoice_api, reconcile_interval: float = None, status_reconcile_interval: float = None):
+        self.invoice_api = invoice_api
+        self.reconcile_interval = reconcile_interval or settings.SYNC_RECONCILE_INTERVAL
+        self.status_reconcile_interval = status_reconcile_interval or settings.SYNC_STATUS_RECONCILE_INTERVAL
+        self._iterators = {
+            'items': invoice_api.iter_item_pages,
+            'contacts': invoice_api.iter_customer_pages,
+            'invoices': invoice_api.iter_invoice_pages,
+        }
+        # (entity, status) -> listing of only that status
+        self._status_iterators = {
+            ('invoices', 'draft'): invoice_api.iter_draft_invoice_pages,
+        }
+
+    def sync(self, access_token: str, organization_id: str, store, entity: str,
+             force_full: bool = False, on_page=None, status: str = None) -> tuple[int, bool]:
+        """
+        Brings `entity` in `store` up to date and returns (rows changed, whether it was a full pass).
+        With `status`, only the records of that status are listed. `on_page(records)` is
+        called with every page as it is downloaded.
+        """
+        if status is None:
+            iterator, state_key, interval = self._iterators[entity], entity, self.reconcile_interval
+        else:
+            iterator = self._status_iterators[(entity, status)]
+            state_key, interval = f"{entity}:{status}", self.status_reconcile_interval
+        high_water, last_full_sync = store.get_sync_state(state_key)
+        full = (force_full or high_water is None or last_full_sync is None
+                or time.time() - last_full_sync >= interval)
+        high_water_time = _parse_modified_time(high_water)
+        newest, newest_time = high_water, high_water_time
+        id_field = store.id_field(entity)
+        seen_ids = set()
+        changed_count = 0
+        started_at = time.time()
+        previous_time = None
+
+        pages = iterator(access_token, organization_id, sort_column='last_modified_time', sort_order='D')
+        try:
+            for page in pages:
+                if on_page:
+                    on_page(page)
+                changed_count += store.upsert(entity, page)
+                page_is_old = bool(page)
+                for record in page:
+                    seen_ids.add(record.get(id_field))
+                    modified_time = _parse_modified_time(record.get('last_modified_time'))
+                    if modified_time is None:
+                        page_is_old = False
+                        continue
+                    if previous_time is not None and modified_time > previous_time and not full:
+                        print(f"{entity} were not listed newest-first; syncing all of them instead.")
+                        full = True
+                    previous_time = modified_time
+                    if newest_time is None or modified_time > newest_time:
+                        newest, newest_time = record['last_modified_time'], modified_time
+                    # Records modified in the same second as the mark may be new, so keep going.
+                    if high_water_time is None or modified_time >= high_water_time:
+                        page_is_old = False
+                if not full and page_is_old:
+                    break
+        finally:
+            pages.close()
+
+        if full:
+            deleted_count = store.delete_missing(entity, seen_ids, status=status)
+            changed_count += deleted_count
+            last_full_sync = started_at
+            if status is not None and deleted_count:
+                # Some of them only changed status; a mirror of every invoice has to re-list them.
+                entity_high_water, entity_full_sync = store.get_sync_state(entity)
+                if entity_full_sync is not None:
+                    store.set_sync_state(entity, entity_high_water, None)
+        store.set_sync_state(state_key, newest, last_full_sync)
+        return changed_count, full
@@ -0,0 +1,195 @@
+# core/file_export.py
+# Streams items, contacts and invoices into CSV or Parquet files, one page at a time.
+
+import csv
+import os
+import tempfile
+from pathlib import Path
+
+from config import settings
+
+TEXT = 'text'
+NUMBER = 'number'
+
+# entity -> columns written, each (Zoho field, type). Every file starts with organization_id.
+EXPORT_COLUMNS = {
+    'items': (
+        ('item_id', TEXT), ('name', TEXT), ('sku', TEXT), ('description', TEXT), ('rate', NUMBER),
+        ('unit', TEXT), ('tax_name', TEXT), ('tax_percentage', NUMBER), ('status', TEXT),
+        ('created_time', TEXT), ('last_modified_time', TEXT),
+    ),
+    'contacts': (
+        ('contact_id', TEXT), ('contact_name', TEXT), ('company_name', TEXT), ('email', TEXT),
+        ('phone', TEXT), ('currency_code', TEXT), ('outstanding_receivable_amount', NUMBER),
+        ('status', TEXT), ('created_time', TEXT), ('last_modified_time', TEXT),
+    ),
+    'invoices': (
+        ('invoice_id', TEXT), ('invoice_number', TEXT), ('customer_id', TEXT), ('customer_name', TEXT),
+        ('status', TEXT), ('date', TEXT), ('due_date', TEXT), ('currency_code', TEXT),
+        ('total', NUMBER), ('balance', NUMBER), ('created_time', TEXT), ('last_modified_time', TEXT),
+    ),
+}
+
+# what can be exported -> (LocalStore entity, invoice status filter)
+EXPORTS = {
+    'items': ('items', None),
+    'contacts': ('contacts', None),
+    'invoices': ('invoices', None),
+    'drafts': ('invoices', 'draft'),
+}
+
+FORMATS = ('.csv', '.parquet')
+
+
+def _text(value) -> str | None:
+    return None if value in (None, '') else str(value)
+
+
+def _number(value) -> float | None:
+    try:
+        return float(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+_CONVERTERS = {TEXT: _text, NUMBER: _number}
+
+
+class _CsvSink:
+    """Appends rows to a CSV file as they come."""
+
+    def __init__(self, f, names: list[str]):
+        self._writer = csv.writer(f)
+        self._writer.writerow(names)
+
+    def write(self, rows: list[tuple]):
+        self._writer.writerows(['' if v is None else v for v in row] for row in rows)
+
+    def close(self):
+        pass
+
+
+class _ParquetSink:
+    """
+    Writes rows to a Parquet file with a fixed schema (strings and float64s).
+    Rows are buffered up to `row_group_size`, then written as one row group, so
+    memory stays bounded while readers still get reasonably large column chunks.
+    """
+
+    def __init__(self, f, columns: list[tuple[str, str]], row_group_size: int):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("Writing .parquet files needs the optional 'pyarrow' package (pip install pyarrow).") from None
+        self._pa = pa
+        self._schema = pa.schema([(name, pa.float64() if kind == NUMBER else pa.string()) for name, kind in columns])
+        self._writer = pq.ParquetWriter(f, self._schema)
+        self._row_group_size = row_group_size
+        self._buffer = []
+
+    def write(self, rows: list[tuple]):
+        self._buffer.extend(rows)
+        if len(self._buffer) >= self._row_group_size:
+            self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            columns = [list(values) for values in zip(*self._buffer)]
+            self._writer.write_table(self._pa.Table.from_arrays(columns, schema=self._schema))
+            self._buffer = []
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+
+
+class RecordExporter:
+    """
+    Writes pages of Zoho records of one entity to a .csv or .parquet file, picked
+    by the file's extension. Every record is flattened to EXPORT_COLUMNS with its
+    organization_id in front, so exports of several organizations can share a file.
+
+    Pages are converted and written as they are passed in, so the whole export is
+    never held in memory. The file is assembled next to `path` and only renamed
+    into place by close(); if the export fails, the partial file is removed and an
+    existing file at `path` is left as it was. Use it as a context manager. Writing
+    Parquet needs the optional pyarrow package.
+    """
+
+    def __init__(self, path, entity: str, row_group_size: int = None):
+        self.path = Path(path)
+        suffix = self.path.suffix.lower()
+        if suffix not in FORMATS:
+            raise ValueError(f"Unsupported file type '{self.path.suffix}'. Please use a .csv or .parquet file.")
+        self._fields = EXPORT_COLUMNS[entity]
+        columns = [('organization_id', TEXT), *self._fields]
+        self.count = 0
+
+        fd, self._temp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f'.{self.path.name}.', suffix='.tmp')
+        try:
+            if suffix == '.csv':
+                self._file = os.fdopen(fd, 'w', newline='', encoding='utf-8')
+                self._sink = _CsvSink(self._file, [name for name, _ in columns])
+            else:
+                self._file = os.fdopen(fd, 'wb')
+                self._sink = _ParquetSink(self._file, columns, row_group_size or settings.EXPORT_ROW_GROUP_SIZE)
+        except BaseException:
+            self._discard()
+            raise
+
+    def write_page(self, organization_id: str, records: list[dict]) -> int:
+        """Appends one page of records. Returns the number of records written so far."""
+        rows = [(organization_id, *(_CONVERTERS[kind](record.get(name)) for name, kind in self._fields))
+                for record in records]
+        self._sink.write(rows)
+        self.count += len(rows)
+        return self.count
+
+    def close(self):
+        """Finishes the file and moves it to `path`."""
+        try:
+            self._sink.close()
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            os.replace(self._temp_path, self.path)
+        except BaseException:
+            self._discard()
+            raise
+
+    def _discard(self):
+        file = getattr(self, '_file', None)
+        if file is not None and not file.closed:
+            file.close()
+        try:
+            os.remove(self._temp_path)
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._discard()
+        return False
+
+
+def api_pages(invoice_api, access_token: str, organization_id: str, what: str):
+    """Pages of `what` (see EXPORTS) listed straight from the Zoho API."""
+    iterators = {
+        'items': invoice_api.iter_item_pages,
+        'contacts': invoice_api.iter_customer_pages,
+        'invoices': invoice_api.iter_invoice_pages,
+        'drafts': invoice_api.iter_draft_invoice_pages,
+    }
+    return iterators[what](access_token, organization_id)
+
+
+def store_pages(store, what: str, page_size: int = None):
+    """Pages of `what` (see EXPORTS) read from an organization's LocalStore."""
+    entity, status = EXPORTS[what]
+    return store.iter_pages(entity, status=status, page_size=page_size or settings.EXPORT_PAGE_SIZE)
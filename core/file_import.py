@@ -0,0 +1,245 @@
+# core/file_import.py
+# Streams customers and invoices out of CSV/XLSX files into concurrent creation.
+
+import csv
+import threading
+from itertools import islice
+from pathlib import Path
+
+from config import settings
+from core.concurrency import run_bounded
+from core.contact_importer import CREATED, FAILED, SKIPPED, normalize_name
+from core.models import Contact
+from core.validation import validate_customer_rows, validate_invoice
+
+# field -> accepted column headers (compared lower-cased, with spaces as underscores)
+CUSTOMER_COLUMNS = {
+    'contact_name': ('display_name', 'contact_name', 'customer_name', 'name'),
+    'email': ('email', 'email_address'),
+}
+INVOICE_COLUMNS = {
+    'invoice': ('invoice', 'invoice_key', 'invoice_number'),
+    'customer': ('customer', 'customer_name', 'contact_name', 'customer_email', 'email', 'customer_id'),
+    'date': ('date', 'invoice_date'),
+    'due_date': ('due_date',),
+    'item': ('item', 'item_name', 'item_id'),
+    'quantity': ('quantity', 'qty'),
+}
+
+def _normalize_header(name) -> str:
+    return str(name or '').strip().lower().replace(' ', '_')
+
+
+def _pick(values: dict, columns: dict, field: str):
+    """Returns the value of `field` from a row, under whichever accepted header the file uses."""
+    for header in columns[field]:
+        value = values.get(header)
+        if value not in (None, ''):
+            return value.strip() if isinstance(value, str) else value
+    return None
+
+
+def iter_file_rows(path):
+    """
+    Yields (row number, {normalized header: value}) for every non-empty data row of a
+    .csv or .xlsx file, reading it as a stream. Row numbers match the spreadsheet's,
+    the header being row 1. Reading .xlsx needs the optional openpyxl package.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == '.csv':
+        with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+            reader = csv.reader(f)
+            headers = [_normalize_header(h) for h in next(reader, [])]
+            for row, values in enumerate(reader, start=2):
+                if any(v.strip() for v in values):
+                    yield row, dict(zip(headers, values))
+    elif suffix == '.xlsx':
+        try:
+            import openpyxl
+        except ImportError:
+            raise ValueError("Reading .xlsx files needs the optional 'openpyxl' package (pip install openpyxl).") from None
+        # read_only streams the sheet instead of loading every cell up front.
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            headers = [_normalize_header(h) for h in next(rows, ())]
+            for row, values in enumerate(rows, start=2):
+                if any(v not in (None, '') for v in values):
+                    yield row, dict(zip(headers, values))
+        finally:
+            workbook.close()
+    else:
+        raise ValueError(f"Unsupported file type '{path.suffix}'. Please use a .csv or .xlsx file.")
+
+
+def iter_chunks(iterable, size: int):
+    """Yields lists of up to `size` consecutive elements."""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def import_customers_file(importer, access_token: str, organization_id: str, path, index,
+                          on_result=None, chunk_size: int = None) -> dict[str, int]:
+    """
+    Creates the customers listed in a file with a ContactImporter, validating the rows
+    chunk by chunk as they are read. Invalid rows are reported as failed.
+    `on_result` and the returned counts are as for ContactImporter.run.
+    """
+    chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+    invalid_count = 0
+
+    def valid_rows():
+        nonlocal invalid_count
+        for chunk in iter_chunks(iter_file_rows(path), chunk_size):
+            valid, errors = validate_customer_rows(
+                (row, _pick(values, CUSTOMER_COLUMNS, 'contact_name'), _pick(values, CUSTOMER_COLUMNS, 'email'))
+                for row, values in chunk
+            )
+            names = {row: _pick(values, CUSTOMER_COLUMNS, 'contact_name') or '' for row, values in chunk}
+            for row, error_msg in errors:
+                invalid_count += 1
+                if on_result:
+                    on_result({'row': row, 'contact_name': names[row], 'status': FAILED,
+                               'detail': error_msg, 'contact': None})
+            yield from valid
+
+    counts = importer.run(access_token, organization_id, valid_rows(), index, on_result=on_result)
+    counts[FAILED] += invalid_count
+    return counts
+
+
+class InvoiceImporter:
+    """
+    Creates invoices from a file with one row per line item. Consecutive rows with
+    the same 'invoice' key make up one invoice; customers and items are looked up in
+    the organization's LocalStore by name, email or id. Invoices are validated chunk
+    by chunk as the file is read and created over a pool of worker threads, at most
+    `max_workers` at a time.
+    """
+
+    def __init__(self, invoice_api, store, max_workers: int = None):
+        self.invoice_api = invoice_api
+        self.store = store
+        self.max_workers = max_workers or settings.IMPORT_CONCURRENCY
+        self._cancel_event = threading.Event()
+        self._items = None
+
+    def cancel(self):
+        """Stops dispatching new creates. Creates already in flight are drained."""
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def _find_customer(self, value) -> Contact | None:
+        value = str(value)
+        contact = self.store.get('contacts', value)
+        if contact:
+            return Contact.from_api(contact)
+        if '@' in value:
+            matches = self.store.find_contacts(email=value)
+        else:
+            matches = self.store.find_contacts(name=' '.join(value.split()))
+        return Contact.from_api(matches[0]) if len(matches) == 1 else None
+
+    def _find_item_id(self, value) -> str | None:
+        if self._items is None:
+            self._items = {}
+            for item in self.store.load('items'):
+                self._items[item['item_id']] = item['item_id']
+                self._items.setdefault(normalize_name(item.get('name')), item['item_id'])
+        value = str(value)
+        return self._items.get(value) or self._items.get(normalize_name(value))
+
+    @staticmethod
+    def _group(rows):
+        """Yields (first row number, invoice key, [(row, values)]) for runs of rows sharing a key."""
+        key, lines = None, []
+        for row, values in rows:
+            row_key = _pick(values, INVOICE_COLUMNS, 'invoice')
+            row_key = str(row_key) if row_key is not None else None
+            if lines and row_key != key:
+                yield lines[0][0], key, lines
+                lines = []
+            key = row_key
+            lines.append((row, values))
+        if lines:
+            yield lines[0][0], key, lines
+
+    def _build(self, key, lines) -> tuple[dict | None, str | None]:
+        """Turns an invoice's rows into a create-invoice payload. Returns (invoice_data, error)."""
+        if key is None:
+            return None, "The 'invoice' column is empty."
+        first = lines[0][1]
+        customer_value = _pick(first, INVOICE_COLUMNS, 'customer')
+        if customer_value is None:
+            return None, "The 'customer' column is empty."
+        customer = self._find_customer(customer_value)
+        if customer is None:
+            return None, f"Customer '{customer_value}' was not found, or the name matches several customers."
+        line_items = []
+        for row, values in lines:
+            item_value = _pick(values, INVOICE_COLUMNS, 'item')
+            item_id = self._find_item_id(item_value) if item_value is not None else None
+            if item_id is None:
+                return None, f"Row {row}: item '{item_value or ''}' was not found."
+            quantity = _pick(values, INVOICE_COLUMNS, 'quantity')
+            line_items.append({'item_id': item_id, 'quantity': quantity if quantity is not None else 1})
+        return validate_invoice(customer, _pick(first, INVOICE_COLUMNS, 'date'),
+                                _pick(first, INVOICE_COLUMNS, 'due_date'), line_items)
+
+    def _create(self, access_token: str, organization_id: str, invoice_data: dict) -> tuple[str | None, dict | None]:
+        """Creates one invoice. Returns (None, invoice) on success, otherwise (error message, None)."""
+        response = self.invoice_api.create_invoice(access_token, organization_id, invoice_data)
+        if response.get('code') == 0:
+            return None, response.get('invoice')
+        return response.get('message', 'Unknown API error'), None
+
+    def run(self, access_token: str, organization_id: str, path, on_result=None,
+            chunk_size: int = None) -> dict[str, int]:
+        """
+        Creates every invoice in the file and blocks until all dispatched creates finish.
+        `on_result(result)` is called from this thread once per invoice; each result is a
+        dict with 'row' (its first row), 'invoice_key', 'status' (created/failed), 'detail'
+        (the error) and 'invoice' (the created Zoho invoice). Returns the number per status.
+        """
+        chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+        counts = {CREATED: 0, SKIPPED: 0, FAILED: 0}
+        seen_keys = set()
+
+        def record(row: int, key: str, status: str, detail: str = None, invoice: dict = None):
+            counts[status] += 1
+            if on_result:
+                on_result({'row': row, 'invoice_key': key, 'status': status, 'detail': detail, 'invoice': invoice})
+
+        def valid_invoices():
+            for chunk in iter_chunks(self._group(iter_file_rows(path)), chunk_size):
+                for row, key, lines in chunk:
+                    if key in seen_keys:
+                        record(row, key, FAILED, "Its rows are not next to the invoice's other rows.")
+                        continue
+                    seen_keys.add(key)
+                    invoice_data, error_msg = self._build(key, lines)
+                    if error_msg:
+                        record(row, key, FAILED, error_msg)
+                    else:
+                        yield row, key, invoice_data
+
+        def on_done(task: tuple, outcome: tuple | None, error: str | None):
+            row, key, _ = task
+            if error is None:
+                error, invoice = outcome
+            if error is None:
+                record(row, key, CREATED, invoice=invoice)
+            else:
+                record(row, key, FAILED, error)
+
+        run_bounded(
+            valid_invoices(),
+            lambda task: self._create(access_token, organization_id, task[2]),
+            self.max_workers, on_done, lambda: self.cancelled
+        )
+        return counts
@@ -0,0 +1,92 @@
+# core/file_lock.py
+# Advisory inter-process file locks, plus atomic file replacement.
+
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+class FileLock:
+    """
+    An exclusive advisory lock on a sidecar '.lock' file that serialises access
+    between processes. It is re-entrant within a process: nested `with` blocks on
+    the same FileLock (from the same thread) only take the OS lock once.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._handle = None
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if self._depth == 0:
+            try:
+                self._handle = open(self.path, 'a+b')
+                self._lock_handle()
+            except Exception:
+                if self._handle:
+                    self._handle.close()
+                    self._handle = None
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._depth -= 1
+        if self._depth == 0:
+            try:
+                self._unlock_handle()
+            finally:
+                self._handle.close()
+                self._handle = None
+        self._thread_lock.release()
+
+    def _lock_handle(self):
+        if os.name == 'nt':
+            self._handle.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(self._handle.fileno(), msvcrt.LK_LOCK, 1)
+                    return
+                except OSError:
+                    # LK_LOCK gives up after ~10 seconds; keep waiting like flock does.
+                    continue
+        else:
+            fcntl.flock(self._handle.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_handle(self):
+        if os.name == 'nt':
+            self._handle.seek(0)
+            msvcrt.locking(self._handle.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(self._handle.fileno(), fcntl.LOCK_UN)
+
+
+def atomic_write_text(path: Path, text: str):
+    """
+    Writes `text` to a temporary file next to `path` and renames it into place,
+    so readers in other processes see either the old or the new file, never a
+    truncated one.
+    """
+    path = Path(path)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
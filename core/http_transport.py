@@ -0,0 +1,96 @@
+# core/http_transport.py
+# A pooled, keep-alive HTTP transport shared by every client that talks to Zoho.
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError, MaxRetryError
+from urllib3.util.retry import Retry
+
+from config import settings
+
+class HttpTransport:
+    """
+    Wraps a single requests.Session so that all API calls reuse pooled
+    keep-alive connections instead of paying a TCP+TLS handshake per request.
+    """
+
+    def __init__(self, pool_size: int = None, connect_timeout: float = None,
+                 read_timeout: float = None, max_retries: int = None,
+                 backoff_factor: float = None):
+        self.pool_size = pool_size or settings.HTTP_POOL_SIZE
+        self.timeout = (
+            connect_timeout or settings.HTTP_CONNECT_TIMEOUT,
+            read_timeout or settings.HTTP_READ_TIMEOUT,
+        )
+        retry_policy = Retry(
+            total=settings.HTTP_MAX_RETRIES if max_retries is None else max_retries,
+            backoff_factor=settings.HTTP_BACKOFF_FACTOR if backoff_factor is None else backoff_factor,
+            # Only idempotent requests are retried on a bad status; a failed
+            # connect is always safe to retry because nothing reached the server.
+            status_forcelist=settings.HTTP_RETRY_STATUSES,
+            allowed_methods=frozenset(['GET', 'HEAD', 'OPTIONS']),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        # pool_connections is the number of hosts to keep pools for,
+        # pool_maxsize is the number of connections kept alive per host.
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size,
+                              max_retries=retry_policy)
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        })
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Sends a request through the shared session, applying the default timeout."""
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def close(self):
+        """Closes every pooled connection."""
+        self.session.close()
+
+
+def may_have_reached_server(error: BaseException) -> bool:
+    """
+    Whether the request that raised `error` (or an exception raised from it) may have
+    been received and acted on anyway, e.g. after a read timeout or a connection
+    dropped while waiting for the response. Only failures to connect are known not to
+    have reached the server, and errors raised before any request was made.
+    """
+    while error is not None and not isinstance(error, requests.exceptions.RequestException):
+        error = error.__cause__ or error.__context__
+    if error is None or isinstance(error, requests.exceptions.ConnectTimeout):
+        return False
+    if isinstance(error, requests.exceptions.ConnectionError) and error.args:
+        reason = error.args[0]
+        if isinstance(reason, MaxRetryError):
+            reason = reason.reason
+        # Includes refused connections (NewConnectionError) and failed TLS handshakes.
+        if isinstance(reason, (ConnectTimeoutError, requests.exceptions.SSLError)) or \
+                isinstance(error, requests.exceptions.SSLError):
+            return False
+    return True
+
+
+_default_transport = None
+_default_transport_lock = threading.Lock()
+
+def get_default_transport() -> HttpTransport:
+    """Returns the process-wide transport, creating it on first use."""
+    global _default_transport
+    with _default_transport_lock:
+        if _default_transport is None:
+            _default_transport = HttpTransport()
+        return _default_transport
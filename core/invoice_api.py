@@ -3,12 +3,21 @@
 
 import requests
 from config import settings
+from core.http_transport import HttpTransport, get_default_transport
+from core.rate_limiter import RateLimiter
+from core.single_flight import SingleFlight
 
 class InvoiceApi:
     """Handles making authenticated requests to the Zoho Invoice API."""
 
-    def __init__(self):
-        self.base_url = settings.API_BASE_URL
+    def __init__(self, transport: HttpTransport = None, base_url: str = None, rate_limiter: RateLimiter = None,
+                 shared_reads: SingleFlight = None):
+        # All can be injected, e.g. to point the client at a local stand-in server.
+        self.transport = transport or get_default_transport()
+        self.base_url = base_url or settings.API_BASE_URL
+        self.rate_limiter = rate_limiter or RateLimiter()
+        # Identical GETs in flight or just answered share one response
+        self.shared_reads = shared_reads or SingleFlight()
 
     def _get_auth_headers(self, access_token: str) -> dict:
         """Constructs the standard authorization header."""
@@ -18,12 +27,52 @@ class InvoiceApi:
             'Authorization': f'Zoho-oauthtoken {access_token}'
         }
 
+    def _request(self, method: str, organization_id: str | None, endpoint: str, **kwargs) -> requests.Response:
+        """
+        Sends a request, see _send(). A GET identical to one in flight, or answered
+        successfully in the last HTTP_GET_SHARE_TTL seconds, gets that response
+        instead of a new request. Any other request ends the sharing of what was read
+        for its organization, since it may have changed it.
+        """
+        if method != 'GET':
+            try:
+                return self._send(method, organization_id, endpoint, **kwargs)
+            finally:
+                self.shared_reads.forget(organization_id)
+        key = (endpoint, tuple(sorted((kwargs.get('params') or {}).items())),
+               (kwargs.get('headers') or {}).get('Authorization'))
+        return self.shared_reads.do(
+            key, lambda: self._send(method, organization_id, endpoint, **kwargs),
+            scope=organization_id, reusable=lambda response: response.ok
+        )
+
+    def _send(self, method: str, organization_id: str | None, endpoint: str, **kwargs) -> requests.Response:
+        """
+        Sends a request through the organization's rate limiter. A 429 pauses the
+        organization for the Retry-After period and the request is retried.
+        """
+        for attempt in range(settings.ZOHO_RATE_LIMIT_MAX_RETRIES + 1):
+            self.rate_limiter.acquire(organization_id)
+            response = self.transport.request(method, endpoint, **kwargs)
+            self.rate_limiter.record_response(organization_id, response.headers)
+            if response.status_code != 429 or attempt == settings.ZOHO_RATE_LIMIT_MAX_RETRIES:
+                return response
+            retry_after = response.headers.get('Retry-After', '')
+            delay = float(retry_after) if retry_after.isdigit() else settings.ZOHO_RATE_LIMIT_DEFAULT_BACKOFF
+            print(f"Rate limited by Zoho, retrying in {delay:.0f}s...")
+            self.rate_limiter.back_off(organization_id, delay)
+        return response
+
+    def remaining_daily_quota(self, organization_id: str) -> tuple[int, int] | None:
+        """Returns (remaining, limit) API calls for today, or None if not known yet."""
+        return self.rate_limiter.remaining_daily_quota(organization_id)
+
     # ... (get_organizations, get_items, create_item, get_customers, create_customer, create_invoice, get_draft_invoices are all correct and unchanged) ...
     def get_organizations(self, access_token: str) -> dict:
         headers = self._get_auth_headers(access_token)
         endpoint = f"{self.base_url}/organizations"
         try:
-            response = requests.get(endpoint, headers=headers)
+            response = self._request('GET', None, endpoint, headers=headers)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -33,7 +82,7 @@ class InvoiceApi:
         headers = self._get_auth_headers(access_token)
         endpoint = f"{self.base_url}/items?organization_id={organization_id}"
         try:
-            response = requests.get(endpoint, headers=headers)
+            response = self._request('GET', organization_id, endpoint, headers=headers)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -44,7 +93,7 @@ class InvoiceApi:
         endpoint = f"{self.base_url}/items?organization_id={organization_id}"
         payload = item_data.copy()
         try:
-            response = requests.post(endpoint, headers=headers, json=payload)
+            response = self._request('POST', organization_id, endpoint, headers=headers, json=payload)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -59,7 +108,7 @@ class InvoiceApi:
         headers = self._get_auth_headers(access_token)
         endpoint = f"{self.base_url}/contacts?organization_id={organization_id}"
         try:
-            response = requests.get(endpoint, headers=headers)
+            response = self._request('GET', organization_id, endpoint, headers=headers)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -70,7 +119,7 @@ class InvoiceApi:
         endpoint = f"{self.base_url}/contacts?organization_id={organization_id}"
         payload = customer_data.copy()
         try:
-            response = requests.post(endpoint, headers=headers, json=payload)
+            response = self._request('POST', organization_id, endpoint, headers=headers, json=payload)
             return response.json()
         except requests.exceptions.RequestException as e:
             raise ConnectionError(f"Network error creating customer: {e}") from e
@@ -80,7 +129,7 @@ class InvoiceApi:
         endpoint = f"{self.base_url}/invoices?organization_id={organization_id}"
         payload = invoice_data.copy()
         try:
-            response = requests.post(endpoint, headers=headers, json=payload)
+            response = self._request('POST', organization_id, endpoint, headers=headers, json=payload)
             return response.json()
         except requests.exceptions.RequestException as e:
             raise ConnectionError(f"Network error creating invoice: {e}") from e
@@ -89,12 +138,68 @@ class InvoiceApi:
         headers = self._get_auth_headers(access_token)
         endpoint = f"{self.base_url}/invoices?organization_id={organization_id}&status=draft"
         try:
-            response = requests.get(endpoint, headers=headers)
+            response = self._request('GET', organization_id, endpoint, headers=headers)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
             raise ConnectionError(f"Failed to fetch draft invoices: {e}") from e
 
+    def get_invoice(self, access_token: str, organization_id: str, invoice_id: str) -> dict:
+        headers = self._get_auth_headers(access_token)
+        endpoint = f"{self.base_url}/invoices/{invoice_id}?organization_id={organization_id}"
+        try:
+            response = self._request('GET', organization_id, endpoint, headers=headers)
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            raise ConnectionError(f"Failed to fetch invoice: {e}") from e
+
+    def _iter_pages(self, access_token: str, organization_id: str, resource: str,
+                    list_key: str, label: str, per_page: int = None, extra_params: dict = None):
+        """
+        Yields one page of records at a time from a paginated list endpoint,
+        following page_context.has_more_page until Zoho reports the last page.
+        """
+        headers = self._get_auth_headers(access_token)
+        endpoint = f"{self.base_url}/{resource}"
+        params = {
+            'organization_id': organization_id,
+            'per_page': per_page or settings.ZOHO_PAGE_SIZE,
+            'page': 1,
+        }
+        if extra_params:
+            params.update(extra_params)
+        while True:
+            try:
+                response = self._request('GET', organization_id, endpoint, headers=headers, params=params)
+                response.raise_for_status()
+                data = response.json()
+            except requests.exceptions.RequestException as e:
+                raise ConnectionError(f"Failed to fetch {label} (page {params['page']}): {e}") from e
+            if data.get('code') != 0:
+                raise ConnectionError(f"Failed to fetch {label}: {data.get('message', 'Unknown API error.')}")
+            yield data.get(list_key, [])
+            if not data.get('page_context', {}).get('has_more_page'):
+                break
+            params['page'] += 1
+
+    def iter_item_pages(self, access_token: str, organization_id: str, per_page: int = None, **filters):
+        """Yields the organization's items page by page."""
+        return self._iter_pages(access_token, organization_id, 'items', 'items', 'items', per_page, filters)
+
+    def iter_customer_pages(self, access_token: str, organization_id: str, per_page: int = None, **filters):
+        """Yields the organization's contacts page by page."""
+        return self._iter_pages(access_token, organization_id, 'contacts', 'contacts', 'customers', per_page, filters)
+
+    def iter_invoice_pages(self, access_token: str, organization_id: str, per_page: int = None, **filters):
+        """Yields the organization's invoices of every status page by page."""
+        return self._iter_pages(access_token, organization_id, 'invoices', 'invoices', 'invoices', per_page, filters)
+
+    def iter_draft_invoice_pages(self, access_token: str, organization_id: str, per_page: int = None, **filters):
+        """Yields the organization's draft invoices page by page."""
+        filters.setdefault('status', 'draft')
+        return self._iter_pages(access_token, organization_id, 'invoices', 'invoices', 'draft invoices', per_page, filters)
+
     # <<< MODIFIED to accept and send an email payload >>>
     def send_invoice_email(self, access_token: str, organization_id: str, invoice_id: str, email_data: dict) -> dict:
         """
@@ -106,7 +211,31 @@ class InvoiceApi:
         
         try:
             # Send the email data as the JSON payload
-            response = requests.post(endpoint, headers=headers, json=email_data)
+            response = self._request('POST', organization_id, endpoint, headers=headers, json=email_data)
             return response.json()
         except requests.exceptions.RequestException as e:
-            raise ConnectionError(f"Network error sending invoice: {e}") from e
\ No newline at end of file
+            raise ConnectionError(f"Network error sending invoice: {e}") from e
+
+    def send_invoice_emails_bulk(self, access_token: str, organization_id: str, invoice_ids: list, chunk_size: int = None) -> list[tuple[list, dict]]:
+        """
+        Emails many invoices to their customers' primary contacts with the bulk endpoint.
+        The API for this is POST /invoices/email?invoice_ids=..., which accepts a limited
+        number of ids per call, so the selection is split into chunks of `chunk_size`.
+        Returns a list of (chunk_invoice_ids, response) pairs, one per request made.
+        """
+        headers = self._get_auth_headers(access_token)
+        endpoint = f"{self.base_url}/invoices/email"
+        chunk_size = chunk_size or settings.ZOHO_BULK_EMAIL_CHUNK_SIZE
+        results = []
+        for start in range(0, len(invoice_ids), chunk_size):
+            chunk = list(invoice_ids[start:start + chunk_size])
+            params = {
+                'organization_id': organization_id,
+                'invoice_ids': ','.join(chunk),
+            }
+            try:
+                response = self._request('POST', organization_id, endpoint, headers=headers, params=params)
+                results.append((chunk, response.json()))
+            except requests.exceptions.RequestException as e:
+                raise ConnectionError(f"Network error sending invoices in bulk: {e}") from e
+        return results
@@ -0,0 +1,51 @@
+# core/invoice_totals.py
+# Invoice amounts estimated from the cached items, before the invoice is created in Zoho.
+
+from dataclasses import dataclass
+
+@dataclass(slots=True)
+class InvoiceTotals:
+    subtotal: float = 0.0
+    tax: float = 0.0
+    total: float = 0.0
+    # Lines without an item, or whose item is not in the cache
+    unpriced_lines: int = 0
+
+
+def estimate_totals(line_items: list[dict], items: dict) -> InvoiceTotals:
+    """
+    Adds up {"item_id", "quantity"} lines from the cached items (item id -> Item) the
+    way Zoho does for a plain invoice: each line is rate x quantity rounded to cents,
+    taxed at its item's tax percentage. Discounts, price lists and shipping are not
+    known here, so the result is a preview; Zoho's own figures are authoritative.
+    """
+    totals = InvoiceTotals()
+    for line in line_items:
+        item = items.get(line.get('item_id'))
+        if item is None:
+            totals.unpriced_lines += 1
+            continue
+        amount = round(item.rate * line.get('quantity', 1), 2)
+        totals.subtotal += amount
+        totals.tax += round(amount * item.tax_percentage / 100, 2)
+    totals.subtotal = round(totals.subtotal, 2)
+    totals.tax = round(totals.tax, 2)
+    totals.total = round(totals.subtotal + totals.tax, 2)
+    return totals
+
+
+def changed_rates(invoice: dict, items: dict) -> list[tuple]:
+    """
+    Compares the rates Zoho used for a created invoice with the cached items.
+    Returns (Item, Zoho's rate) for every cached item whose rate differs.
+    """
+    changed = []
+    for line in invoice.get('line_items') or []:
+        item = items.get(line.get('item_id'))
+        try:
+            rate = float(line.get('rate'))
+        except (TypeError, ValueError):
+            continue
+        if item is not None and abs(item.rate - rate) >= 0.005 and all(item is not seen for seen, _ in changed):
+            changed.append((item, rate))
+    return changed
@@ -0,0 +1,213 @@
+# core/local_store.py
+# An on-disk SQLite mirror of one organization's items, contacts and invoices.
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+# entity -> (table, id column, extra indexed columns copied out of the record)
+_ENTITIES = {
+    'items': ('items', 'item_id', ('name',)),
+    'contacts': ('contacts', 'contact_id', ('contact_name', 'email')),
+    'invoices': ('invoices', 'invoice_id', ('customer_id', 'status')),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    item_id TEXT PRIMARY KEY,
+    name TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_items_name ON items(name COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS contacts (
+    contact_id TEXT PRIMARY KEY,
+    contact_name TEXT,
+    email TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_contacts_name ON contacts(contact_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_contacts_email ON contacts(email COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS invoices (
+    invoice_id TEXT PRIMARY KEY,
+    customer_id TEXT,
+    status TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_invoices_customer ON invoices(customer_id);
+CREATE INDEX IF NOT EXISTS idx_invoices_status ON invoices(status);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    entity TEXT PRIMARY KEY,
+    high_water TEXT,
+    last_full_sync REAL
+);
+"""
+
+class LocalStore:
+    """
+    Mirrors one organization's records in data/org_<id>.sqlite3 so the dashboard
+    can render instantly and look records up without a network call.
+    Records are kept as the JSON Zoho returned; id, name and email are indexed.
+    Safe to use from several threads.
+    """
+
+    def __init__(self, organization_id: str, data_dir: Path = None):
+        project_root = Path(__file__).parent.parent
+        self.data_dir = Path(data_dir) if data_dir else project_root / 'data'
+        self.data_dir.mkdir(exist_ok=True)
+        self.path = self.data_dir / f'org_{organization_id}.sqlite3'
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Opens a connection for one transaction; committed on success, always closed."""
+        conn = sqlite3.connect(self.path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def id_field(entity: str) -> str:
+        """The Zoho field holding an entity's record id, e.g. 'contact_id'."""
+        return _ENTITIES[entity][1]
+
+    def load(self, entity: str, status: str = None) -> list[dict]:
+        """Returns every stored record of an entity, optionally only invoices with `status`."""
+        table, _, _ = _ENTITIES[entity]
+        query = f"SELECT data FROM {table}"
+        params = ()
+        if status is not None:
+            query += " WHERE status = ?"
+            params = (status,)
+        query += " ORDER BY rowid"
+        with self._lock, self._connect() as conn:
+            return [json.loads(row[0]) for row in conn.execute(query, params)]
+
+    def iter_pages(self, entity: str, status: str = None, page_size: int = 1000):
+        """
+        Yields the stored records of an entity in pages of up to `page_size`, in the
+        same order as load(). Each page is read in its own short transaction, keyed on
+        the last rowid seen, so large tables are never held in memory or locked while
+        the caller works through a page.
+        """
+        table, _, _ = _ENTITIES[entity]
+        query = f"SELECT rowid, data FROM {table} WHERE rowid > ?"
+        if status is not None:
+            query += " AND status = ?"
+        query += " ORDER BY rowid LIMIT ?"
+        last_rowid = 0
+        while True:
+            params = (last_rowid, status, page_size) if status is not None else (last_rowid, page_size)
+            with self._lock, self._connect() as conn:
+                rows = conn.execute(query, params).fetchall()
+            if not rows:
+                return
+            last_rowid = rows[-1][0]
+            yield [json.loads(row[1]) for row in rows]
+
+    def count(self, entity: str, status: str = None) -> int:
+        """Returns how many records of an entity are stored, optionally only invoices with `status`."""
+        table, _, _ = _ENTITIES[entity]
+        query = f"SELECT COUNT(*) FROM {table}"
+        params = ()
+        if status is not None:
+            query += " WHERE status = ?"
+            params = (status,)
+        with self._lock, self._connect() as conn:
+            return conn.execute(query, params).fetchone()[0]
+
+    def get(self, entity: str, record_id: str) -> dict | None:
+        """Returns one stored record by id."""
+        table, id_column, _ = _ENTITIES[entity]
+        with self._lock, self._connect() as conn:
+            row = conn.execute(f"SELECT data FROM {table} WHERE {id_column} = ?", (record_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def find_contacts(self, name: str = None, email: str = None) -> list[dict]:
+        """Looks contacts up by exact (case-insensitive) name and/or email using the indexes."""
+        clauses, params = [], []
+        if name is not None:
+            clauses.append("contact_name = ? COLLATE NOCASE")
+            params.append(name)
+        if email is not None:
+            clauses.append("email = ? COLLATE NOCASE")
+            params.append(email)
+        if not clauses:
+            return []
+        query = f"SELECT data FROM contacts WHERE {' OR '.join(clauses)}"
+        with self._lock, self._connect() as conn:
+            return [json.loads(row[0]) for row in conn.execute(query, params)]
+
+    def upsert(self, entity: str, records: list[dict]) -> int:
+        """Inserts new records and updates changed ones. Returns how many rows changed."""
+        if not records:
+            return 0
+        table, id_column, extra_columns = _ENTITIES[entity]
+        columns = (id_column, *extra_columns, 'data')
+        placeholders = ', '.join('?' for _ in columns)
+        updates = ', '.join(f"{column} = excluded.{column}" for column in columns[1:])
+        rows = {}
+        for record in records:
+            record_id = record.get(id_column)
+            if record_id:
+                rows[record_id] = (record_id, *(record.get(c) for c in extra_columns),
+                                   json.dumps(record, sort_keys=True))
+        with self._lock, self._connect() as conn:
+            id_list = list(rows)
+            existing = {}
+            for start in range(0, len(id_list), 500):
+                chunk = id_list[start:start + 500]
+                marks = ', '.join('?' for _ in chunk)
+                existing.update(conn.execute(
+                    f"SELECT {id_column}, data FROM {table} WHERE {id_column} IN ({marks})", chunk
+                ))
+            changed = [row for record_id, row in rows.items() if existing.get(record_id) != row[-1]]
+            conn.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) "
+                f"ON CONFLICT({id_column}) DO UPDATE SET {updates}",
+                changed
+            )
+        return len(changed)
+
+    def delete_missing(self, entity: str, keep_ids: set, status: str = None) -> int:
+        """
+        Deletes stored records whose id is not in `keep_ids`, optionally only among
+        invoices with `status`. Returns how many rows were deleted.
+        """
+        table, id_column, _ = _ENTITIES[entity]
+        query = f"SELECT {id_column} FROM {table}"
+        params = ()
+        if status is not None:
+            query += " WHERE status = ?"
+            params = (status,)
+        with self._lock, self._connect() as conn:
+            stale = [(row[0],) for row in conn.execute(query, params) if row[0] not in keep_ids]
+            conn.executemany(f"DELETE FROM {table} WHERE {id_column} = ?", stale)
+        return len(stale)
+
+    def get_sync_state(self, entity: str) -> tuple[str | None, float | None]:
+        """Returns (high-water last_modified_time, timestamp of the last full sync) for an entity."""
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT high_water, last_full_sync FROM sync_state WHERE entity = ?", (entity,)
+            ).fetchone()
+        return (row[0], row[1]) if row else (None, None)
+
+    def set_sync_state(self, entity: str, high_water: str | None, last_full_sync: float | None):
+        """Records the sync bookmarks for an entity."""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO sync_state (entity, high_water, last_full_sync) VALUES (?, ?, ?) "
+                "ON CONFLICT(entity) DO UPDATE SET high_water = excluded.high_water, "
+                "last_full_sync = excluded.last_full_sync",
+                (entity, high_water, last_full_sync)
+            )
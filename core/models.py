@@ -0,0 +1,118 @@
+# core/models.py
+# Compact records of the Zoho entities the app displays, and the in-memory cache holding them.
+
+from dataclasses import dataclass
+
+def _float(value) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+@dataclass(slots=True)
+class Organization:
+    organization_id: str
+    name: str = ''
+    contact_name: str = ''
+    email: str = ''
+    country: str = ''
+    currency_code: str = ''
+    currency_symbol: str = ''
+
+    @classmethod
+    def from_api(cls, data: dict) -> 'Organization':
+        get = data.get
+        return cls(data['organization_id'], get('name') or '', get('contact_name') or '', get('email') or '',
+                   get('country') or '', get('currency_code') or '', get('currency_symbol') or '')
+
+
+@dataclass(slots=True)
+class Contact:
+    contact_id: str
+    contact_name: str = ''
+    company_name: str = ''
+    email: str = ''
+
+    @classmethod
+    def from_api(cls, data: dict) -> 'Contact':
+        get = data.get
+        return cls(data['contact_id'], get('contact_name') or '', get('company_name') or '', get('email') or '')
+
+
+@dataclass(slots=True)
+class Item:
+    item_id: str
+    name: str = ''
+    rate: float = 0.0
+    description: str = ''
+    tax_percentage: float = 0.0
+
+    @classmethod
+    def from_api(cls, data: dict) -> 'Item':
+        get = data.get
+        return cls(data['item_id'], get('name') or '', _float(get('rate')), get('description') or '',
+                   _float(get('tax_percentage')))
+
+
+@dataclass(slots=True)
+class DraftInvoice:
+    invoice_id: str
+    customer_id: str = ''
+    customer_name: str = ''
+    invoice_number: str = ''
+    date: str = ''
+    due_date: str = ''
+    total: float = 0.0
+
+    @classmethod
+    def from_api(cls, data: dict) -> 'DraftInvoice':
+        get = data.get
+        return cls(data['invoice_id'], get('customer_id') or '', get('customer_name') or '',
+                   get('invoice_number') or '', get('date') or '', get('due_date') or '', _float(get('total')))
+
+
+def parse_records(record_type, records: list[dict]) -> list:
+    """Converts Zoho JSON records to `record_type`, keeping only the fields the app uses."""
+    from_api = record_type.from_api
+    return [from_api(record) for record in records]
+
+
+class RecordCache:
+    """
+    The records of the selected organization that the dashboard shows, shared by the
+    controller and the widgets so each entity is held once. Collections are dicts
+    keyed by record id, in the order the records were added.
+    Only used from the UI thread.
+    """
+
+    # collection -> id attribute of its records
+    _ID_FIELDS = {
+        'contacts': 'contact_id',
+        'items': 'item_id',
+        'draft_invoices': 'invoice_id',
+    }
+
+    def __init__(self):
+        self.organizations: list[Organization] = []
+        self.contacts: dict[str, Contact] = {}
+        self.items: dict[str, Item] = {}
+        self.draft_invoices: dict[str, DraftInvoice] = {}
+
+    def replace(self, collection: str, records: list):
+        """Replaces every record of 'contacts', 'items' or 'draft_invoices'."""
+        getattr(self, collection).clear()
+        self.extend(collection, records)
+
+    def new_records(self, collection: str, records: list) -> list:
+        """The records whose id is not in the collection yet."""
+        target = getattr(self, collection)
+        id_field = self._ID_FIELDS[collection]
+        return [record for record in records if getattr(record, id_field) not in target]
+
+    def extend(self, collection: str, records: list):
+        """Adds records to a collection, replacing any with the same id."""
+        target = getattr(self, collection)
+        id_field = self._ID_FIELDS[collection]
+        for record in records:
+            target[getattr(record, id_field)] = record
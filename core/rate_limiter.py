@@ -0,0 +1,118 @@
+# core/rate_limiter.py
+# Client-side throttling that keeps each organization inside Zoho's API quotas.
+
+import threading
+import time
+
+from config import settings
+
+class _OrgBucket:
+    """Rate limit state for a single organization."""
+
+    def __init__(self, per_minute: int, per_day: int):
+        self.capacity = per_minute
+        self.tokens = float(per_minute)
+        self.refill_per_second = per_minute / 60.0
+        self.last_refill = time.monotonic()
+        self.daily_limit = per_day
+        self.daily_remaining = per_day
+        self.daily_reset_at = time.monotonic() + 24 * 3600
+        self.blocked_until = 0.0
+
+    def refill(self, now: float):
+        elapsed = now - self.last_refill
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+        self.last_refill = now
+        if now >= self.daily_reset_at:
+            self.daily_remaining = self.daily_limit
+            self.daily_reset_at = now + 24 * 3600
+
+
+class RateLimiter:
+    """
+    Token bucket per organization_id for Zoho's per-minute limit, plus a daily
+    request budget. The limits start from settings and are corrected from the
+    X-Rate-Limit-* headers and Retry-After values that Zoho sends back.
+    """
+
+    def __init__(self, per_minute: int = None, per_day: int = None):
+        self.per_minute = per_minute or settings.ZOHO_RATE_LIMIT_PER_MINUTE
+        self.per_day = per_day or settings.ZOHO_RATE_LIMIT_PER_DAY
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, organization_id: str) -> _OrgBucket:
+        bucket = self._buckets.get(organization_id)
+        if bucket is None:
+            bucket = _OrgBucket(self.per_minute, self.per_day)
+            self._buckets[organization_id] = bucket
+        return bucket
+
+    def acquire(self, organization_id: str):
+        """
+        Blocks until a request for this organization may be sent.
+        Raises ConnectionError when the daily quota is used up.
+        """
+        if organization_id is None:
+            return
+        while True:
+            with self._lock:
+                bucket = self._bucket(organization_id)
+                now = time.monotonic()
+                bucket.refill(now)
+                if bucket.daily_remaining <= 0:
+                    hours = max(0.0, bucket.daily_reset_at - now) / 3600
+                    raise ConnectionError(
+                        f"Daily API quota for organization {organization_id} is used up. "
+                        f"It resets in about {hours:.1f} hour(s)."
+                    )
+                if now >= bucket.blocked_until and bucket.tokens >= 1:
+                    bucket.tokens -= 1
+                    bucket.daily_remaining -= 1
+                    return
+                wait_for = max(bucket.blocked_until - now,
+                               (1 - bucket.tokens) / bucket.refill_per_second)
+            time.sleep(max(wait_for, 0.01))
+
+    def record_response(self, organization_id: str, headers):
+        """Updates the daily budget from Zoho's X-Rate-Limit-* response headers."""
+        if organization_id is None:
+            return
+        limit = _int_header(headers, 'X-Rate-Limit-Limit')
+        remaining = _int_header(headers, 'X-Rate-Limit-Remaining')
+        reset = _int_header(headers, 'X-Rate-Limit-Reset')
+        with self._lock:
+            bucket = self._bucket(organization_id)
+            if limit is not None:
+                bucket.daily_limit = limit
+            if remaining is not None:
+                bucket.daily_remaining = remaining
+            if reset is not None:
+                bucket.daily_reset_at = time.monotonic() + reset
+
+    def back_off(self, organization_id: str, seconds: float):
+        """Pauses every request for this organization, e.g. after a 429 with Retry-After."""
+        if organization_id is None:
+            return
+        with self._lock:
+            bucket = self._bucket(organization_id)
+            bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + seconds)
+            # Let a single request probe the API once the pause is over.
+            bucket.tokens = min(bucket.tokens, 1.0)
+
+    def remaining_daily_quota(self, organization_id: str) -> tuple[int, int] | None:
+        """Returns (remaining, limit) for the organization, or None if nothing was sent yet."""
+        with self._lock:
+            bucket = self._buckets.get(organization_id)
+            if bucket is None:
+                return None
+            bucket.refill(time.monotonic())
+            return bucket.daily_remaining, bucket.daily_limit
+
+
+def _int_header(headers, name: str) -> int | None:
+    value = headers.get(name) if headers else None
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
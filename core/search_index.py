@@ -0,0 +1,104 @@
+# core/search_index.py
+# Type-ahead search over contacts' name, company and email.
+
+from bisect import bisect_right
+from itertools import islice
+
+class ContactSearchIndex:
+    """
+    Finds contacts whose name, company or email contain every word typed.
+
+    Each contact's fields are lower-cased into one key, and the keys are joined into
+    a single string, so a search is a loop of str.find over that string instead of a
+    Python-level scan of every contact. Typing further narrows the previous result
+    instead of searching again. Rows are positions in the order contacts were added;
+    a contact added again (same contact_id) replaces its row, as in RecordCache.
+    """
+
+    def __init__(self):
+        self._records = []
+        self._keys = []
+        self._rows = {}
+        self._text = None
+        self._starts = []
+        self._last_query = None
+        self._last_rows = None
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def clear(self):
+        self.__init__()
+
+    def add(self, contacts: list):
+        """Appends Contact records to the index, replacing those it already holds."""
+        for contact in contacts:
+            key = f"{contact.contact_name}\t{contact.company_name}\t{contact.email}".casefold()
+            row = self._rows.get(contact.contact_id)
+            if row is None:
+                self._rows[contact.contact_id] = len(self._records)
+                self._records.append(contact)
+                self._keys.append(key)
+            else:
+                self._records[row] = contact
+                self._keys[row] = key
+        if contacts:
+            self._text = None
+            self._last_query = self._last_rows = None
+
+    def record(self, row: int):
+        return self._records[row]
+
+    def _build(self):
+        """Joins the keys into one string, remembering where each starts."""
+        self._starts = []
+        position = 0
+        for key in self._keys:
+            self._starts.append(position)
+            position += len(key) + 1
+        self._text = '\n'.join(self._keys)
+
+    def _scan(self, term: str) -> list[int]:
+        """Rows whose key contains `term`, in order."""
+        if self._text is None:
+            self._build()
+        text, starts, keys = self._text, self._starts, self._keys
+        # A common term matches most rows; testing each key is then cheaper than locating every hit.
+        if text.count(term) * 8 > len(keys):
+            return [row for row, key in enumerate(keys) if term in key]
+        rows = []
+        position = text.find(term)
+        while position != -1:
+            row = bisect_right(starts, position) - 1
+            rows.append(row)
+            if row + 1 >= len(starts):
+                break
+            position = text.find(term, starts[row + 1])
+        return rows
+
+    def search(self, query: str, limit: int = None, prefix_first: bool = False) -> list[int] | None:
+        """
+        Returns the rows matching every word of `query` (at most `limit`), or None for
+        an empty query, meaning everything matches. With `prefix_first`, contacts whose
+        name starts with the query come before the other matches.
+        """
+        query = ' '.join(query.casefold().split())
+        if not query:
+            return None
+        terms = sorted(query.split(' '), key=len, reverse=True)
+        keys = self._keys
+        if self._last_rows is not None and query.startswith(self._last_query):
+            rows, remaining_terms = self._last_rows, terms
+        else:
+            rows, remaining_terms = self._scan(terms[0]), terms[1:]
+        for term in remaining_terms:
+            rows = [row for row in rows if term in keys[row]]
+        self._last_query, self._last_rows = query, rows
+        if prefix_first:
+            prefixed = list(islice((row for row in rows if keys[row].startswith(query)), limit))
+            if limit is None or len(prefixed) < limit:
+                prefixed_set = set(prefixed)
+                others = (row for row in rows if row not in prefixed_set)
+                prefixed += islice(others, None if limit is None else limit - len(prefixed))
+            rows = prefixed
+        return rows if limit is None else rows[:limit]
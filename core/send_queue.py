@@ -0,0 +1,173 @@
+# core/send_queue.py
+# A durable record of bulk invoice sends, so an interrupted send can be resumed safely.
+
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Per-invoice states of a send job
+PENDING = 'pending'
+IN_FLIGHT = 'in_flight'
+SENT = 'sent'
+FAILED = 'failed'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    account_index INTEGER NOT NULL,
+    organization_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    closed_at REAL
+);
+
+CREATE TABLE IF NOT EXISTS job_invoices (
+    job_id INTEGER NOT NULL REFERENCES jobs(job_id),
+    invoice_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    state TEXT NOT NULL,
+    error TEXT,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (job_id, invoice_id)
+);
+CREATE INDEX IF NOT EXISTS idx_job_invoices_invoice ON job_invoices(invoice_id, state);
+"""
+
+class SendQueue:
+    """
+    Stores every bulk send as a job in data/send_jobs.sqlite3, with the state of each
+    invoice in it: pending, in_flight (request dispatched, outcome unknown), sent or
+    failed. States are written before and after every request, so after a crash the
+    job can be resumed without emailing anyone twice. A job stays open until it is
+    closed, which happens once nothing is left to send or the user gives up on it.
+    Safe to use from several threads.
+    """
+
+    def __init__(self, data_dir: Path = None):
+        project_root = Path(__file__).parent.parent
+        self.data_dir = Path(data_dir) if data_dir else project_root / 'data'
+        self.data_dir.mkdir(exist_ok=True)
+        self.path = self.data_dir / 'send_jobs.sqlite3'
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Opens a connection for one transaction; committed on success, always closed."""
+        conn = sqlite3.connect(self.path)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def create_job(self, account_index: int, organization_id: str, invoices: list[dict]) -> tuple[int | None, list[dict]]:
+        """
+        Records a new job for `invoices` (the entries BulkInvoiceSender takes), all pending.
+        Invoices that an earlier job of the organization already sent are left out, and so
+        are those still in flight in one (sent before it was interrupted, but never
+        confirmed), since they may well have gone out too.
+        Returns (job_id, skipped invoices); each skipped entry carries the 'state' (sent or
+        in_flight) that kept it out. job_id is None if nothing is left to send.
+        """
+        with self._lock, self._connect() as conn:
+            earlier_states = {}
+            for row in conn.execute(
+                "SELECT ji.invoice_id, ji.state FROM job_invoices ji JOIN jobs j ON j.job_id = ji.job_id "
+                "WHERE j.organization_id = ? AND ji.state IN (?, ?)", (organization_id, SENT, IN_FLIGHT)
+            ):
+                if earlier_states.get(row['invoice_id']) != SENT:
+                    earlier_states[row['invoice_id']] = row['state']
+            to_send, skipped, seen = [], [], set()
+            for invoice_info in invoices:
+                if invoice_info['invoice_id'] in earlier_states:
+                    skipped.append({**invoice_info, 'state': earlier_states[invoice_info['invoice_id']]})
+                elif invoice_info['invoice_id'] not in seen:
+                    seen.add(invoice_info['invoice_id'])
+                    to_send.append(invoice_info)
+            if not to_send:
+                return None, skipped
+            now = time.time()
+            job_id = conn.execute(
+                "INSERT INTO jobs (account_index, organization_id, created_at) VALUES (?, ?, ?)",
+                (account_index, organization_id, now)
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO job_invoices (job_id, invoice_id, position, state, data, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(job_id, inv['invoice_id'], position, PENDING, json.dumps(inv), now)
+                 for position, inv in enumerate(to_send)]
+            )
+        return job_id, skipped
+
+    def job(self, job_id: int) -> dict | None:
+        """Returns a job's account_index, organization_id, created_at and closed_at."""
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def open_jobs(self) -> list[dict]:
+        """Returns every job that was not closed, oldest first, with its per-state invoice counts."""
+        with self._lock, self._connect() as conn:
+            jobs = [dict(row) for row in conn.execute("SELECT * FROM jobs WHERE closed_at IS NULL ORDER BY job_id")]
+            for job in jobs:
+                job['counts'] = self._counts(conn, job['job_id'])
+        return jobs
+
+    def counts(self, job_id: int) -> dict:
+        """Returns {state: number of invoices} for a job."""
+        with self._lock, self._connect() as conn:
+            return self._counts(conn, job_id)
+
+    @staticmethod
+    def _counts(conn, job_id: int) -> dict:
+        counts = {PENDING: 0, IN_FLIGHT: 0, SENT: 0, FAILED: 0}
+        for row in conn.execute(
+            "SELECT state, COUNT(*) FROM job_invoices WHERE job_id = ? GROUP BY state", (job_id,)
+        ):
+            counts[row[0]] = row[1]
+        return counts
+
+    def invoices(self, job_id: int, states: tuple = None) -> list[dict]:
+        """Returns the job's invoice entries in their original order, optionally only those in `states`."""
+        query = "SELECT data, state, error FROM job_invoices WHERE job_id = ?"
+        params = [job_id]
+        if states:
+            query += f" AND state IN ({', '.join('?' for _ in states)})"
+            params.extend(states)
+        query += " ORDER BY position"
+        with self._lock, self._connect() as conn:
+            return [{**json.loads(row['data']), 'state': row['state'], 'error': row['error']}
+                    for row in conn.execute(query, params)]
+
+    def mark(self, job_id: int, invoice_ids: list, state: str, error: str = None):
+        """Moves invoices of a job to `state`, recording the error message for failures."""
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "UPDATE job_invoices SET state = ?, error = ?, updated_at = ? WHERE job_id = ? AND invoice_id = ?",
+                [(state, error, now, job_id, invoice_id) for invoice_id in invoice_ids]
+            )
+
+    def retry_failed(self, job_id: int) -> int:
+        """Puts the job's failed invoices back to pending and reopens it. Returns how many there were."""
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            count = conn.execute(
+                "UPDATE job_invoices SET state = ?, error = NULL, updated_at = ? WHERE job_id = ? AND state = ?",
+                (PENDING, now, job_id, FAILED)
+            ).rowcount
+            if count:
+                conn.execute("UPDATE jobs SET closed_at = NULL WHERE job_id = ?", (job_id,))
+        return count
+
+    def close_job(self, job_id: int):
+        """Marks the job as done; it is no longer offered for resuming."""
+        with self._lock, self._connect() as conn:
+            conn.execute("UPDATE jobs SET closed_at = ? WHERE job_id = ?", (time.time(), job_id))
@@ -0,0 +1,80 @@
+# core/single_flight.py
+# Lets identical concurrent calls, and repeats shortly after, share one result.
+
+import threading
+import time
+
+from config import settings
+
+class _Call:
+    """One underlying call and the outcome its sharers wait for."""
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.reusable = False
+        self.finished_at = None
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time. Callers asking for a key that is
+    already being fetched wait for that call and get its result (or exception)
+    instead of starting their own; a result that `reusable(result)` accepts is
+    also handed out for `ttl` seconds after it arrived. forget(scope) drops what
+    is shared for a scope (e.g. an organization after it was written to), so later
+    callers start a fresh call. Safe to use from several threads.
+    """
+
+    def __init__(self, ttl: float = None):
+        self.ttl = settings.HTTP_GET_SHARE_TTL if ttl is None else ttl
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, scope=None, reusable=None):
+        """Returns fn(), or the result of an identical call in flight or finished within the ttl."""
+        with self._lock:
+            now = time.monotonic()
+            call = self._calls.get(key)
+            if call is not None and call.done.is_set() and not (call.reusable and now - call.finished_at < self.ttl):
+                call = None
+            if call is None:
+                self._prune(now)
+                call = self._calls[key] = _Call(scope)
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            call.reusable = reusable is None or bool(reusable(call.result))
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                call.finished_at = time.monotonic()
+                if not call.reusable and self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+
+    def forget(self, scope):
+        """Stops sharing results of calls made for `scope`, including calls still in flight."""
+        with self._lock:
+            for key in [key for key, call in self._calls.items() if call.scope == scope]:
+                del self._calls[key]
+
+    def _prune(self, now: float):
+        expired = [key for key, call in self._calls.items()
+                   if call.done.is_set() and now - call.finished_at >= self.ttl]
+        for key in expired:
+            del self._calls[key]
@@ -0,0 +1,121 @@
+# core/token_provider.py
+# Serves access tokens from memory and refreshes them ahead of expiry.
+
+import threading
+import time
+
+from config import settings
+
+class TokenProvider:
+    """
+    Keeps each account's access token in memory so callers never touch the
+    credentials file on the hot path. Only one refresh per account runs at a
+    time, across threads and (through the credentials file lock) across
+    processes; everyone else waits and then reuses the token it stored. A
+    background timer refreshes tokens shortly before they expire, and the
+    credentials file is only written when a new token was actually obtained.
+    """
+
+    def __init__(self, config_manager, auth_manager, refresh_ahead: float = None):
+        self.config_manager = config_manager
+        self.auth_manager = auth_manager
+        self.refresh_ahead = settings.TOKEN_REFRESH_AHEAD if refresh_ahead is None else refresh_ahead
+        self._tokens = {}   # account index -> (access_token, expiry timestamp)
+        self._locks = {}    # account index -> lock held while loading or refreshing
+        self._timers = {}   # account index -> proactive refresh timer
+        self._guard = threading.Lock()
+
+    def _account_lock(self, account_index: int) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(account_index, threading.Lock())
+
+    def _cached(self, account_index: int, min_validity: float) -> str | None:
+        cached = self._tokens.get(account_index)
+        if cached and cached[1] > time.time() + min_validity:
+            return cached[0]
+        return None
+
+    def get_token(self, account_index: int) -> str:
+        """
+        Returns a valid access token for the account, refreshing it if needed.
+        Raises ValueError if the account is not authorized and ConnectionError if
+        the refresh fails.
+        """
+        token = self._cached(account_index, settings.TOKEN_MIN_VALIDITY)
+        if token:
+            return token
+        with self._account_lock(account_index), self.config_manager.lock(account_index):
+            # Another thread may have refreshed while we waited for the lock.
+            token = self._cached(account_index, settings.TOKEN_MIN_VALIDITY)
+            if token:
+                return token
+            # Another process may have refreshed and saved a token to the file.
+            creds = self.config_manager.load_credentials(account_index)
+            if not creds.get('refresh_token'):
+                raise ValueError(f"Account {account_index} is not authorized.")
+            expiry_ts = creds.get('token_expiry_timestamp', 0)
+            if creds.get('access_token') and expiry_ts > time.time() + settings.TOKEN_MIN_VALIDITY:
+                self._remember(account_index, creds['access_token'], expiry_ts)
+                return creds['access_token']
+            return self._refresh(account_index, creds)
+
+    def _refresh(self, account_index: int, creds: dict) -> str:
+        """Refreshes the token and persists it. The caller holds both account locks."""
+        try:
+            token_data = self.auth_manager.refresh_access_token(creds['client_id'], creds['client_secret'], creds['refresh_token'])
+        except ConnectionError as e:
+            raise ConnectionError(f"Could not refresh access token: {e}") from e
+        if 'access_token' not in token_data:
+            raise ConnectionError(f"Could not refresh access token: {token_data.get('error', 'Unknown error.')}")
+        data_to_save = { 'access_token': token_data['access_token'], 'token_expiry_timestamp': int(time.time()) + token_data.get('expires_in', 3600) }
+        self.config_manager.save_credentials(account_index, data_to_save)
+        self._remember(account_index, data_to_save['access_token'], data_to_save['token_expiry_timestamp'])
+        return data_to_save['access_token']
+
+    def _remember(self, account_index: int, access_token: str, expiry_ts: float):
+        """Caches the token and schedules its proactive refresh."""
+        self._tokens[account_index] = (access_token, expiry_ts)
+        delay = max(expiry_ts - time.time() - self.refresh_ahead, 0)
+        timer = threading.Timer(delay, self._refresh_in_background, args=(account_index,))
+        timer.daemon = True
+        with self._guard:
+            previous = self._timers.pop(account_index, None)
+            self._timers[account_index] = timer
+        if previous:
+            previous.cancel()
+        timer.start()
+
+    def _refresh_in_background(self, account_index: int):
+        with self._account_lock(account_index), self.config_manager.lock(account_index):
+            if self._cached(account_index, self.refresh_ahead):
+                return
+            creds = self.config_manager.load_credentials(account_index)
+            if not creds.get('refresh_token'):
+                return
+            expiry_ts = creds.get('token_expiry_timestamp', 0)
+            if creds.get('access_token') and expiry_ts > time.time() + self.refresh_ahead:
+                # Another process already refreshed it; adopt its token.
+                self._remember(account_index, creds['access_token'], expiry_ts)
+                return
+            try:
+                self._refresh(account_index, creds)
+            except ConnectionError as e:
+                # The next get_token call will retry on demand.
+                print(f"Background token refresh for Account {account_index} failed: {e}")
+
+    def invalidate(self, account_index: int):
+        """Forgets the cached token, e.g. after the account was re-authorized or deleted."""
+        with self._account_lock(account_index):
+            self._tokens.pop(account_index, None)
+            with self._guard:
+                timer = self._timers.pop(account_index, None)
+            if timer:
+                timer.cancel()
+
+    def shutdown(self):
+        """Cancels every pending background refresh."""
+        with self._guard:
+            timers = list(self._timers.values())
+            self._timers.clear()
+        for timer in timers:
+            timer.cancel()
@@ -0,0 +1,94 @@
+# core/validation.py
+# Validation rules for customers and invoices, shared by the dashboard forms and file imports.
+
+from datetime import date, datetime, timedelta
+
+from core.models import Contact
+
+# Days between an invoice's date and its due date when no due date is given.
+DEFAULT_PAYMENT_TERMS_DAYS = 14
+
+def validate_customer(display_name: str | None, email_address: str | None) -> tuple[dict | None, str | None]:
+    """
+    Builds a create-contact payload from a display name and an optional email.
+    Returns (customer_data, None), or (None, error message).
+    """
+    display_name = (display_name or '').strip()
+    if not display_name:
+        return None, "Display Name is a required field and cannot be empty."
+    email_address = (email_address or '').strip()
+    customer_data = { "contact_name": display_name }
+    if email_address:
+        customer_data["contact_persons"] = [{ "email": email_address, "is_primary_contact": True }]
+    return customer_data, None
+
+
+def validate_customer_rows(rows) -> tuple[list[tuple[int, dict]], list[tuple[int, str]]]:
+    """
+    Validates a chunk of (row number, display name, email) tuples in one go.
+    Returns ([(row, customer_data)], [(row, error message)]).
+    """
+    valid, errors = [], []
+    for row, display_name, email_address in rows:
+        customer_data, error_msg = validate_customer(display_name, email_address)
+        if error_msg:
+            errors.append((row, error_msg))
+        else:
+            valid.append((row, customer_data))
+    return valid, errors
+
+
+def parse_date(value, default: date = None) -> date | None:
+    """Accepts a date, a datetime (as read from spreadsheets) or 'yyyy-MM-dd'; blank gives `default`."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    value = (value or '').strip() if isinstance(value, str) else value
+    if not value:
+        return default
+    try:
+        return datetime.strptime(str(value), '%Y-%m-%d').date()
+    except ValueError:
+        return None
+
+
+def validate_invoice(customer: Contact | None, invoice_date, due_date, line_items: list[dict]) -> tuple[dict | None, str | None]:
+    """
+    Builds a create-invoice payload. `customer` is the contact being invoiced,
+    the dates are dates or 'yyyy-MM-dd' strings (the due date defaults to the payment
+    terms), and `line_items` are {"item_id", "quantity"} dicts; lines without an item
+    are ignored. Returns (invoice_data, None), or (None, error message).
+    """
+    if not customer or not customer.contact_id:
+        return None, "You must select a customer."
+
+    if not customer.email:
+        return None, f"Selected customer '{customer.contact_name}' has no email address. Please update the customer record before creating an invoice."
+
+    parsed_date = parse_date(invoice_date, default=date.today())
+    if parsed_date is None:
+        return None, f"Invoice date '{invoice_date}' is not a valid yyyy-MM-dd date."
+    parsed_due_date = parse_date(due_date, default=parsed_date + timedelta(days=DEFAULT_PAYMENT_TERMS_DAYS))
+    if parsed_due_date is None:
+        return None, f"Due date '{due_date}' is not a valid yyyy-MM-dd date."
+
+    invoice_data = {
+        "customer_id": customer.contact_id,
+        "date": parsed_date.isoformat(),
+        "due_date": parsed_due_date.isoformat(),
+        "line_items": []
+    }
+    for line in line_items:
+        if not line.get('item_id'):
+            continue
+        try:
+            quantity = float(line.get('quantity', 1))
+        except (TypeError, ValueError):
+            return None, f"Quantity '{line.get('quantity')}' is not a number."
+        if quantity <= 0:
+            return None, "Quantity must be greater than zero."
+        invoice_data["line_items"].append({ "item_id": line['item_id'], "quantity": int(quantity) if quantity.is_integer() else quantity })
+    if not invoice_data["line_items"]:
+        return None, "Invoice must have at least one line item."
+    return invoice_data, None
@@ -1,17 +1,31 @@
 # main.py
 import sys
+import sqlite3
 import requests
+import threading
 import time
+from dataclasses import asdict
 from urllib.parse import urlencode, urlparse, parse_qs
 
-from PyQt6.QtWidgets import QApplication, QMessageBox, QProgressDialog
-from PyQt6.QtCore import QUrl, Qt
+from PyQt6.QtWidgets import QApplication, QMessageBox, QProgressDialog, QFileDialog
+from PyQt6.QtCore import QUrl, Qt, QTimer
 
 from ui.main_window import MainWindow
 from ui.settings_tab import SettingsTab
+from ui.workers import BulkSendWorker, TaskRunner
 from core.config_manager import ConfigManager
 from core.auth_manager import AuthManager
 from core.invoice_api import InvoiceApi
+from core.bulk_sender import BulkInvoiceSender
+from core.local_store import LocalStore
+from core.delta_sync import DeltaSync
+from core.token_provider import TokenProvider
+from core.models import Organization, Contact, Item, DraftInvoice, parse_records
+from core.invoice_totals import changed_rates
+from core.contact_importer import ContactImporter, ContactIndex, CREATED, SKIPPED, FAILED as IMPORT_FAILED
+from core.file_import import InvoiceImporter, import_customers_file
+from core.file_export import EXPORTS, FORMATS, RecordExporter, store_pages
+from core.send_queue import SendQueue, PENDING, IN_FLIGHT, SENT, FAILED
 from config import settings
 
 class AppController:
@@ -19,10 +33,31 @@ class AppController:
     def __init__(self):
         self.config_manager = ConfigManager()
         self.auth_manager = AuthManager()
+        self.token_provider = TokenProvider(self.config_manager, self.auth_manager)
         self.invoice_api = InvoiceApi()
+        self.delta_sync = DeltaSync(self.invoice_api)
         self.view = MainWindow()
         self._authorizing_account_index = None
-        self.customer_list_cache = []
+        # The selected organization's organizations/contacts/items/drafts, shared with the dashboard
+        self.records = self.view.dashboard_widget.records
+        self.send_queue = SendQueue()
+        self._send_worker = None
+        # Blocking calls run on this pool; _active_requests tracks the newest request of each kind.
+        self.tasks = TaskRunner(self.view)
+        self._active_requests = {}
+        # One on-disk mirror per organization, shared by the UI and worker threads
+        self._local_stores = {}
+        self._local_stores_lock = threading.Lock()
+        # Organizations whose drafts changed in a way a delta sync cannot see (e.g. some
+        # were just sent); their next draft fetch re-lists every draft.
+        self._drafts_to_relist = set()
+        # Refreshes requested in quick succession (e.g. the account -> organization
+        # selection cascade) are merged and run once the requests stop coming.
+        self._pending_refresh = set()
+        self._refresh_timer = QTimer(self.view)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(settings.REFRESH_DEBOUNCE_MS)
+        self._refresh_timer.timeout.connect(self._run_scheduled_refresh)
         
         # Connect UI signals
         settings_ui = self.view.settings_tab
@@ -39,52 +74,78 @@ class AppController:
         dashboard_ui.change_sender_name_button.clicked.connect(self.handle_open_sender_settings)
         dashboard_ui.view_email_templates_button.clicked.connect(self.handle_view_email_templates)
         #dashboard_ui.refresh_button.clicked.connect(self.handle_refresh_all)
-        dashboard_ui.refresh_button.clicked.connect(self.handle_refresh_data_for_current_org)
+        dashboard_ui.refresh_button.clicked.connect(lambda: self.schedule_refresh(*self.REFRESH_PARTS, 'organizations'))
         # Items
         dashboard_ui.add_item_button.clicked.connect(self.handle_add_item)
-        dashboard_ui.refresh_items_button.clicked.connect(self.handle_fetch_items)
+        dashboard_ui.refresh_items_button.clicked.connect(lambda: self.schedule_refresh('items'))
+        dashboard_ui.export_items_button.clicked.connect(lambda: self.handle_export('items'))
         # Customers
         dashboard_ui.add_customer_row_button.clicked.connect(self.handle_add_customer_row)
         dashboard_ui.remove_customer_row_button.clicked.connect(self.handle_remove_customer_row)
         dashboard_ui.submit_customers_button.clicked.connect(self.handle_submit_customers)
-        dashboard_ui.refresh_customers_button.clicked.connect(self.handle_fetch_customers)
+        dashboard_ui.refresh_customers_button.clicked.connect(lambda: self.schedule_refresh('customers'))
+        dashboard_ui.import_customers_button.clicked.connect(self.handle_import_customers_file)
+        dashboard_ui.export_customers_button.clicked.connect(lambda: self.handle_export('contacts'))
         # Invoice
         dashboard_ui.add_invoice_line_button.clicked.connect(self.handle_add_invoice_line)
         dashboard_ui.remove_invoice_line_button.clicked.connect(self.handle_remove_invoice_line)
         dashboard_ui.create_invoice_button.clicked.connect(self.handle_create_invoice)
+        dashboard_ui.import_invoices_button.clicked.connect(self.handle_import_invoices_file)
         # Send Invoice
-        dashboard_ui.refresh_draft_invoices_button.clicked.connect(self.handle_fetch_draft_invoices)
+        dashboard_ui.refresh_draft_invoices_button.clicked.connect(lambda: self.schedule_refresh('drafts'))
         dashboard_ui.send_selected_invoices_button.clicked.connect(self.handle_send_selected_invoices)
+        dashboard_ui.export_invoices_button.clicked.connect(lambda: self.handle_export('invoices'))
 
         self.refresh_account_list()
 
-    def handle_fetch_customers(self):
-        """Fetches the customer list and populates UI elements."""
-        self.view.statusBar().showMessage("Fetching customers...")
-        selected_org_data = self.view.dashboard_widget.organization_selector.currentData()
-        if not selected_org_data or 'organization_id' not in selected_org_data:
+    def handle_fetch_customers(self, *, on_complete=None):
+        """
+        Shows the locally stored customer list, then fetches it in the background and
+        populates UI elements page by page (or once, with the changes, if it was cached).
+        When on_complete is given it is called with (count, None) or (None, error)
+        instead of reporting errors in a dialog, or with (None, None) if the result was
+        dropped for a newer fetch or another organization.
+        """
+        dashboard_ui = self.view.dashboard_widget
+        selected_org_data = dashboard_ui.organization_selector.currentData()
+        if not selected_org_data:
             self.view.statusBar().showMessage("Select an organization to view customers.")
-            self.view.dashboard_widget.populate_customers_table([])
-            self.view.dashboard_widget.populate_invoice_customer_dropdown([])
+            dashboard_ui.set_contacts([])
             return
-        organization_id = selected_org_data['organization_id']
+        organization_id = selected_org_data.organization_id
         account_index = self.view.settings_tab.get_selected_account_index()
-        access_token = self.get_valid_access_token(account_index)
-        if not access_token: return
-        try:
-            response = self.invoice_api.get_customers(access_token, organization_id)
-            if response.get('code') == 0:
-                customers_list = response.get('contacts', [])
-                self.customer_list_cache = customers_list
-                self.view.dashboard_widget.populate_customers_table(customers_list)
-                self.view.dashboard_widget.populate_invoice_customer_dropdown(customers_list)
-                self.view.statusBar().showMessage(f"Successfully fetched {len(customers_list)} customer(s).")
+        self.view.statusBar().showMessage("Fetching customers...")
+        # Fill the tables page by page so the first rows show while later pages download.
+        dashboard_ui.set_contacts([])
+
+        def on_update(update: tuple):
+            kind, records = update
+            if kind == 'page':
+                dashboard_ui.add_contacts(records)
+                self.view.statusBar().showMessage(f"Fetched {len(self.records.contacts)} customer(s)...")
             else:
-                self.view.show_message("API Error", f"Could not fetch customers: {response.get('message')}", level='critical')
-        except Exception as e:
-            self.view.show_message("Error", f"An unexpected error occurred while fetching customers: {e}", level='critical')
-        finally:
-            self.view.statusBar().showMessage("Ready")
+                dashboard_ui.set_contacts(records)
+
+        def on_finished(count: int):
+            self.update_api_quota_display()
+            self.view.statusBar().showMessage(f"Successfully fetched {count} customer(s).", 5000)
+            if on_complete:
+                on_complete(count, None)
+
+        def on_error(error: Exception):
+            if on_complete:
+                self.update_api_quota_display()
+                on_complete(None, error)
+            else:
+                self._report_task_error("fetch customers")(error)
+
+        self.tasks.submit(
+            self._sync_list, account_index, organization_id, 'contacts', Contact,
+            on_progress=on_update, on_result=on_finished,
+            on_error=on_error,
+            is_current=self._request_guard('customers'),
+            on_dropped=(lambda: on_complete(None, None)) if on_complete else None
+        )
             
     # <<< MODIFIED to build and pass the email payload >>>
     def handle_send_selected_invoices(self):
@@ -97,25 +158,18 @@ class AppController:
         # Pre-flight Check
         sendable_invoices = []
         unsendable_invoices = []
-        customer_map = {c['contact_id']: c for c in self.customer_list_cache}
-
         for inv_data in selected_invoices:
-            customer = customer_map.get(inv_data['customer_id'])
-            if customer and customer.get('email'):
-                # Store all necessary data for sending
+            customer = self.records.contacts.get(inv_data['customer_id'])
+            if customer and customer.email:
+                # Store all necessary data for sending. Zoho's bulk email endpoint mails the
+                # contact's primary contact, whose address is the contact's 'email'.
                 sendable_invoices.append({
                     'invoice_id': inv_data['invoice_id'],
-                    'customer_email': customer.get('email'),
-                    'customer_name': customer.get('contact_name')
+                    'customer_email': customer.email,
+                    'customer_name': customer.contact_name
                 })
             else:
-                customer_name_from_table = "Unknown Customer"
-                for row in range(self.view.dashboard_widget.draft_invoices_table.rowCount()):
-                    item_data = self.view.dashboard_widget.draft_invoices_table.item(row, 0).data(Qt.ItemDataRole.UserRole)
-                    if item_data and item_data['invoice_id'] == inv_data['invoice_id']:
-                         customer_name_from_table = self.view.dashboard_widget.draft_invoices_table.item(row, 0).text()
-                         break
-                unsendable_invoices.append(f"'{customer_name_from_table}'")
+                unsendable_invoices.append(f"'{inv_data.get('customer_name') or 'Unknown Customer'}'")
 
         if unsendable_invoices:
             error_list = "\n".join(f"- {name}" for name in unsendable_invoices)
@@ -131,83 +185,244 @@ class AppController:
         self.send_invoices_with_progress(sendable_invoices)
 
     def send_invoices_with_progress(self, invoices_to_send: list):
-        """Handles the actual API calls for sending with a progress dialog."""
+        """
+        Records the invoices as a send job, so an interrupted send can be resumed without
+        emailing anyone twice, and sends it. Invoices an earlier job already sent, or may
+        have sent, are skipped.
+        """
         if not invoices_to_send: return
+        if self._send_worker is not None:
+            self.view.show_message("Send In Progress", "Please wait for the current send to finish.", level='warning')
+            return
 
-        organization_id = self.view.dashboard_widget.organization_selector.currentData()['organization_id']
+        organization_id = self.view.dashboard_widget.organization_selector.currentData().organization_id
         account_index = self.view.settings_tab.get_selected_account_index()
-        access_token = self.get_valid_access_token(account_index)
-        if not access_token: return
+        job_id, skipped_invoices = self.send_queue.create_job(account_index, organization_id, invoices_to_send)
+        if skipped_invoices:
+            skipped_list = "\n".join(
+                f"- '{inv['customer_name']}'" + (" (sent by an interrupted send, not confirmed; check it in Zoho)"
+                                                 if inv['state'] == IN_FLIGHT else "")
+                for inv in skipped_invoices)
+            self.view.show_message("Already Sent", f"These invoices were already sent and will be skipped:\n\n{skipped_list}", level='warning')
+        if job_id is not None:
+            self.run_send_job(job_id)
 
-        progress = QProgressDialog("Sending invoices...", "Cancel", 0, len(invoices_to_send), self.view)
+    def run_send_job(self, job_id: int):
+        """Sends what is left of a send job on a background worker pool while a progress dialog tracks it."""
+        if self._send_worker is not None:
+            self.view.show_message("Send In Progress", "Please wait for the current send to finish.", level='warning')
+            return
+        job = self.send_queue.job(job_id)
+        account_index = job['account_index']
+        counts = self.send_queue.counts(job_id)
+        total = counts[PENDING] + counts[IN_FLIGHT]
+
+        progress = QProgressDialog("Sending invoices...", "Cancel", 0, total, self.view)
         progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(0)
+        progress.setValue(0)
 
-        success_count = 0
-        failed_entries = []
+        worker = BulkSendWorker(self.invoice_api, lambda: self.get_access_token(account_index),
+                                self.send_queue, job_id, self.view)
+        completed = 0
 
-        for i, invoice_info in enumerate(invoices_to_send):
-            progress.setValue(i)
-            progress.setLabelText(f"Sending to '{invoice_info['customer_name']}'...")
-            if progress.wasCanceled(): break
+        def on_invoice_sent(invoice_info: dict, error: str):
+            nonlocal completed
+            completed += 1
+            if progress.wasCanceled():
+                progress.setLabelText("Cancelling... waiting for in-flight sends to finish.")
+            else:
+                progress.setLabelText(f"Sent to '{invoice_info['customer_name']}' ({completed}/{total})")
+                progress.setValue(completed)
 
-            try:
-                # Build the email payload
-                email_payload = {
-                    "to_mail_ids": [ invoice_info['customer_email'] ]
-                }
-                response = self.invoice_api.send_invoice_email(
-                    access_token, 
-                    organization_id, 
-                    invoice_info['invoice_id'],
-                    email_payload
-                )
-                if response.get('code') == 0:
-                    success_count += 1
-                else:
-                    failed_entries.append(f"Invoice for '{invoice_info['customer_name']}': {response.get('message')}")
-            except Exception as e:
-                failed_entries.append(f"Invoice for '{invoice_info['customer_name']}': {e}")
-        
-        progress.setValue(len(invoices_to_send))
-        summary_message = f"Send Complete!\n\n- Successful: {success_count}\n- Failed: {len(failed_entries)}"
-        if failed_entries:
-            summary_message += "\n\nFailures:\n" + "\n".join(f"- {entry}" for entry in failed_entries)
-        QMessageBox.information(self.view, "Send Report", summary_message)
-        
-        self.handle_fetch_draft_invoices()
+        def on_sending_finished(success_count: int, failed_entries: list):
+            progress.setValue(total)
+            progress.close()
+            self._send_worker = None
+            summary_message = f"Send Complete!\n\n- Successful: {success_count}\n- Failed: {len(failed_entries)}"
+            if failed_entries:
+                summary_message += "\n\nFailures:\n" + "\n".join(f"- {entry}" for entry in failed_entries)
+                reply = QMessageBox.question(self.view, "Send Report", f"{summary_message}\n\nRetry the failed invoice(s)?",
+                                             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+                if reply == QMessageBox.StandardButton.Yes:
+                    self.send_queue.retry_failed(job_id)
+                    self.run_send_job(job_id)
+                    return
+            else:
+                QMessageBox.information(self.view, "Send Report", summary_message)
+            # Finished, cancelled or given up on: either way it is not offered for resuming.
+            # Invoices whose send may have gone through are looked up before it is closed.
+            self.discard_send_job({**job, 'counts': self.send_queue.counts(job_id)})
+            self.schedule_refresh('drafts')
+            self.offer_to_resume_send_jobs()
+
+        def on_sending_failed(error: Exception):
+            progress.close()
+            self._send_worker = None
+            self.view.show_message("Authentication Error", f"Could not send invoices: {error}", level='critical')
+
+        worker.invoice_sent.connect(on_invoice_sent)
+        worker.sending_finished.connect(on_sending_finished)
+        worker.sending_failed.connect(on_sending_failed)
+        progress.canceled.connect(worker.cancel)
+        # Deleted once run() has returned; the result signals can arrive before that.
+        worker.finished.connect(worker.deleteLater)
+        self._send_worker = worker
+        worker.start()
+
+    def offer_to_resume_send_jobs(self):
+        """
+        Offers to finish a send job that was interrupted, e.g. by a crash or a lost
+        connection. Declining discards it; the invoices it sent stay recorded as sent.
+        """
+        if self._send_worker is not None:
+            return
+        for job in self.send_queue.open_jobs():
+            counts = job['counts']
+            unsent_count = counts[PENDING] + counts[IN_FLIGHT] + counts[FAILED]
+            if not unsent_count:
+                self.send_queue.close_job(job['job_id'])
+                continue
+            started = time.strftime('%Y-%m-%d %H:%M', time.localtime(job['created_at']))
+            reply = QMessageBox.question(
+                self.view, "Resume Sending",
+                f"A send started on {started} (Account {job['account_index']}, organization "
+                f"{job['organization_id']}) did not finish.\n\n- Sent: {counts[SENT]}\n"
+                f"- Not sent yet: {unsent_count}\n\n"
+                "Resume it now? Invoices that already went out will not be sent again.",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply == QMessageBox.StandardButton.Yes:
+                # Failures from before the interruption are retried as well.
+                self.send_queue.retry_failed(job['job_id'])
+                self.run_send_job(job['job_id'])
+                return
+            self.discard_send_job(job)
+
+    def discard_send_job(self, job: dict):
+        """
+        Closes a send job that finished or that the user gave up on. Invoices it left in
+        flight are first looked up in Zoho, so those that did go out are recorded as sent;
+        any that could not be checked stay in flight, and later sends skip them rather
+        than risk emailing them twice.
+        """
+        # Drafts it sent are still listed locally until the drafts are re-listed.
+        self._drafts_to_relist.add(job['organization_id'])
+        if not job['counts'][IN_FLIGHT]:
+            self.send_queue.close_job(job['job_id'])
+            return
+
+        def check_and_close():
+            sender = BulkInvoiceSender(self.invoice_api)
+            _confirmed, unchecked = sender.check_in_flight(
+                self.get_access_token(job['account_index']), self.send_queue, job['job_id'])
+            self.send_queue.close_job(job['job_id'])
+            return unchecked
+
+        def warn_unchecked(unchecked: list):
+            if unchecked:
+                names = "\n".join(f"- '{inv['customer_name']}'" for inv in unchecked)
+                self.view.show_message(
+                    "Send Not Confirmed",
+                    f"Could not check whether these invoices were sent. "
+                    f"They will not be sent again; check them in Zoho:\n\n{names}", level='warning')
+
+        def on_error(error: Exception):
+            # Leave the in-flight invoices unconfirmed; later sends skip them.
+            self.send_queue.close_job(job['job_id'])
+            warn_unchecked(self.send_queue.invoices(job['job_id'], (IN_FLIGHT,)))
+
+        self.tasks.submit(check_and_close, on_result=warn_unchecked, on_error=on_error)
 
     # ... (all other methods remain unchanged) ...
-    def handle_fetch_draft_invoices(self):
-        self.view.statusBar().showMessage("Fetching draft invoices...")
-        selected_org_data = self.view.dashboard_widget.organization_selector.currentData()
-        if not selected_org_data or 'organization_id' not in selected_org_data:
+    def handle_fetch_draft_invoices(self, *, on_complete=None):
+        """
+        Shows the locally stored draft invoices, then fetches them in the background. When on_complete is given it is called
+        with (count, None) or (None, error) instead of reporting errors in a dialog, or with (None, None) if the
+        result was dropped for a newer fetch or another organization.
+        """
+        dashboard_ui = self.view.dashboard_widget
+        selected_org_data = dashboard_ui.organization_selector.currentData()
+        if not selected_org_data:
             self.view.statusBar().showMessage("Select an organization to view drafts.")
-            self.view.dashboard_widget.populate_draft_invoices_table([])
+            dashboard_ui.set_draft_invoices([])
             return
-        organization_id = selected_org_data['organization_id']
+        organization_id = selected_org_data.organization_id
         account_index = self.view.settings_tab.get_selected_account_index()
-        access_token = self.get_valid_access_token(account_index)
-        if not access_token: return
-        try:
-            response = self.invoice_api.get_draft_invoices(access_token, organization_id)
-            if response.get('code') == 0:
-                invoices_list = response.get('invoices', [])
-                self.view.dashboard_widget.populate_draft_invoices_table(invoices_list)
-                self.view.statusBar().showMessage(f"Found {len(invoices_list)} draft invoice(s).")
+        # Sent drafts are not listed as drafts any more, so only a full pass drops them.
+        force_full = organization_id in self._drafts_to_relist
+        self._drafts_to_relist.discard(organization_id)
+        self.view.statusBar().showMessage("Fetching draft invoices...")
+        dashboard_ui.set_draft_invoices([])
+        invoice_count = 0
+
+        def on_update(update: tuple):
+            nonlocal invoice_count
+            kind, records = update
+            if kind == 'page':
+                invoice_count += len(records)
+                dashboard_ui.add_draft_invoices(records)
+                self.view.statusBar().showMessage(f"Found {invoice_count} draft invoice(s)...")
             else:
-                self.view.show_message("API Error", f"Could not fetch drafts: {response.get('message')}", level='critical')
-        except Exception as e:
-            self.view.show_message("Error", f"An error occurred while fetching drafts: {e}", level='critical')
-        finally:
-            self.view.statusBar().showMessage("Ready")
+                dashboard_ui.set_draft_invoices(records)
+
+        def on_finished(count: int):
+            self.update_api_quota_display()
+            self.view.statusBar().showMessage(f"Found {count} draft invoice(s).", 5000)
+            if on_complete:
+                on_complete(count, None)
+
+        def on_error(error: Exception):
+            if force_full:
+                self._drafts_to_relist.add(organization_id)
+            if on_complete:
+                self.update_api_quota_display()
+                on_complete(None, error)
+            else:
+                self._report_task_error("fetch drafts")(error)
+
+        self.tasks.submit(
+            self._sync_list, account_index, organization_id, 'invoices', DraftInvoice,
+            status='draft', force_full=force_full, on_progress=on_update, on_result=on_finished,
+            on_error=on_error,
+            is_current=self._request_guard('drafts'),
+            on_dropped=(lambda: on_complete(None, None)) if on_complete else None
+        )
 
     def run(self):
         self.view.show()
+        self.view.schedule_browser_warm_up()
+        self.offer_to_resume_send_jobs()
+
+    # The per-organization lists, with the handler fetching each
+    REFRESH_PARTS = ('items', 'customers', 'drafts')
+
+    def schedule_refresh(self, *parts: str):
+        """
+        Asks for 'items', 'customers', 'drafts' and/or 'organizations' to be refreshed.
+        Requests arriving within REFRESH_DEBOUNCE_MS of each other are merged, so each
+        list is fetched once, for the organization selected when they stop.
+        """
+        self._pending_refresh.update(parts)
+        self._refresh_timer.start()
 
-    def handle_refresh_data_for_current_org(self):
+    def _run_scheduled_refresh(self):
+        parts, self._pending_refresh = self._pending_refresh, set()
+        if set(self.REFRESH_PARTS) <= parts:
+            self.handle_refresh_data_for_current_org(include_organizations='organizations' in parts)
+            return
+        handlers = {'items': self.handle_fetch_items, 'customers': self.handle_fetch_customers,
+                    'drafts': self.handle_fetch_draft_invoices}
+        for part in self.REFRESH_PARTS:
+            if part in parts:
+                handlers[part]()
+
+    def handle_refresh_data_for_current_org(self, *, include_organizations: bool = True):
         """
-        Fetches a fresh copy of the organization list to update details,
-        then refreshes all related data for the current organization.
+        Refreshes the organization details, items, customers and draft invoices of the
+        current organization. All four requests run concurrently; each table updates as
+        soon as its data arrives and one combined report is shown when the last finishes.
+        With include_organizations=False the organization list is not requested again.
         """
         self.view.statusBar().showMessage("Refreshing all data...")
 
@@ -216,32 +431,57 @@ class AppController:
         if not current_org_data:
             self.view.statusBar().showMessage("No organization selected to refresh.", 5000)
             return
-        current_org_id = current_org_data['organization_id']
-
-        # 2. Re-fetch the list of all organizations to get any updates
+        current_org_id = current_org_data.organization_id
         account_index = self.view.settings_tab.get_selected_account_index()
-        access_token = self.get_valid_access_token(account_index)
-        if not access_token:
-            return
-            
-        try:
-            org_response = self.invoice_api.get_organizations(access_token)
+
+        pending = {"Items", "Customers", "Draft invoices"}
+        if include_organizations:
+            pending.add("Organization details")
+        fetched = []
+        errors = []
+        scope = self._current_scope()
+
+        def part_finished(part: str, count: int | None, error: Exception | None):
+            # count and error are both None for parts whose result was dropped for a newer request.
+            pending.discard(part)
+            if error is not None:
+                errors.append(f"{part}: {error}")
+            elif count is not None:
+                fetched.append(f"{count} {part.lower()}")
+            if pending:
+                return
+            self.update_api_quota_display()
+            if self._current_scope() != scope:
+                # Another account or organization is shown now; its own fetches report on it.
+                return
+            if errors:
+                self.view.statusBar().showMessage("Refresh finished with errors.", 5000)
+                error_list = "\n".join(f"- {entry}" for entry in errors)
+                self.view.show_message("Refresh Error", f"Some data could not be refreshed:\n\n{error_list}", level='warning')
+            else:
+                self.view.statusBar().showMessage(f"All data refreshed ({', '.join(fetched)}).", 5000)
+
+        def on_organizations(org_response: dict):
             if org_response.get('code') == 0:
-                # 3. Repopulate the dropdown with the fresh data
-                organizations_list = org_response.get('organizations', [])
-                self.view.dashboard_widget.populate_organizations_list(organizations_list, current_org_id)
+                # Repopulate the dropdown with the fresh data, keeping the selection
+                organizations = parse_records(Organization, org_response.get('organizations', []))
+                self.view.dashboard_widget.populate_organizations_list(organizations, current_org_id)
+                part_finished("Organization details", None, None)
             else:
-                self.view.show_message("Refresh Error", "Could not fetch updated organization details.", level='warning')
+                part_finished("Organization details", None, org_response.get('message', 'Unknown API error.'))
 
-        except Exception as e:
-            self.view.show_message("Refresh Error", f"An error occurred: {e}", level='warning')
-            return # Stop if we can't get org details
-
-        # 4. Now, refresh all other data as before
-        self.handle_fetch_items()
-        self.handle_fetch_customers()
-        self.handle_fetch_draft_invoices()
-        self.view.statusBar().showMessage("All data refreshed.", 5000)
+        # 2. The organization list and the per-org lists are independent, so request them all at once
+        if include_organizations:
+            self.tasks.submit(
+                self._call_with_token, account_index, self.invoice_api.get_organizations,
+                on_result=on_organizations,
+                on_error=lambda error: part_finished("Organization details", None, error),
+                is_current=self._request_guard('refresh'),
+                on_dropped=lambda: part_finished("Organization details", None, None)
+            )
+        self.handle_fetch_items(on_complete=lambda count, error: part_finished("Items", count, error))
+        self.handle_fetch_customers(on_complete=lambda count, error: part_finished("Customers", count, error))
+        self.handle_fetch_draft_invoices(on_complete=lambda count, error: part_finished("Draft invoices", count, error))
     
     # def handle_refresh_all(self):
     #     """Refreshes org details, items, customers, and draft invoices."""
@@ -250,61 +490,106 @@ class AppController:
     #     self.handle_fetch_draft_invoices()
 
     def handle_create_invoice(self):
+        dashboard_ui = self.view.dashboard_widget
         self.view.statusBar().showMessage("Validating invoice...")
-        invoice_data, error_msg = self.view.dashboard_widget.get_invoice_data()
+        invoice_data, error_msg = dashboard_ui.get_invoice_data()
         if error_msg:
             self.view.show_message("Validation Error", error_msg, level='warning')
             return
-        organization_id = self.view.dashboard_widget.organization_selector.currentData()['organization_id']
+        organization_id = dashboard_ui.organization_selector.currentData().organization_id
         account_index = self.view.settings_tab.get_selected_account_index()
-        access_token = self.get_valid_access_token(account_index)
-        if not access_token:
-            self.view.show_message("Authentication Error", "Could not get a valid access token.", level='critical')
-            return
+        estimated_total = dashboard_ui.invoice_totals().total
         self.view.statusBar().showMessage("Creating invoice...")
-        try:
-            response = self.invoice_api.create_invoice(access_token, organization_id, invoice_data)
+        dashboard_ui.create_invoice_button.setEnabled(False)
+
+        def on_created(response: dict):
+            dashboard_ui.create_invoice_button.setEnabled(True)
+            self.view.statusBar().showMessage("Ready")
             if response.get('code') == 0:
-                invoice_id = response['invoice']['invoice_id']
-                self.view.show_message("Success", f"Successfully created invoice with ID: {invoice_id}")
-                self.view.dashboard_widget.clear_invoice_form()
-                self.handle_fetch_draft_invoices()
+                invoice = response['invoice']
+                message = f"Successfully created invoice with ID: {invoice['invoice_id']}"
+                stale_rates = changed_rates(invoice, self.records.items)
+                try:
+                    total = float(invoice.get('total'))
+                except (TypeError, ValueError):
+                    total = estimated_total
+                if stale_rates:
+                    changes = ", ".join(f"{item.name} ({item.rate:.2f} -> {rate:.2f})" for item, rate in stale_rates)
+                    message += (f"\n\nZoho used rates that differ from the local item list: {changes}. "
+                                f"The invoice total is {total:.2f}. The item list is being refreshed.")
+                elif abs(total - estimated_total) >= 0.005:
+                    message += f"\n\nThe invoice total is {total:.2f}; the estimate was {estimated_total:.2f}."
+                self.view.show_message("Success", message)
+                dashboard_ui.clear_invoice_form()
+                self._show_created(organization_id, 'drafts', [invoice])
+                if stale_rates:
+                    self.schedule_refresh('items')
             else:
                 message = response.get('message', 'An unknown API error occurred.')
                 self.view.show_message("API Error", f"Could not create invoice: {message}", level='critical')
-        except Exception as e:
-            self.view.show_message("Error", f"An unexpected error occurred: {e}", level='critical')
-        finally:
+
+        def on_error(error: Exception):
+            dashboard_ui.create_invoice_button.setEnabled(True)
             self.view.statusBar().showMessage("Ready")
+            self.view.show_message("Error", f"An unexpected error occurred: {error}", level='critical')
 
-    def handle_fetch_items(self):
-        self.view.statusBar().showMessage("Fetching items...")
-        selected_org_data = self.view.dashboard_widget.organization_selector.currentData()
-        if not selected_org_data or 'organization_id' not in selected_org_data:
+        # Creation results are never dropped: the invoice exists even if the user moved on.
+        self.tasks.submit(
+            self._create_record, account_index, organization_id, 'invoices', 'invoice',
+            self.invoice_api.create_invoice, invoice_data,
+            on_result=on_created, on_error=on_error
+        )
+
+    def handle_fetch_items(self, *, on_complete=None):
+        """
+        Shows the locally stored items, then fetches them in the background. When on_complete is given it is called
+        with (count, None) or (None, error) instead of reporting errors in a dialog, or with (None, None) if the
+        result was dropped for a newer fetch or another organization.
+        """
+        dashboard_ui = self.view.dashboard_widget
+        selected_org_data = dashboard_ui.organization_selector.currentData()
+        dashboard_ui.set_item_rates_checked(None)
+        if not selected_org_data:
             self.view.statusBar().showMessage("Select an organization to view items.")
-            self.view.dashboard_widget.populate_items_table([])
+            dashboard_ui.set_items([])
             return
-        organization_id = selected_org_data['organization_id']
+        organization_id = selected_org_data.organization_id
         account_index = self.view.settings_tab.get_selected_account_index()
-        access_token = self.get_valid_access_token(account_index)
-        if not access_token:
-            self.view.show_message("Authentication Error", "Could not get access token to fetch items.", level='critical')
-            self.view.statusBar().showMessage("Ready")
-            return
-        try:
-            response = self.invoice_api.get_items(access_token, organization_id)
-            if response.get('code') == 0:
-                items_list = response.get('items', [])
-                self.view.dashboard_widget.populate_items_table(items_list)
-                self.view.dashboard_widget.store_item_list(items_list)
-                self.view.statusBar().showMessage(f"Successfully fetched {len(items_list)} item(s).")
+        self.view.statusBar().showMessage("Fetching items...")
+        dashboard_ui.set_items([])
+        item_count = 0
+
+        def on_update(update: tuple):
+            nonlocal item_count
+            kind, records = update
+            if kind == 'page':
+                item_count += len(records)
+                dashboard_ui.add_items(records)
+                self.view.statusBar().showMessage(f"Fetched {item_count} item(s)...")
             else:
-                message = response.get('message', 'An unknown API error occurred.')
-                self.view.show_message("API Error", f"Could not fetch items: {message}", level='critical')
-        except Exception as e:
-            self.view.show_message("Error", f"An unexpected error occurred while fetching items: {e}", level='critical')
-        finally:
-            self.view.statusBar().showMessage("Ready")
+                dashboard_ui.set_items(records)
+
+        def on_finished(count: int):
+            dashboard_ui.set_item_rates_checked(time.time())
+            self.update_api_quota_display()
+            self.view.statusBar().showMessage(f"Successfully fetched {count} item(s).", 5000)
+            if on_complete:
+                on_complete(count, None)
+
+        def on_error(error: Exception):
+            if on_complete:
+                self.update_api_quota_display()
+                on_complete(None, error)
+            else:
+                self._report_task_error("fetch items")(error)
+
+        self.tasks.submit(
+            self._sync_list, account_index, organization_id, 'items', Item,
+            on_progress=on_update, on_result=on_finished,
+            on_error=on_error,
+            is_current=self._request_guard('items'),
+            on_dropped=(lambda: on_complete(None, None)) if on_complete else None
+        )
 
     def handle_add_invoice_line(self):
         self.view.dashboard_widget.add_invoice_line_row()
@@ -331,39 +616,221 @@ class AppController:
         if reply == QMessageBox.StandardButton.No:
             return
         selected_org_data = dashboard_ui.organization_selector.currentData()
-        organization_id = selected_org_data['organization_id']
+        organization_id = selected_org_data.organization_id
         account_index = self.view.settings_tab.get_selected_account_index()
-        access_token = self.get_valid_access_token(account_index)
-        if not access_token:
-            self.view.show_message("Authentication Error", "Could not get a valid access token.", level='critical')
-            return
         progress = QProgressDialog("Submitting customers...", "Cancel", 0, len(customers_to_create), self.view)
         progress.setWindowModality(Qt.WindowModality.WindowModal)
-        success_count = 0
-        failed_entries = []
-        for i, customer in enumerate(customers_to_create):
-            progress.setValue(i)
-            progress.setLabelText(f"Submitting '{customer['contact_name']}'...")
-            if progress.wasCanceled():
-                break
-            try:
-                response = self.invoice_api.create_customer(access_token, organization_id, customer)
-                if response.get('code') == 0:
-                    success_count += 1
-                else:
-                    error = response.get('message', 'Unknown API error')
-                    failed_entries.append(f"'{customer['contact_name']}': {error}")
-            except Exception as e:
-                failed_entries.append(f"'{customer['contact_name']}': {e}")
-        progress.setValue(len(customers_to_create))
-        summary_message = f"Submission Complete!\n\n- Successful: {success_count}\n- Failed: {len(failed_entries)}"
-        if failed_entries:
-            summary_message += "\n\nFailures:\n" + "\n".join(f"- {entry}" for entry in failed_entries)
-        QMessageBox.information(self.view, "Submission Report", summary_message)
-        if success_count > 0 and not failed_entries:
-             dashboard_ui.customers_input_table.setRowCount(1)
-             dashboard_ui.customers_input_table.clearContents()
-             self.handle_fetch_customers()
+        progress.setMinimumDuration(0)
+        importer = ContactImporter(self.invoice_api)
+        progress.canceled.connect(importer.cancel)
+        completed = 0
+        problems = {SKIPPED: [], IMPORT_FAILED: []}
+        created = []
+
+        def on_progress(result: dict):
+            nonlocal completed
+            completed += 1
+            if result['status'] == CREATED:
+                created.append(result['contact'])
+            self._collect_import_problem(problems, result, f"'{result['contact_name']}'")
+            if not progress.wasCanceled():
+                progress.setValue(completed)
+                progress.setLabelText(f"Submitted '{result['contact_name']}' ({completed}/{len(customers_to_create)})")
+
+        def on_finished(counts: dict):
+            progress.setValue(len(customers_to_create))
+            self._show_import_report("Submission Report", "Submission Complete!", counts, problems)
+            self.update_api_quota_display()
+            if not counts[IMPORT_FAILED] and sum(counts.values()) == len(customers_to_create):
+                 dashboard_ui.customers_input_table.setRowCount(1)
+                 dashboard_ui.customers_input_table.clearContents()
+            self._show_created(organization_id, 'customers', created)
+
+        def on_error(error: Exception):
+            progress.close()
+            self._show_created(organization_id, 'customers', created)
+            self.view.show_message("Authentication Error", f"Could not submit customers: {error}", level='critical')
+
+        self.tasks.submit(
+            self._submit_customers, account_index, organization_id, customers_to_create, importer,
+            on_progress=on_progress, on_result=on_finished, on_error=on_error
+        )
+
+    def _submit_customers(self, account_index: int, organization_id: str, customers: list,
+                          importer: ContactImporter, report) -> dict:
+        """
+        Worker-thread body for handle_submit_customers. Brings the local contact list up
+        to date first, so that rows matching contacts created elsewhere are skipped.
+        """
+        access_token = self.get_access_token(account_index)
+        store = self._local_store(organization_id)
+        self.delta_sync.sync(access_token, organization_id, store, 'contacts')
+
+        def on_result(result: dict):
+            if result['contact']:
+                store.upsert('contacts', [result['contact']])
+            report(result)
+
+        return importer.run(access_token, organization_id, enumerate(customers, start=1),
+                            ContactIndex(store.load('contacts')), on_result=on_result)
+
+    def handle_import_customers_file(self):
+        self._start_file_import('customers')
+
+    def handle_import_invoices_file(self):
+        self._start_file_import('invoices')
+
+    def _start_file_import(self, kind: str):
+        """
+        Imports customers or invoices (one row per line item) from a CSV/XLSX file. The file
+        is read, validated and submitted as a stream in the background, so its size only
+        affects how long this takes.
+        """
+        dashboard_ui = self.view.dashboard_widget
+        selected_org_data = dashboard_ui.organization_selector.currentData()
+        if not selected_org_data:
+            self.view.show_message("No Organization", "Please select an organization first.", level='warning')
+            return
+        file_path, _ = QFileDialog.getOpenFileName(self.view, f"Import {kind.capitalize()}", "", "Spreadsheets (*.csv *.xlsx)")
+        if not file_path:
+            return
+        organization_id = selected_org_data.organization_id
+        account_index = self.view.settings_tab.get_selected_account_index()
+        if kind == 'customers':
+            importer = ContactImporter(self.invoice_api)
+        else:
+            importer = InvoiceImporter(self.invoice_api, self._local_store(organization_id))
+
+        # The number of rows is not known up front, so the dialog shows a busy indicator.
+        progress = QProgressDialog(f"Importing {kind}...", "Cancel", 0, 0, self.view)
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(0)
+        progress.canceled.connect(importer.cancel)
+        processed = 0
+        problems = {SKIPPED: [], IMPORT_FAILED: []}
+        part = 'customers' if kind == 'customers' else 'drafts'
+        created = []
+
+        def on_progress(result: dict):
+            nonlocal processed
+            processed += 1
+            if result['status'] == CREATED:
+                created.append(result['contact'] if kind == 'customers' else result['invoice'])
+            label = f"'{result['contact_name']}'" if kind == 'customers' else f"invoice '{result['invoice_key']}'"
+            self._collect_import_problem(problems, result, label)
+            if not progress.wasCanceled():
+                progress.setLabelText(f"Importing {kind}... {processed} processed")
+
+        def on_finished(counts: dict):
+            progress.close()
+            self._show_import_report("Import Report", "Import Complete!", counts, problems)
+            self.update_api_quota_display()
+            self._show_created(organization_id, part, created)
+
+        def on_error(error: Exception):
+            progress.close()
+            self._show_created(organization_id, part, created)
+            self.view.show_message("Import Error", f"Could not import {kind}: {error}", level='critical')
+
+        self.tasks.submit(
+            self._import_file, account_index, organization_id, kind, file_path, importer,
+            on_progress=on_progress, on_result=on_finished, on_error=on_error
+        )
+
+    def _import_file(self, account_index: int, organization_id: str, kind: str, file_path: str,
+                     importer, report) -> dict:
+        """
+        Worker-thread body for _start_file_import. Brings the local contacts (and, for
+        invoices, items) up to date first, since rows are checked against them.
+        Created records are written through to the local store.
+        """
+        access_token = self.get_access_token(account_index)
+        store = self._local_store(organization_id)
+        self.delta_sync.sync(access_token, organization_id, store, 'contacts')
+        if kind == 'customers':
+            def on_contact(result: dict):
+                if result['contact']:
+                    store.upsert('contacts', [result['contact']])
+                report(result)
+            return import_customers_file(importer, access_token, organization_id, file_path,
+                                         ContactIndex(store.load('contacts')), on_result=on_contact)
+
+        self.delta_sync.sync(access_token, organization_id, store, 'items')
+        def on_invoice(result: dict):
+            if result['invoice']:
+                store.upsert('invoices', [result['invoice']])
+            report(result)
+        return importer.run(access_token, organization_id, file_path, on_result=on_invoice)
+
+    def handle_export(self, what: str):
+        """
+        Exports the selected organization's items, contacts or invoices to a CSV or
+        Parquet file. The local mirror is brought up to date, then streamed into the
+        file page by page in the background.
+        """
+        selected_org_data = self.view.dashboard_widget.organization_selector.currentData()
+        if not selected_org_data:
+            self.view.show_message("No Organization", "Please select an organization first.", level='warning')
+            return
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self.view, f"Export {what.capitalize()}", f"{what}.csv", "CSV (*.csv);;Parquet (*.parquet)"
+        )
+        if not file_path:
+            return
+        if not file_path.lower().endswith(FORMATS):
+            file_path += '.parquet' if 'parquet' in selected_filter.lower() else '.csv'
+        organization_id = selected_org_data.organization_id
+        account_index = self.view.settings_tab.get_selected_account_index()
+
+        progress = QProgressDialog(f"Exporting {what}...", None, 0, 0, self.view)
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(0)
+
+        def on_progress(count: int):
+            progress.setLabelText(f"Exporting {what}... {count} written")
+
+        def on_finished(count: int):
+            progress.close()
+            self.update_api_quota_display()
+            self.view.show_message("Export Complete", f"Exported {count} {what} to {file_path}.")
+
+        def on_error(error: Exception):
+            progress.close()
+            self.update_api_quota_display()
+            self.view.show_message("Export Error", f"Could not export {what}: {error}", level='critical')
+
+        self.tasks.submit(
+            self._export_file, account_index, organization_id, what, file_path,
+            on_progress=on_progress, on_result=on_finished, on_error=on_error
+        )
+
+    def _export_file(self, account_index: int, organization_id: str, what: str, file_path: str, report) -> int:
+        """Worker-thread body for handle_export. Returns the number of records written."""
+        entity, status = EXPORTS[what]
+        store = self._local_store(organization_id)
+        self.delta_sync.sync(self.get_access_token(account_index), organization_id, store, entity, status=status)
+        with RecordExporter(file_path, entity) as exporter:
+            for page in store_pages(store, what):
+                report(exporter.write_page(organization_id, page))
+        return exporter.count
+
+    @staticmethod
+    def _collect_import_problem(problems: dict, result: dict, label: str):
+        """Keeps the first few skipped and failed rows of an import for its report."""
+        lines = problems.get(result['status'])
+        if lines is not None and len(lines) < settings.IMPORT_REPORT_MAX_ROWS:
+            lines.append(f"Row {result['row']} {label}: {result['detail']}")
+
+    def _show_import_report(self, title: str, heading: str, counts: dict, problems: dict):
+        """Shows the created/skipped/failed counts of a submission or import, with the problem rows."""
+        summary_message = (f"{heading}\n\n- Created: {counts[CREATED]}\n"
+                           f"- Skipped (already exist): {counts[SKIPPED]}\n- Failed: {counts[IMPORT_FAILED]}")
+        for status, section in ((SKIPPED, "Skipped"), (IMPORT_FAILED, "Failures")):
+            if problems[status]:
+                summary_message += f"\n\n{section}:\n" + "\n".join(f"- {line}" for line in problems[status])
+                if counts[status] > len(problems[status]):
+                    summary_message += f"\n- ...and {counts[status] - len(problems[status])} more"
+        QMessageBox.information(self.view, title, summary_message)
 
     def handle_add_item(self):
         dashboard_ui = self.view.dashboard_widget
@@ -379,104 +846,235 @@ class AppController:
             self.view.show_message("Input Error", "Rate must be a valid number.", level='warning')
             return
         selected_org_data = dashboard_ui.organization_selector.currentData()
-        if not selected_org_data or 'organization_id' not in selected_org_data:
+        if not selected_org_data:
             self.view.show_message("Error", "Please select a valid organization from the 'Account Details' tab first.", level='critical')
             return
-        organization_id = selected_org_data['organization_id']
-        self.view.statusBar().showMessage("Authenticating...")
+        organization_id = selected_org_data.organization_id
         account_index = self.view.settings_tab.get_selected_account_index()
         if account_index is None:
              self.view.show_message("Error", "Please select a valid account first.", level='critical')
-             self.view.statusBar().showMessage("Ready")
              return
-        access_token = self.get_valid_access_token(account_index)
-        if not access_token:
-            self.view.show_message("Authentication Error", "Could not get a valid access token.", level='critical')
-            self.view.statusBar().showMessage("Ready")
-            return
         self.view.statusBar().showMessage(f"Adding item '{item_name}'...")
         item_payload = { "name": item_name, "rate": rate, "description": description }
-        try:
-            response = self.invoice_api.create_item(access_token, organization_id, item_payload)
+        dashboard_ui.add_item_button.setEnabled(False)
+
+        def on_created(response: dict):
+            dashboard_ui.add_item_button.setEnabled(True)
+            self.view.statusBar().showMessage("Ready")
             if response.get('code') == 0:
                 self.view.show_message("Success", f"Item '{item_name}' was added successfully.")
                 dashboard_ui.clear_add_item_form()
-                self.handle_fetch_items()
+                self._show_created(organization_id, 'items', [response.get('item')])
             else:
                 message = response.get('message', 'An unknown API error occurred.')
                 self.view.show_message("API Error", f"Could not add item: {message}", level='critical')
-        except Exception as e:
-            self.view.show_message("Error", f"An unexpected error occurred: {e}", level='critical')
-        finally:
+
+        def on_error(error: Exception):
+            dashboard_ui.add_item_button.setEnabled(True)
             self.view.statusBar().showMessage("Ready")
+            self.view.show_message("Error", f"An unexpected error occurred: {error}", level='critical')
+
+        self.tasks.submit(
+            self._create_record, account_index, organization_id, 'items', 'item',
+            self.invoice_api.create_item, item_payload,
+            on_result=on_created, on_error=on_error
+        )
 
     def handle_organization_selection_changed(self):
         """Displays org details and fetches all data for the selected org."""
         selected_org_data = self.view.dashboard_widget.organization_selector.currentData()
         self.view.dashboard_widget.display_organization_details(selected_org_data)
         if selected_org_data:
-            self.handle_refresh_data_for_current_org()
+            self.schedule_refresh(*self.REFRESH_PARTS, 'organizations')
         
     def handle_view_email_templates(self):
         selected_org_data = self.view.dashboard_widget.organization_selector.currentData()
-        if not selected_org_data or 'organization_id' not in selected_org_data:
+        if not selected_org_data:
             self.view.show_message("Action Blocked", "Please select a valid organization from the dropdown first.", level='warning')
             return
-        org_id = selected_org_data['organization_id']
+        org_id = selected_org_data.organization_id
         url = f"https://invoice.zoho.com/app/{org_id}#/settings/emails/templates?email_type=invoice_notification"
         self.view.statusBar().showMessage("Opening email templates list...")
         self.view.open_url_in_browser_tab(url)
 
     def handle_fetch_organizations(self):
-        """Fetches org data and populates the organization dropdown."""
+        """
+        Shows the organization list saved from the last session, then fetches the current
+        one in the background and loads the data of the selected organization.
+        """
         self.view.statusBar().showMessage("Refreshing organization list...")
         index = self.view.settings_tab.get_selected_account_index()
         if index is None or index <= 0:
             self.view.statusBar().showMessage("Cannot refresh: No authorized account selected.")
             return
-        access_token = self.get_valid_access_token(index)
-        if not access_token:
-            self.view.statusBar().showMessage("Refresh failed: Could not get access token.")
-            return
-        try:
-            org_data = self.invoice_api.get_organizations(access_token)
+        cached_organizations = parse_records(Organization, self.config_manager.load_credentials(index).get('organizations') or [])
+        if cached_organizations:
+            self.view.dashboard_widget.populate_organizations_list(cached_organizations)
+            self.schedule_refresh(*self.REFRESH_PARTS)
+
+        def on_organizations(org_data: dict):
             if org_data.get('code') == 0 and org_data.get('organizations'):
-                organizations_list = org_data['organizations']
-                self.view.dashboard_widget.populate_organizations_list(organizations_list)
-                self.view.statusBar().showMessage(f"Successfully loaded {len(organizations_list)} organization(s).")
+                organizations = parse_records(Organization, org_data['organizations'])
+                previous_org_id = self._current_scope()[1]
+                if organizations != cached_organizations:
+                    # Only the fields the app uses are saved
+                    self.config_manager.save_credentials(index, {'organizations': [asdict(org) for org in organizations]})
+                    self.view.dashboard_widget.populate_organizations_list(organizations, previous_org_id)
+                if not cached_organizations or self._current_scope()[1] != previous_org_id:
+                    self.schedule_refresh(*self.REFRESH_PARTS)
+                self.view.statusBar().showMessage(f"Successfully loaded {len(organizations)} organization(s).")
             else:
                 message = org_data.get('message', 'Unknown API error.')
                 self.view.show_message("API Error", f"Failed to get organization details: {message}", level='critical')
                 self.view.dashboard_widget.clear_organization_details() 
-        except Exception as e:
-            self.view.show_message("Error", f"An error occurred while fetching data: {e}", level='critical')
-            self.view.dashboard_widget.clear_organization_details()
+
+        def on_error(error: Exception):
+            self.view.statusBar().showMessage("Refresh failed.")
+            self.view.show_message("Error", f"An error occurred while fetching data: {error}", level='critical')
+            if not cached_organizations:
+                self.view.dashboard_widget.clear_organization_details()
+
+        self.tasks.submit(
+            self._call_with_token, index, self.invoice_api.get_organizations,
+            on_result=on_organizations, on_error=on_error,
+            is_current=self._request_guard('organizations', include_org=False)
+        )
 
     def handle_open_sender_settings(self):
         selected_org_data = self.view.dashboard_widget.organization_selector.currentData()
-        if not selected_org_data or 'organization_id' not in selected_org_data:
+        if not selected_org_data:
             self.view.show_message("Action Blocked","Please select a valid organization from the dropdown first.", level='warning')
             return
-        org_id = selected_org_data['organization_id']
+        org_id = selected_org_data.organization_id
         url = f"https://invoice.zoho.com/app/{org_id}#/settings/emails/preference"
         self.view.open_url_in_browser_tab(url)
 
-    def get_valid_access_token(self, account_index: int) -> str | None:
-        creds = self.config_manager.load_credentials(account_index)
-        if not creds.get('refresh_token'):
-            return None
-        expiry_ts = creds.get('token_expiry_timestamp', 0)
-        if expiry_ts > time.time() + 30:
-            return creds.get('access_token')
-        try:
-            token_data = self.auth_manager.refresh_access_token(creds['client_id'], creds['client_secret'], creds['refresh_token'])
-            data_to_save = { 'access_token': token_data['access_token'], 'token_expiry_timestamp': int(time.time()) + token_data.get('expires_in', 3600) }
-            self.config_manager.save_credentials(account_index, data_to_save)
-            return data_to_save['access_token']
-        except Exception as e:
-            self.view.show_message("Authentication Error", f"Could not refresh access token: {e}", level='critical')
-            return None
+    def get_access_token(self, account_index: int) -> str:
+        """
+        Returns a valid access token for the account from the in-memory token provider.
+        This runs on worker threads, so failures are raised rather than shown.
+        """
+        return self.token_provider.get_token(account_index)
+
+    def _call_with_token(self, account_index: int, api_method, *args):
+        """Worker-thread body: obtains a valid token, then calls an InvoiceApi method with it."""
+        access_token = self.get_access_token(account_index)
+        return api_method(access_token, *args)
+
+    def _create_record(self, account_index: int, organization_id: str, entity: str, record_key: str,
+                       api_method, payload: dict) -> dict:
+        """
+        Worker-thread body for creating one item or invoice: calls the InvoiceApi create
+        method and writes the record Zoho returns (response[record_key]) through to the
+        local store's `entity`. The record exists in Zoho by then, so a failed store
+        write is only logged; the next sync picks the record up.
+        """
+        response = self._call_with_token(account_index, api_method, organization_id, payload)
+        record = response.get(record_key) if response.get('code') == 0 else None
+        if record:
+            try:
+                self._local_store(organization_id).upsert(entity, [record])
+            except sqlite3.Error as e:
+                print(f"Could not store the new {record_key} locally: {e}")
+        return response
+
+    def _local_store(self, organization_id: str) -> LocalStore:
+        """Returns the on-disk mirror for an organization, opening it on first use."""
+        with self._local_stores_lock:
+            store = self._local_stores.get(organization_id)
+            if store is None:
+                store = LocalStore(organization_id)
+                self._local_stores[organization_id] = store
+            return store
+
+    def _sync_list(self, account_index: int, organization_id: str, entity: str, record_type,
+                   report, status: str = None, force_full: bool = False) -> int:
+        """
+        Worker-thread body for the list fetches (stale-while-revalidate).
+        Reports ('cached', records) from the local store straight away, then brings the
+        store up to date with a delta sync. Without a cached copy each downloaded page is
+        reported as ('page', records); otherwise a single ('replace', records) is reported
+        at the end, and only if anything changed. `status` narrows invoices, e.g. to drafts;
+        only invoices of that status are then downloaded. `force_full` re-lists everything.
+        Records are converted to `record_type` here, so the UI thread only gets compact ones.
+        """
+        store = self._local_store(organization_id)
+        cached = store.load(entity, status=status)
+        if cached:
+            report(('cached', parse_records(record_type, cached)))
+        access_token = self.get_access_token(account_index)
+
+        def on_page(page: list):
+            if cached:
+                return
+            if page:
+                report(('page', parse_records(record_type, page)))
+
+        changed_count, _ = self.delta_sync.sync(access_token, organization_id, store, entity,
+                                                force_full=force_full, on_page=on_page, status=status)
+        if cached and changed_count:
+            report(('replace', parse_records(record_type, store.load(entity, status=status))))
+        return store.count(entity, status=status)
+
+    def _show_created(self, organization_id: str, part: str, created: list[dict | None]):
+        """
+        Adds records just created in Zoho, as returned by the create calls, to the
+        dashboard's 'items', 'customers' or 'drafts' instead of downloading the whole
+        list again. If a response did not include its record, `part` is refreshed
+        instead. Nothing is shown once the dashboard has moved on to another organization.
+        """
+        if not created or self._current_scope()[1] != organization_id:
+            return
+        if any(record is None for record in created):
+            self.schedule_refresh(part)
+            return
+        dashboard_ui = self.view.dashboard_widget
+        if part == 'items':
+            collection, records, add = 'items', parse_records(Item, created), dashboard_ui.add_items
+        elif part == 'customers':
+            collection, records, add = 'contacts', parse_records(Contact, created), dashboard_ui.add_contacts
+        else:
+            drafts = [invoice for invoice in created if invoice.get('status', 'draft') == 'draft']
+            collection, records, add = 'draft_invoices', parse_records(DraftInvoice, drafts), dashboard_ui.add_draft_invoices
+        # A refresh that finished meanwhile may already list them.
+        add(self.records.new_records(collection, records))
+
+    def _current_scope(self, include_org: bool = True) -> tuple:
+        """The (account, organization) the dashboard is currently showing."""
+        account_index = self.view.settings_tab.get_selected_account_index()
+        if not include_org:
+            return (account_index,)
+        org_data = self.view.dashboard_widget.organization_selector.currentData()
+        return (account_index, org_data.organization_id if org_data else None)
+
+    def _request_guard(self, kind: str, include_org: bool = True):
+        """
+        Registers a new background request of `kind` and returns a callable telling whether
+        its results are still wanted. They are not once a newer request of the same kind
+        starts or the user selects another account (or organization, with include_org).
+        """
+        ticket = object()
+        self._active_requests[kind] = ticket
+        scope = self._current_scope(include_org)
+        return lambda: self._active_requests.get(kind) is ticket and self._current_scope(include_org) == scope
+
+    def _report_task_error(self, action: str):
+        """Builds an on_error callback that reports a failed background fetch."""
+        def on_error(error: Exception):
+            self.update_api_quota_display()
+            self.view.statusBar().showMessage("Ready")
+            title = "API Error" if isinstance(error, ConnectionError) else "Error"
+            self.view.show_message(title, f"Could not {action}: {error}", level='critical')
+        return on_error
             
+    def update_api_quota_display(self):
+        """Shows how much of today's API quota is left for the selected organization."""
+        selected_org_data = self.view.dashboard_widget.organization_selector.currentData()
+        if not selected_org_data:
+            return
+        quota = self.invoice_api.remaining_daily_quota(selected_org_data.organization_id)
+        self.view.dashboard_widget.display_api_quota(quota)
+
     def handle_account_selection_changed(self):
         index = self.view.settings_tab.get_selected_account_index()
         self.view.dashboard_widget.clear_organization_details()
@@ -529,11 +1127,12 @@ class AppController:
     def exchange_code_for_tokens(self, code: str):
         index = self._authorizing_account_index
         if not index: return
+        self._authorizing_account_index = None
         creds = self.config_manager.load_credentials(index)
         client_id = creds.get('client_id')
         client_secret = creds.get('client_secret')
-        try:
-            token_data = self.auth_manager.exchange_code_for_tokens(client_id, client_secret, code)
+
+        def on_tokens(token_data: dict):
             data_to_save = {}
             if 'access_token' in token_data:
                 data_to_save['access_token'] = token_data['access_token']
@@ -543,6 +1142,7 @@ class AppController:
                 error_details = token_data.get('error', 'Unknown error.')
                 self.view.show_message("Authorization Failed", f"Could not retrieve tokens from Zoho. Details: {error_details}", level='critical')
                 return
+            self.token_provider.invalidate(index)
             if 'refresh_token' in token_data:
                 data_to_save['refresh_token'] = token_data['refresh_token']
                 self.config_manager.save_credentials(index, data_to_save)
@@ -551,10 +1151,14 @@ class AppController:
                 self.config_manager.save_credentials(index, data_to_save)
                 self.view.show_message("Success!", "Account re-authorized. New access token acquired.")
             self.handle_account_selection_changed()
-        except Exception as e:
-            self.view.show_message("Error", f"An error occurred during token exchange: {e}", level='critical')
-        finally:
-            self._authorizing_account_index = None
+
+        def on_error(error: Exception):
+            self.view.show_message("Error", f"An error occurred during token exchange: {error}", level='critical')
+
+        self.tasks.submit(
+            self.auth_manager.exchange_code_for_tokens, client_id, client_secret, code,
+            on_result=on_tokens, on_error=on_error
+        )
             
     def refresh_account_list(self, select_index: int = None):
         accounts = self.config_manager.discover_credentials()
@@ -588,6 +1192,7 @@ class AppController:
                     self.view.statusBar().showMessage("Save operation cancelled.")
                     return
                 self.config_manager.save_credentials(index, creds_to_save)
+                self.token_provider.invalidate(index)
                 self.view.show_message("Success", f"Changes to Account {index} have been saved.")
                 self.handle_account_selection_changed()
             else:
@@ -604,6 +1209,7 @@ class AppController:
         if reply == QMessageBox.StandardButton.Yes:
             try:
                 self.config_manager.delete_credentials(index)
+                self.token_provider.invalidate(index)
                 self.view.show_message("Success", f"Account {index} has been deleted.")
                 self.refresh_account_list()
             except Exception as e:
@@ -613,7 +1219,10 @@ class AppController:
         self.view.open_url_in_browser_tab(settings.ZOHO_API_CONSOLE_URL)
 
 if __name__ == '__main__':
+    # Required because QtWebEngine is imported lazily, after the QApplication exists.
+    QApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
     controller = AppController()
+    app.aboutToQuit.connect(controller.token_provider.shutdown)
     controller.run()
     sys.exit(app.exec())
\ No newline at end of file
@@ -0,0 +1,7 @@
+# tests/conftest.py
+# Makes the project's top-level packages (core, config, ui) importable from the tests.
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -0,0 +1,182 @@
+# tests/test_bulk_sender.py
+# SendQueue job states as BulkInvoiceSender moves invoices through them, including failed sends.
+
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from core.bulk_sender import BulkInvoiceSender
+from core.send_queue import SendQueue, PENDING, IN_FLIGHT, SENT, FAILED
+
+
+class FakeInvoiceApi:
+    """
+    Records bulk sends and answers get_invoice from `statuses`. `outcomes` are used one
+    per bulk request: None sends the chunk, a dict is returned as Zoho's error response,
+    and (exception, delivered) raises the exception like InvoiceApi does, after sending
+    the chunk if `delivered`.
+    """
+
+    def __init__(self, outcomes: list = ()):
+        self.outcomes = list(outcomes)
+        self.statuses = {}
+        self.sent = []
+        self.lookups = []
+        self.lookup_error = None
+
+    def send_invoice_emails_bulk(self, access_token, organization_id, invoice_ids, chunk_size=None):
+        outcome = self.outcomes.pop(0) if self.outcomes else None
+        if isinstance(outcome, tuple):
+            error, delivered = outcome
+            if delivered:
+                self._deliver(invoice_ids)
+            raise ConnectionError(f"Network error sending invoices in bulk: {error}") from error
+        if outcome is not None:
+            return [(invoice_ids, outcome)]
+        self._deliver(invoice_ids)
+        return [(invoice_ids, {'code': 0, 'message': 'sent'})]
+
+    def _deliver(self, invoice_ids):
+        self.sent.extend(invoice_ids)
+        for invoice_id in invoice_ids:
+            self.statuses[invoice_id] = 'sent'
+
+    def get_invoice(self, access_token, organization_id, invoice_id):
+        self.lookups.append(invoice_id)
+        if self.lookup_error:
+            raise ConnectionError(self.lookup_error)
+        return {'code': 0, 'invoice': {'invoice_id': invoice_id, 'status': self.statuses.get(invoice_id, 'draft')}}
+
+
+def refused_connection() -> requests.exceptions.ConnectionError:
+    reason = NewConnectionError(None, "Failed to establish a new connection: Connection refused")
+    return requests.exceptions.ConnectionError(MaxRetryError(None, '/invoices/email', reason=reason))
+
+
+def entries(count: int) -> list[dict]:
+    return [{'invoice_id': str(i), 'customer_email': f'c{i}@example.com', 'customer_name': f'C{i}'}
+            for i in range(count)]
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return SendQueue(tmp_path)
+
+
+def states(queue, job_id) -> dict:
+    return {inv['invoice_id']: inv['state'] for inv in queue.invoices(job_id)}
+
+
+def test_job_is_sent_in_bulk_chunks(queue):
+    api = FakeInvoiceApi()
+    job_id, skipped = queue.create_job(1, 'org', entries(25))
+    success_count, failed = BulkInvoiceSender(api, chunk_size=10).run_job('token', queue, job_id)
+    assert (success_count, failed, skipped) == (25, [], [])
+    assert sorted(api.sent, key=int) == [str(i) for i in range(25)]
+    assert queue.counts(job_id) == {PENDING: 0, IN_FLIGHT: 0, SENT: 25, FAILED: 0}
+
+
+def test_zoho_error_response_marks_the_chunk_failed_and_retry_sends_it(queue):
+    api = FakeInvoiceApi([{'code': 1001, 'message': 'Invalid invoice'}])
+    job_id, _ = queue.create_job(1, 'org', entries(3))
+    success_count, failed = BulkInvoiceSender(api).run_job('token', queue, job_id)
+    assert success_count == 0 and len(failed) == 3
+    assert set(states(queue, job_id).values()) == {FAILED}
+    assert queue.retry_failed(job_id) == 3
+    assert BulkInvoiceSender(api).run_job('token', queue, job_id) == (3, [])
+    assert api.sent == ['0', '1', '2']
+
+
+def test_refused_connection_marks_the_chunk_failed(queue):
+    api = FakeInvoiceApi([(refused_connection(), False)])
+    job_id, _ = queue.create_job(1, 'org', entries(2))
+    success_count, failed = BulkInvoiceSender(api).run_job('token', queue, job_id)
+    assert success_count == 0 and len(failed) == 2
+    assert set(states(queue, job_id).values()) == {FAILED}
+    assert api.sent == []
+
+
+def test_read_timeout_after_dispatch_leaves_the_chunk_in_flight(queue):
+    api = FakeInvoiceApi([(requests.exceptions.ReadTimeout("Read timed out. (read timeout=30)"), True)])
+    job_id, _ = queue.create_job(1, 'org', entries(3))
+    success_count, failed = BulkInvoiceSender(api).run_job('token', queue, job_id)
+    assert success_count == 0 and len(failed) == 3
+    assert all('may have been sent' in entry for entry in failed)
+    assert set(states(queue, job_id).values()) == {IN_FLIGHT}
+    # Nothing is put back to pending blindly...
+    assert queue.retry_failed(job_id) == 0
+    # ...and the next run finds them sent in Zoho instead of emailing them again.
+    assert BulkInvoiceSender(api).run_job('token', queue, job_id) == (3, [])
+    assert api.lookups == ['0', '1', '2']
+    assert api.sent == ['0', '1', '2']
+    assert set(states(queue, job_id).values()) == {SENT}
+
+
+def test_connection_reset_after_dispatch_leaves_the_chunk_in_flight(queue):
+    api = FakeInvoiceApi([(requests.exceptions.ConnectionError("Connection aborted."), False)])
+    job_id, _ = queue.create_job(1, 'org', entries(2))
+    BulkInvoiceSender(api).run_job('token', queue, job_id)
+    assert set(states(queue, job_id).values()) == {IN_FLIGHT}
+
+
+def test_in_flight_invoices_not_sent_in_zoho_are_sent_again(queue):
+    api = FakeInvoiceApi()
+    job_id, _ = queue.create_job(1, 'org', entries(2))
+    queue.mark(job_id, ['0', '1'], IN_FLIGHT)
+    api.statuses['0'] = 'sent'
+    assert BulkInvoiceSender(api).run_job('token', queue, job_id) == (2, [])
+    assert api.sent == ['1']
+
+
+def test_in_flight_invoices_that_cannot_be_checked_stay_in_flight(queue):
+    api = FakeInvoiceApi()
+    api.lookup_error = "Network error"
+    job_id, _ = queue.create_job(1, 'org', entries(2))
+    queue.mark(job_id, ['0', '1'], IN_FLIGHT)
+    success_count, failed = BulkInvoiceSender(api).run_job('token', queue, job_id)
+    assert success_count == 0 and len(failed) == 2
+    assert queue.retry_failed(job_id) == 0
+    assert set(states(queue, job_id).values()) == {IN_FLIGHT}
+    assert api.sent == []
+
+
+def test_check_in_flight_confirms_sent_invoices_and_requeues_the_rest(queue):
+    api = FakeInvoiceApi()
+    job_id, _ = queue.create_job(1, 'org', entries(3))
+    queue.mark(job_id, ['0', '1'], IN_FLIGHT)
+    api.statuses['0'] = 'paid'
+    confirmed, unchecked = BulkInvoiceSender(api).check_in_flight('token', queue, job_id)
+    assert [inv['invoice_id'] for inv in confirmed] == ['0']
+    assert unchecked == []
+    assert states(queue, job_id) == {'0': SENT, '1': PENDING, '2': PENDING}
+
+
+def test_create_job_skips_invoices_sent_or_in_flight_in_earlier_jobs(queue):
+    first_job, _ = queue.create_job(1, 'org', entries(3))
+    queue.mark(first_job, ['0'], SENT)
+    queue.mark(first_job, ['1'], IN_FLIGHT)
+    queue.mark(first_job, ['2'], FAILED, 'boom')
+    queue.close_job(first_job)
+    job_id, skipped = queue.create_job(1, 'org', entries(4))
+    assert [(inv['invoice_id'], inv['state']) for inv in skipped] == [('0', SENT), ('1', IN_FLIGHT)]
+    assert [inv['invoice_id'] for inv in queue.invoices(job_id)] == ['2', '3']
+    # Other organizations are not affected.
+    _, skipped = queue.create_job(1, 'other', entries(2))
+    assert skipped == []
+
+
+def test_create_job_drops_duplicates_and_returns_none_when_nothing_is_left(queue):
+    job_id, _ = queue.create_job(1, 'org', entries(2) + entries(2))
+    assert len(queue.invoices(job_id)) == 2
+    queue.mark(job_id, ['0', '1'], SENT)
+    assert queue.create_job(1, 'org', entries(2))[0] is None
+
+
+def test_retry_failed_reopens_a_closed_job(queue):
+    job_id, _ = queue.create_job(1, 'org', entries(2))
+    queue.mark(job_id, ['0'], FAILED, 'boom')
+    queue.close_job(job_id)
+    assert queue.open_jobs() == []
+    assert queue.retry_failed(job_id) == 1
+    [job] = queue.open_jobs()
+    assert job['job_id'] == job_id and job['counts'][PENDING] == 2
@@ -0,0 +1,81 @@
+# tests/test_cli.py
+# CliController behaviour that does not need Zoho: target selection and the cached organizations.
+
+import argparse
+from dataclasses import asdict
+
+import pytest
+
+import cli
+from core.models import Organization
+
+RAW_ORGANIZATION = {'organization_id': '600', 'name': 'Acme', 'contact_name': 'Ann', 'email': 'ann@example.com',
+                    'country': 'India', 'currency_code': 'INR', 'currency_symbol': 'Rs.', 'is_default_org': True,
+                    'plan_name': 'Free', 'fiscal_year_start_month': 3}
+
+
+class FakeConfigManager:
+    def __init__(self, credentials: dict):
+        self.credentials = credentials
+        self.saved = []
+
+    def discover_credentials(self) -> dict:
+        return {index: f"Account {index}" for index in self.credentials}
+
+    def load_credentials(self, index: int) -> dict:
+        return dict(self.credentials[index])
+
+    def save_credentials(self, index: int, data: dict):
+        self.saved.append((index, data))
+        self.credentials[index].update(data)
+
+
+class FakeApi:
+    def __init__(self):
+        self.calls = 0
+
+    def get_organizations(self, access_token):
+        self.calls += 1
+        return {'code': 0, 'organizations': [RAW_ORGANIZATION]}
+
+
+@pytest.fixture
+def controller():
+    controller = cli.CliController.__new__(cli.CliController)
+    controller.config_manager = FakeConfigManager({1: {'refresh_token': 'r'}})
+    controller.token_provider = type('Tokens', (), {'get_token': lambda self, account_index: 'token'})()
+    controller.invoice_api = FakeApi()
+    controller.failures = 0
+    return controller
+
+
+def test_organizations_are_cached_in_the_dashboard_shape(controller):
+    organizations = controller.organizations(1)
+    expected = [asdict(Organization.from_api(RAW_ORGANIZATION))]
+    assert organizations == expected
+    assert controller.config_manager.saved == [(1, {'organizations': expected})]
+    # Served from the cache afterwards, and unchanged data is not written again.
+    assert controller.organizations(1) == expected
+    assert controller.organizations(1, refresh=True) == expected
+    assert controller.invoice_api.calls == 2
+    assert len(controller.config_manager.saved) == 1
+
+
+def test_raw_organizations_cached_by_older_versions_are_normalized(controller):
+    controller.config_manager.credentials[1]['organizations'] = [RAW_ORGANIZATION]
+    assert controller.organizations(1) == [asdict(Organization.from_api(RAW_ORGANIZATION))]
+    controller.organizations(1, refresh=True)
+    assert controller.config_manager.credentials[1]['organizations'] == [asdict(Organization.from_api(RAW_ORGANIZATION))]
+
+
+def test_send_drafts_needs_an_explicit_target(controller, capsys):
+    args = argparse.Namespace(account=None, org=None, all=False, dry_run=False, invoice=None)
+    controller.cmd_send_drafts(args)
+    assert controller.failures == 1
+    assert '--all' in capsys.readouterr().err
+
+
+def test_unknown_organization_is_reported(controller):
+    args = argparse.Namespace(account=[1], org=['999'])
+    assert controller.single_target(args) is None
+    assert controller.failures == 1
@@ -0,0 +1,148 @@
+# tests/test_delta_sync.py
+# DeltaSync against an in-memory invoice listing and a LocalStore in a temp directory.
+
+import argparse
+import time
+
+import pytest
+
+import cli
+from core.delta_sync import DeltaSync
+from core.local_store import LocalStore
+
+
+class FakeInvoiceApi:
+    """Lists `invoices` (and `contacts`) in pages of `page_size`, newest-first unless `newest_first` is off."""
+
+    def __init__(self, invoices: list[dict], contacts: list[dict] = (), page_size: int = 2, newest_first: bool = True):
+        self.invoices = invoices
+        self.contacts = list(contacts)
+        self.page_size = page_size
+        self.newest_first = newest_first
+        self.pages_listed = 0
+
+    def _pages(self, records):
+        if self.newest_first:
+            records = sorted(records, key=lambda r: r['last_modified_time'], reverse=True)
+        for start in range(0, len(records), self.page_size):
+            self.pages_listed += 1
+            yield [dict(r) for r in records[start:start + self.page_size]]
+
+    def iter_invoice_pages(self, access_token, organization_id, **params):
+        return self._pages(self.invoices)
+
+    def iter_draft_invoice_pages(self, access_token, organization_id, **params):
+        return self._pages([r for r in self.invoices if r['status'] == 'draft'])
+
+    def iter_customer_pages(self, access_token, organization_id, **params):
+        return self._pages(self.contacts)
+
+    iter_item_pages = iter_invoice_pages
+
+
+def invoice(invoice_id: str, minute: int, status: str = 'draft') -> dict:
+    return {'invoice_id': invoice_id, 'status': status, 'customer_id': 'c1',
+            'last_modified_time': f'2024-01-01T10:{minute:02d}:00+0000'}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LocalStore('1', data_dir=tmp_path)
+
+
+def draft_ids(store) -> list[str]:
+    return sorted(r['invoice_id'] for r in store.load('invoices', status='draft'))
+
+
+def test_first_sync_is_full_and_stores_everything(store):
+    api = FakeInvoiceApi([invoice(str(i), i) for i in range(5)])
+    changed, full = DeltaSync(api).sync('token', '1', store, 'invoices')
+    assert (changed, full) == (5, True)
+    assert store.count('invoices') == 5
+
+
+def test_delta_sync_stops_at_the_first_old_page(store):
+    api = FakeInvoiceApi([invoice(str(i), i) for i in range(10)])
+    sync = DeltaSync(api)
+    sync.sync('token', '1', store, 'invoices')
+    api.invoices.append(invoice('new', 30))
+    api.pages_listed = 0
+    changed, full = sync.sync('token', '1', store, 'invoices')
+    assert (changed, full) == (1, False)
+    # The new record's page, then one page holding nothing newer than the mark.
+    assert api.pages_listed == 2
+    assert store.get('invoices', 'new') is not None
+
+
+def test_listing_that_is_not_newest_first_becomes_a_full_pass(store):
+    api = FakeInvoiceApi([invoice(str(i), i) for i in range(6)])
+    sync = DeltaSync(api)
+    sync.sync('token', '1', store, 'invoices')
+    api.newest_first = False
+    api.invoices = api.invoices[1:]
+    changed, full = sync.sync('token', '1', store, 'invoices')
+    assert full
+    assert store.get('invoices', '0') is None
+
+
+def test_status_delta_sync_does_not_see_an_invoice_leaving_the_status(store):
+    api = FakeInvoiceApi([invoice('A', 1), invoice('B', 2)])
+    sync = DeltaSync(api)
+    sync.sync('token', '1', store, 'invoices', status='draft')
+    api.invoices[0] = invoice('A', 5, status='sent')
+    assert sync.sync('token', '1', store, 'invoices', status='draft') == (0, False)
+    assert draft_ids(store) == ['A', 'B']
+
+
+def test_forced_status_sync_drops_an_invoice_that_was_sent(store):
+    api = FakeInvoiceApi([invoice('A', 1), invoice('B', 2)])
+    sync = DeltaSync(api)
+    sync.sync('token', '1', store, 'invoices', status='draft')
+    api.invoices[0] = invoice('A', 5, status='sent')
+    changed, full = sync.sync('token', '1', store, 'invoices', force_full=True, status='draft')
+    assert (changed, full) == (1, True)
+    assert draft_ids(store) == ['B']
+
+
+def test_status_reconcile_marks_the_full_mirror_for_a_full_pass(store):
+    api = FakeInvoiceApi([invoice('A', 1), invoice('B', 2)])
+    sync = DeltaSync(api)
+    sync.sync('token', '1', store, 'invoices')
+    api.invoices[0] = invoice('A', 5, status='sent')
+    sync.sync('token', '1', store, 'invoices', force_full=True, status='draft')
+    assert store.get_sync_state('invoices')[1] is None
+    assert sync.sync('token', '1', store, 'invoices')[1]
+    assert store.get('invoices', 'A')['status'] == 'sent'
+
+
+def test_status_sync_reconciles_after_its_interval(store):
+    api = FakeInvoiceApi([invoice('A', 1), invoice('B', 2)])
+    sync = DeltaSync(api, status_reconcile_interval=60)
+    sync.sync('token', '1', store, 'invoices', status='draft')
+    high_water, _ = store.get_sync_state('invoices:draft')
+    store.set_sync_state('invoices:draft', high_water, time.time() - 61)
+    api.invoices[0] = invoice('A', 5, status='sent')
+    assert sync.sync('token', '1', store, 'invoices', status='draft')[1]
+    assert draft_ids(store) == ['B']
+
+
+def test_send_drafts_does_not_pick_up_a_draft_sent_since_the_last_sync(store, monkeypatch, capsys):
+    contact = {'contact_id': 'c1', 'contact_name': 'Ann', 'email': 'ann@example.com',
+               'last_modified_time': '2024-01-01T09:00:00+0000'}
+    api = FakeInvoiceApi([invoice('A', 1), invoice('B', 2)], contacts=[contact])
+    controller = cli.CliController.__new__(cli.CliController)
+    controller.delta_sync = DeltaSync(api)
+    controller.token_provider = type('Tokens', (), {'get_token': lambda self, account_index: 'token'})()
+    controller.failures = 0
+    org = {'organization_id': '1', 'name': 'Org'}
+    monkeypatch.setattr(controller, 'targets', lambda args: [(1, org)], raising=False)
+    monkeypatch.setattr(cli, 'LocalStore', lambda organization_id: store)
+    controller.sync_entity(1, org, 'invoices', status='draft')
+    # Sent from the dashboard (or Zoho itself) within the reconcile interval.
+    api.invoices[0] = invoice('A', 5, status='sent')
+
+    args = argparse.Namespace(account=None, org=None, all=True, dry_run=True, invoice=None)
+    controller.cmd_send_drafts(args)
+    out = capsys.readouterr().out
+    assert 'would send B' in out
+    assert 'would send A' not in out
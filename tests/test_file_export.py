@@ -0,0 +1,83 @@
+# tests/test_file_export.py
+# RecordExporter output for CSV and Parquet, paging from the LocalStore, and failed exports.
+
+import csv
+import os
+
+import pytest
+
+from core.file_export import RecordExporter, store_pages
+from core.local_store import LocalStore
+
+
+def invoices(count: int, status: str = 'draft') -> list[dict]:
+    return [{'invoice_id': f'{status}-{i}', 'invoice_number': f'INV-{i}', 'customer_name': f'C{i}',
+             'status': status, 'total': str(i * 10), 'balance': '' if i % 2 else i}
+            for i in range(count)]
+
+
+def read_csv(path) -> list[dict]:
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def test_csv_export_flattens_records_with_their_organization(tmp_path):
+    path = tmp_path / 'invoices.csv'
+    with RecordExporter(path, 'invoices') as exporter:
+        exporter.write_page('org-1', invoices(2)[:1])
+        assert exporter.write_page('org-2', invoices(2)[1:]) == 2
+    rows = read_csv(path)
+    assert [(row['organization_id'], row['invoice_id'], row['total'], row['balance']) for row in rows] == [
+        ('org-1', 'draft-0', '0.0', '0.0'),
+        ('org-2', 'draft-1', '10.0', ''),
+    ]
+    # Fields missing from the record are written empty.
+    assert rows[0]['due_date'] == ''
+    assert os.listdir(tmp_path) == ['invoices.csv']
+
+
+def test_store_pages_export_only_the_requested_status(tmp_path):
+    store = LocalStore('org', data_dir=tmp_path)
+    store.upsert('invoices', invoices(5) + invoices(3, status='sent'))
+    path = tmp_path / 'drafts.csv'
+    pages = list(store_pages(store, 'drafts', page_size=2))
+    assert [len(page) for page in pages] == [2, 2, 1]
+    with RecordExporter(path, 'invoices') as exporter:
+        for page in pages:
+            exporter.write_page('org', page)
+    assert [row['invoice_id'] for row in read_csv(path)] == [f'draft-{i}' for i in range(5)]
+
+
+def test_failed_export_keeps_the_existing_file(tmp_path):
+    path = tmp_path / 'items.csv'
+    path.write_text('previous export')
+    with pytest.raises(RuntimeError):
+        with RecordExporter(path, 'items') as exporter:
+            exporter.write_page('org', [{'item_id': '1', 'name': 'Consulting', 'rate': 'n/a'}])
+            raise RuntimeError('connection lost')
+    assert path.read_text() == 'previous export'
+    assert os.listdir(tmp_path) == ['items.csv']
+
+
+def test_unsupported_file_type_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match='Unsupported file type'):
+        RecordExporter(tmp_path / 'items.xlsx', 'items')
+    assert os.listdir(tmp_path) == []
+
+
+def test_parquet_export_is_typed_and_written_in_row_groups(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    path = tmp_path / 'invoices.parquet'
+    with RecordExporter(path, 'invoices', row_group_size=4) as exporter:
+        exporter.write_page('org', invoices(3))
+        exporter.write_page('org', invoices(6)[3:])
+        exporter.write_page('org', invoices(7)[6:])
+    parquet_file = pq.ParquetFile(path)
+    # Pages are buffered until a group holds at least row_group_size rows; close() writes the rest.
+    metadata = parquet_file.metadata
+    assert [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)] == [6, 1]
+    table = parquet_file.read()
+    assert str(table.schema.field('total').type) == 'double'
+    assert str(table.schema.field('invoice_id').type) == 'string'
+    assert table.column('total').to_pylist() == [i * 10.0 for i in range(7)]
+    assert table.column('balance').to_pylist()[:2] == [0.0, None]
@@ -0,0 +1,195 @@
+# tests/test_file_import.py
+# ContactImporter duplicate checks and failures, and customer/invoice imports from CSV/XLSX files.
+
+import threading
+
+import pytest
+
+from core.contact_importer import CREATED, FAILED, SKIPPED, ContactImporter, ContactIndex
+from core.file_import import InvoiceImporter, import_customers_file, iter_file_rows
+from core.local_store import LocalStore
+
+
+class FakeInvoiceApi:
+    """Creates contacts and invoices in memory; names in `reject` get a Zoho error response."""
+
+    def __init__(self, reject=()):
+        self.reject = set(reject)
+        self.customers = []
+        self.invoices = []
+        self._lock = threading.Lock()
+
+    def create_customer(self, access_token, organization_id, customer):
+        if customer['contact_name'] in self.reject:
+            return {'code': 3062, 'message': 'The customer name already exists.'}
+        if customer['contact_name'] == 'Offline':
+            raise ConnectionError('Network error creating customer')
+        with self._lock:
+            self.customers.append(customer)
+            return {'code': 0, 'contact': {'contact_id': str(len(self.customers)), **customer}}
+
+    def create_invoice(self, access_token, organization_id, invoice_data):
+        with self._lock:
+            self.invoices.append(invoice_data)
+            return {'code': 0, 'invoice': {'invoice_id': str(len(self.invoices)), **invoice_data}}
+
+
+def write_csv(path, text: str):
+    path.write_text(text.lstrip(), encoding='utf-8')
+    return path
+
+
+def by_row(results: list[dict]) -> dict:
+    return {result['row']: (result['status'], result['detail']) for result in results}
+
+
+def test_importer_skips_known_and_repeated_contacts_and_reports_failures():
+    api = FakeInvoiceApi(reject={'Taken'})
+    index = ContactIndex([{'contact_name': 'Acme  Ltd', 'email': 'billing@acme.com'}])
+    rows = [
+        (2, {'contact_name': 'acme ltd'}),
+        (3, {'contact_name': 'New Co', 'contact_persons': [{'email': 'BILLING@acme.com'}]}),
+        (4, {'contact_name': 'Fresh'}),
+        (5, {'contact_name': ' FRESH '}),
+        (6, {'contact_name': 'Taken'}),
+        (7, {'contact_name': 'Offline'}),
+    ]
+    results = []
+    counts = ContactImporter(api, max_workers=2).run('token', 'org', rows, index, on_result=results.append)
+    assert counts == {CREATED: 1, SKIPPED: 3, FAILED: 2}
+    assert by_row(results) == {
+        2: (SKIPPED, "same name as 'Acme  Ltd'"),
+        3: (SKIPPED, "same email as 'Acme  Ltd'"),
+        4: (CREATED, None),
+        5: (SKIPPED, 'same name as row 4'),
+        6: (FAILED, 'The customer name already exists.'),
+        7: (FAILED, 'Network error creating customer'),
+    }
+    assert [customer['contact_name'] for customer in api.customers] == ['Fresh']
+
+
+def test_cancel_stops_new_creates():
+    api = FakeInvoiceApi()
+    importer = ContactImporter(api, max_workers=1)
+
+    rows = [(2, {'contact_name': 'First'}), (3, {'contact_name': 'Second'})]
+    counts = importer.run('token', 'org', rows, ContactIndex(), on_result=lambda result: importer.cancel())
+    assert counts[CREATED] == 1
+    assert [customer['contact_name'] for customer in api.customers] == ['First']
+
+
+def test_csv_rows_are_read_with_normalized_headers_and_spreadsheet_row_numbers(tmp_path):
+    path = write_csv(tmp_path / 'customers.csv', """
+Display Name,Email Address
+Ann,ann@example.com
+,
+Bob,
+""")
+    assert list(iter_file_rows(path)) == [
+        (2, {'display_name': 'Ann', 'email_address': 'ann@example.com'}),
+        (4, {'display_name': 'Bob', 'email_address': ''}),
+    ]
+
+
+def test_unsupported_file_type_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match='Unsupported file type'):
+        list(iter_file_rows(tmp_path / 'customers.txt'))
+
+
+def test_customers_file_import_validates_rows_in_chunks(tmp_path):
+    path = write_csv(tmp_path / 'customers.csv', """
+name,email
+Ann,ann@example.com
+,nobody@example.com
+Bob,
+Ann,other@example.com
+""")
+    api = FakeInvoiceApi()
+    results = []
+    counts = import_customers_file(ContactImporter(api), 'token', 'org', path, ContactIndex(),
+                                   on_result=results.append, chunk_size=2)
+    assert counts == {CREATED: 2, SKIPPED: 1, FAILED: 1}
+    assert by_row(results)[3][0] == FAILED
+    assert api.customers == [
+        {'contact_name': 'Ann', 'contact_persons': [{'email': 'ann@example.com', 'is_primary_contact': True}]},
+        {'contact_name': 'Bob'},
+    ]
+
+
+def test_customers_are_read_from_xlsx(tmp_path):
+    openpyxl = pytest.importorskip('openpyxl')
+    workbook = openpyxl.Workbook()
+    workbook.active.append(['Customer Name', 'Email'])
+    workbook.active.append(['Ann', 'ann@example.com'])
+    workbook.active.append([None, None])
+    workbook.active.append(['Bob', None])
+    path = tmp_path / 'customers.xlsx'
+    workbook.save(path)
+    api = FakeInvoiceApi()
+    counts = import_customers_file(ContactImporter(api), 'token', 'org', path, ContactIndex())
+    assert counts[CREATED] == 2
+    assert sorted(customer['contact_name'] for customer in api.customers) == ['Ann', 'Bob']
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = LocalStore('org', data_dir=tmp_path)
+    store.upsert('contacts', [
+        {'contact_id': 'c1', 'contact_name': 'Ann Lee', 'email': 'ann@example.com'},
+        {'contact_id': 'c2', 'contact_name': 'Bob', 'email': ''},
+        {'contact_id': 'c3', 'contact_name': 'Twin', 'email': 'twin1@example.com'},
+        {'contact_id': 'c4', 'contact_name': 'Twin', 'email': 'twin2@example.com'},
+    ])
+    store.upsert('items', [{'item_id': 'i1', 'name': 'Consulting'}, {'item_id': 'i2', 'name': 'Support'}])
+    return store
+
+
+def test_invoice_rows_are_grouped_into_invoices(tmp_path, store):
+    path = write_csv(tmp_path / 'invoices.csv', """
+invoice,customer,date,due date,item,qty
+A,ann lee,2026-01-05,,Consulting,2
+A,,,,i2,
+B,ANN@example.com,2026-01-06,2026-02-01,support,1.5
+""")
+    api = FakeInvoiceApi()
+    results = []
+    counts = InvoiceImporter(api, store).run('token', 'org', path, on_result=results.append)
+    assert counts == {CREATED: 2, SKIPPED: 0, FAILED: 0}
+    assert sorted((result['row'], result['invoice_key']) for result in results) == [(2, 'A'), (4, 'B')]
+    invoices = sorted(api.invoices, key=lambda invoice: invoice['date'])
+    assert invoices == [
+        {'customer_id': 'c1', 'date': '2026-01-05', 'due_date': '2026-01-19',
+         'line_items': [{'item_id': 'i1', 'quantity': 2}, {'item_id': 'i2', 'quantity': 1}]},
+        {'customer_id': 'c1', 'date': '2026-01-06', 'due_date': '2026-02-01',
+         'line_items': [{'item_id': 'i2', 'quantity': 1.5}]},
+    ]
+
+
+def test_invalid_invoices_are_reported_without_a_request(tmp_path, store):
+    path = write_csv(tmp_path / 'invoices.csv', """
+invoice,customer,item,quantity,date
+A,Nobody,Consulting,1,
+B,Twin,Consulting,1,
+C,Bob,Consulting,1,
+D,Ann Lee,Unknown,1,
+E,Ann Lee,Consulting,0,
+F,Ann Lee,Consulting,1,05/01/2026
+G,Ann Lee,Consulting,1,
+H,Ann Lee,Support,1,
+G,Ann Lee,Support,1,
+,Ann Lee,Support,1,
+""")
+    api = FakeInvoiceApi()
+    results = []
+    counts = InvoiceImporter(api, store).run('token', 'org', path, on_result=results.append)
+    assert counts == {CREATED: 2, SKIPPED: 0, FAILED: 8}
+    details = {result['invoice_key']: result['detail'] for result in results if result['status'] == FAILED}
+    assert 'was not found, or the name matches several customers' in details['A']
+    assert 'matches several customers' in details['B']
+    assert 'has no email address' in details['C']
+    assert details['D'] == "Row 5: item 'Unknown' was not found."
+    assert details['E'] == 'Quantity must be greater than zero.'
+    assert 'not a valid yyyy-MM-dd date' in details['F']
+    assert details['G'] == "Its rows are not next to the invoice's other rows."
+    assert details[None] == "The 'invoice' column is empty."
+    assert len(api.invoices) == 2
@@ -0,0 +1,108 @@
+# tests/test_file_lock.py
+# FileLock exclusion across threads and processes, atomic_write_text, and
+# ConfigManager's locked, atomic updates of account files.
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from core.config_manager import ConfigManager
+from core.file_lock import FileLock, atomic_write_text
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+_HOLDER = """
+import sys
+from pathlib import Path
+from core.file_lock import FileLock
+with FileLock(Path(sys.argv[1])):
+    Path(sys.argv[2]).write_text('acquired')
+"""
+
+
+def test_lock_excludes_other_processes(tmp_path):
+    lock = FileLock(tmp_path / 'account_1.json.lock')
+    marker = tmp_path / 'marker'
+    with lock:
+        child = subprocess.Popen([sys.executable, '-c', _HOLDER, str(lock.path), str(marker)], cwd=PROJECT_ROOT)
+        time.sleep(0.5)
+        assert not marker.exists()
+    assert child.wait(30) == 0
+    assert marker.read_text() == 'acquired'
+
+
+def test_lock_excludes_other_threads_and_is_reentrant(tmp_path):
+    lock = FileLock(tmp_path / 'file.lock')
+    acquired = threading.Event()
+
+    def take():
+        with lock:
+            acquired.set()
+
+    with lock:
+        with lock:
+            thread = threading.Thread(target=take)
+            thread.start()
+            assert not acquired.wait(0.2)
+        # Still held by the outer block.
+        assert not acquired.wait(0.2)
+    thread.join(5)
+    assert acquired.is_set()
+
+
+def test_atomic_write_replaces_the_file_without_leaving_temp_files(tmp_path):
+    path = tmp_path / 'account_1.json'
+    path.write_text('old')
+    atomic_write_text(path, 'new')
+    assert path.read_text() == 'new'
+    assert os.listdir(tmp_path) == ['account_1.json']
+
+
+def test_failed_atomic_write_keeps_the_old_file(tmp_path):
+    path = tmp_path / 'account_1.json'
+    path.write_text('old')
+    with pytest.raises(TypeError):
+        atomic_write_text(path, None)
+    assert path.read_text() == 'old'
+    assert os.listdir(tmp_path) == ['account_1.json']
+
+
+@pytest.fixture
+def config_manager(tmp_path):
+    manager = ConfigManager()
+    manager.credentials_dir = tmp_path
+    return manager
+
+
+def test_save_credentials_merges_into_the_account_file(config_manager):
+    index = config_manager.add_new_credentials('id', 'secret')
+    assert index == 1
+    config_manager.save_credentials(1, {'refresh_token': 'refresh'})
+    assert config_manager.load_credentials(1) == {'client_id': 'id', 'client_secret': 'secret', 'refresh_token': 'refresh'}
+    assert config_manager.add_new_credentials('id2', 'secret2') == 2
+    assert config_manager.discover_credentials() == {1: 'Account 1', 2: 'Account 2'}
+    config_manager.delete_credentials(1)
+    assert config_manager.discover_credentials() == {2: 'Account 2'}
+    assert config_manager.load_credentials(1) == {}
+
+
+def test_concurrent_saves_do_not_lose_updates(config_manager):
+    config_manager.save_credentials(1, {'client_id': 'id'})
+    threads = [threading.Thread(target=config_manager.save_credentials, args=(1, {f'key_{i}': i}))
+               for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    saved = config_manager.load_credentials(1)
+    assert saved == {'client_id': 'id', **{f'key_{i}': i for i in range(20)}}
+
+
+def test_corrupt_account_file_loads_as_empty(config_manager):
+    (config_manager.credentials_dir / 'account_3.json').write_text('{"client_id": ')
+    assert config_manager.load_credentials(3) == {}
@@ -0,0 +1,153 @@
+# tests/test_http_transport.py
+# HttpTransport's retry policy against a local server, InvoiceApi's 429 handling,
+# and which failures may_have_reached_server treats as possibly delivered.
+
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from core.http_transport import HttpTransport, may_have_reached_server
+from core.invoice_api import InvoiceApi
+from core.rate_limiter import RateLimiter
+
+
+class ScriptedServer(ThreadingHTTPServer):
+    """Answers requests with the statuses in `statuses` in turn (200 once they run out)."""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _ScriptedHandler)
+        self.statuses = []
+        self.requests = []
+        self.delay = 0
+
+    def handle_error(self, request, client_address):
+        # The client hung up, e.g. after a read timeout.
+        pass
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+
+class _ScriptedHandler(BaseHTTPRequestHandler):
+
+    def _reply(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        self.server.requests.append((self.command, self.path))
+        time.sleep(self.server.delay)
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        body = b'{"code": 0}'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = _reply
+
+    def log_message(self, format, *args):
+        pass
+
+
+class RecordingLimiter(RateLimiter):
+    """Records back-offs instead of pausing."""
+
+    def __init__(self):
+        super().__init__()
+        self.backed_off = []
+
+    def back_off(self, organization_id, seconds):
+        self.backed_off.append((organization_id, seconds))
+
+
+@pytest.fixture
+def server():
+    server = ScriptedServer()
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def transport():
+    transport = HttpTransport(max_retries=2, backoff_factor=0, read_timeout=0.5)
+    yield transport
+    transport.close()
+
+
+def test_gets_are_retried_on_a_server_error(server, transport):
+    server.statuses = [503, 502]
+    response = transport.get(f'{server.url}/items')
+    assert response.status_code == 200
+    assert len(server.requests) == 3
+
+
+def test_retries_give_up_and_return_the_last_response(server, transport):
+    server.statuses = [500, 500, 500, 500]
+    assert transport.get(f'{server.url}/items').status_code == 500
+    assert len(server.requests) == 3
+
+
+def test_posts_are_not_retried_on_a_server_error(server, transport):
+    server.statuses = [503]
+    assert transport.post(f'{server.url}/invoices', json={}).status_code == 503
+    assert server.requests == [('POST', '/invoices')]
+
+
+def test_client_errors_are_not_retried(server, transport):
+    server.statuses = [404]
+    assert transport.get(f'{server.url}/items').status_code == 404
+    assert len(server.requests) == 1
+
+
+def test_invoice_api_waits_out_a_429_and_retries(server, transport):
+    limiter = RecordingLimiter()
+    api = InvoiceApi(transport=transport, base_url=server.url, rate_limiter=limiter)
+    server.statuses = [429]
+    assert api.get_items('token', 'org') == {'code': 0}
+    assert len(server.requests) == 2
+    # Without Retry-After the default pause is used.
+    assert limiter.backed_off == [('org', 60)]
+
+
+def _unused_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def test_a_refused_connection_did_not_reach_the_server():
+    transport = HttpTransport(max_retries=0)
+    with pytest.raises(requests.exceptions.ConnectionError) as raised:
+        transport.post(f'http://127.0.0.1:{_unused_port()}/invoices/email')
+    assert not may_have_reached_server(raised.value)
+    # Also when wrapped, as InvoiceApi re-raises it.
+    try:
+        raise ConnectionError('Network error') from raised.value
+    except ConnectionError as wrapped:
+        assert not may_have_reached_server(wrapped)
+
+
+def test_a_read_timeout_may_have_reached_the_server(server):
+    transport = HttpTransport(max_retries=0, read_timeout=0.1)
+    server.delay = 0.5
+    with pytest.raises(requests.exceptions.ReadTimeout) as raised:
+        transport.post(f'{server.url}/invoices/email')
+    assert server.requests == [('POST', '/invoices/email')]
+    assert may_have_reached_server(raised.value)
+
+
+def test_errors_without_a_request_did_not_reach_the_server():
+    assert not may_have_reached_server(ValueError('Access token cannot be empty.'))
+    assert not may_have_reached_server(requests.exceptions.ConnectTimeout())
+    assert may_have_reached_server(requests.exceptions.ConnectionError('Connection aborted.'))
@@ -0,0 +1,26 @@
+# tests/test_main_window_imports.py
+# Guards the lazy QtWebEngine import: building the UI modules must not load Chromium.
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+_CHECK = """
+import sys
+import ui.main_window
+import ui.dashboard_widget
+print(','.join(name for name in ('PyQt6.QtWebEngineWidgets', 'PyQt6.QtWebEngineCore') if name in sys.modules))
+"""
+
+
+def test_importing_ui_does_not_load_qtwebengine():
+    # A fresh interpreter, so modules imported by other tests do not count.
+    result = subprocess.run(
+        [sys.executable, '-c', _CHECK], cwd=PROJECT_ROOT, capture_output=True, text=True,
+        env={**os.environ, 'QT_QPA_PLATFORM': 'offscreen'}, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == '', f"imported at startup: {result.stdout.strip()}"
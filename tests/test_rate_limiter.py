@@ -0,0 +1,104 @@
+# tests/test_rate_limiter.py
+# RateLimiter's per-organization token buckets, daily budget and back-off, on a fake clock.
+
+import pytest
+
+from core import rate_limiter
+from core.rate_limiter import RateLimiter
+
+
+class FakeClock:
+    """Stands in for time.monotonic and time.sleep; sleeping advances the clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.slept += seconds
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, 'monotonic', clock.monotonic)
+    monkeypatch.setattr(rate_limiter.time, 'sleep', clock.sleep)
+    return clock
+
+
+def test_burst_up_to_the_minute_limit_then_waits_for_refill(clock):
+    limiter = RateLimiter(per_minute=60, per_day=1000)
+    for _ in range(60):
+        limiter.acquire('org')
+    assert clock.slept == 0
+    limiter.acquire('org')
+    # One token refills per second at 60 per minute.
+    assert clock.slept == pytest.approx(1.0)
+
+
+def test_organizations_have_separate_buckets(clock):
+    limiter = RateLimiter(per_minute=2, per_day=1000)
+    limiter.acquire('a')
+    limiter.acquire('a')
+    limiter.acquire('b')
+    assert clock.slept == 0
+    assert limiter.remaining_daily_quota('a') == (998, 1000)
+    assert limiter.remaining_daily_quota('b') == (999, 1000)
+    assert limiter.remaining_daily_quota('c') is None
+
+
+def test_used_up_daily_quota_raises_until_it_resets(clock):
+    limiter = RateLimiter(per_minute=10, per_day=2)
+    limiter.acquire('org')
+    limiter.acquire('org')
+    with pytest.raises(ConnectionError, match='Daily API quota'):
+        limiter.acquire('org')
+    clock.now += 24 * 3600
+    limiter.acquire('org')
+    assert limiter.remaining_daily_quota('org') == (1, 2)
+
+
+def test_rate_limit_headers_correct_the_daily_budget(clock):
+    limiter = RateLimiter(per_minute=10, per_day=1000)
+    limiter.acquire('org')
+    limiter.record_response('org', {'X-Rate-Limit-Limit': '2500', 'X-Rate-Limit-Remaining': '0',
+                                    'X-Rate-Limit-Reset': '60'})
+    assert limiter.remaining_daily_quota('org') == (0, 2500)
+    with pytest.raises(ConnectionError):
+        limiter.acquire('org')
+    clock.now += 60
+    limiter.acquire('org')
+    assert limiter.remaining_daily_quota('org') == (2499, 2500)
+
+
+def test_malformed_headers_are_ignored(clock):
+    limiter = RateLimiter(per_minute=10, per_day=1000)
+    limiter.record_response('org', {'X-Rate-Limit-Remaining': 'lots'})
+    limiter.record_response('org', None)
+    assert limiter.remaining_daily_quota('org') == (1000, 1000)
+
+
+def test_back_off_pauses_only_that_organization(clock):
+    limiter = RateLimiter(per_minute=60, per_day=1000)
+    limiter.acquire('org')
+    limiter.back_off('org', 30)
+    limiter.acquire('other')
+    assert clock.slept == 0
+    limiter.acquire('org')
+    assert clock.slept == pytest.approx(30)
+    # A shorter pause never cuts an earlier, longer one short.
+    limiter.back_off('org', 20)
+    limiter.back_off('org', 5)
+    limiter.acquire('org')
+    assert clock.slept == pytest.approx(50)
+
+
+def test_requests_without_an_organization_are_not_limited(clock):
+    limiter = RateLimiter(per_minute=1, per_day=1)
+    for _ in range(5):
+        limiter.acquire(None)
+    assert clock.slept == 0
@@ -0,0 +1,55 @@
+# tests/test_search_index.py
+# ContactSearchIndex matching, ordering and rows.
+
+from core.models import Contact
+from core.search_index import ContactSearchIndex
+
+CONTACTS = [
+    Contact('1', 'Ann Lee', 'Acme Ltd', 'ann@acme.com'),
+    Contact('2', 'Bob Stone', 'Stone & Co', 'bob@stone.co'),
+    Contact('3', 'Leena Roy', '', 'leena@example.com'),
+]
+
+
+def index(contacts=CONTACTS) -> ContactSearchIndex:
+    search_index = ContactSearchIndex()
+    search_index.add(contacts)
+    return search_index
+
+
+def test_every_word_must_match_name_company_or_email():
+    search_index = index()
+    assert search_index.search('lee') == [0, 2]
+    assert search_index.search('lee acme') == [0]
+    assert search_index.search('STONE.CO') == [1]
+    assert search_index.search('nobody') == []
+
+
+def test_empty_query_matches_everything():
+    assert index().search('   ') is None
+
+
+def test_narrowing_a_query_reuses_the_previous_rows():
+    search_index = index()
+    assert search_index.search('le') == [0, 2]
+    assert search_index.search('lee') == [0, 2]
+    assert search_index.search('leen') == [2]
+    # A query that does not extend the last one searches again.
+    assert search_index.search('bob') == [1]
+
+
+def test_prefix_first_and_limit():
+    search_index = index()
+    assert search_index.search('le', prefix_first=True) == [2, 0]
+    assert search_index.search('le', limit=1, prefix_first=True) == [2]
+
+
+def test_a_contact_added_again_replaces_its_row():
+    search_index = index()
+    search_index.search('roy')
+    search_index.add([Contact('3', 'Leena Das', '', 'leena@example.com'), Contact('4', 'Dan Roy', '', '')])
+    assert len(search_index) == 4
+    assert search_index.record(2).contact_name == 'Leena Das'
+    assert search_index.search('roy') == [3]
+    search_index.clear()
+    assert len(search_index) == 0 and search_index.search('roy') == []
@@ -0,0 +1,104 @@
+# tests/test_single_flight.py
+# SingleFlight sharing of concurrent and recent calls, errors and forget().
+
+import threading
+
+import pytest
+
+from core.single_flight import SingleFlight
+
+
+def test_concurrent_identical_calls_share_one_result():
+    flight = SingleFlight(ttl=0)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'response'
+
+    results = []
+    owner = threading.Thread(target=lambda: results.append(flight.do('key', fetch)))
+    owner.start()
+    assert started.wait(5)
+    waiters = [threading.Thread(target=lambda: results.append(flight.do('key', fetch))) for _ in range(3)]
+    for waiter in waiters:
+        waiter.start()
+    release.set()
+    for thread in [owner, *waiters]:
+        thread.join(5)
+    assert results == ['response'] * 4
+    assert len(calls) == 1
+
+
+def test_waiters_get_the_exception_of_the_shared_call():
+    flight = SingleFlight(ttl=0)
+    started, release = threading.Event(), threading.Event()
+
+    def fetch():
+        started.set()
+        release.wait(5)
+        raise ConnectionError('offline')
+
+    errors = []
+
+    def call():
+        try:
+            flight.do('key', fetch)
+        except ConnectionError as e:
+            errors.append(str(e))
+
+    owner = threading.Thread(target=call)
+    owner.start()
+    assert started.wait(5)
+    waiter = threading.Thread(target=call)
+    waiter.start()
+    release.set()
+    owner.join(5)
+    waiter.join(5)
+    assert errors == ['offline', 'offline']
+    # A failed call is not reused.
+    assert flight.do('key', lambda: 'ok') == 'ok'
+
+
+def test_finished_results_are_reused_within_the_ttl_only_if_reusable():
+    flight = SingleFlight(ttl=60)
+    assert flight.do('ok', lambda: 1) == 1
+    assert flight.do('ok', lambda: 2) == 1
+    assert flight.do('bad', lambda: 'error page', reusable=lambda result: result != 'error page') == 'error page'
+    assert flight.do('bad', lambda: 'fresh') == 'fresh'
+    assert flight.do('other', lambda: 3) == 3
+
+
+def test_results_expire_after_the_ttl():
+    flight = SingleFlight(ttl=0)
+    assert flight.do('key', lambda: 1) == 1
+    assert flight.do('key', lambda: 2) == 2
+
+
+def test_forget_drops_the_results_of_a_scope():
+    flight = SingleFlight(ttl=60)
+    flight.do('a', lambda: 'old', scope='org-1')
+    flight.do('b', lambda: 'kept', scope='org-2')
+    flight.forget('org-1')
+    assert flight.do('a', lambda: 'new', scope='org-1') == 'new'
+    assert flight.do('b', lambda: 'refetched', scope='org-2') == 'kept'
+
+
+def test_forget_during_a_call_makes_later_callers_start_afresh():
+    flight = SingleFlight(ttl=60)
+
+    def fetch():
+        flight.forget('org')
+        return 'read before the write'
+
+    assert flight.do('key', fetch, scope='org') == 'read before the write'
+    assert flight.do('key', lambda: 'read after the write', scope='org') == 'read after the write'
+
+
+def test_exceptions_propagate_to_the_caller():
+    flight = SingleFlight()
+    with pytest.raises(ValueError):
+        flight.do('key', lambda: int('x'))
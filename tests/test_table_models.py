@@ -0,0 +1,87 @@
+# tests/test_table_models.py
+# The dashboard's list models: rows keyed by record id, paging and filtering.
+
+import os
+
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+from PyQt6.QtCore import QCoreApplication, Qt
+
+from core.models import Contact, Item
+from ui.table_models import CONTACT_COLUMNS, ITEM_COLUMNS, RecordListModel, RecordTableModel
+
+
+@pytest.fixture(scope='module', autouse=True)
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def items_model() -> RecordTableModel:
+    return RecordTableModel(ITEM_COLUMNS, key_fields=('item_id',))
+
+
+def column(model, column_index: int = 0) -> list:
+    return [model.data(model.index(row, column_index)) for row in range(model.rowCount())]
+
+
+def test_append_adds_pages_below_the_rows_shown():
+    model = items_model()
+    model.append([Item('1', 'Bolt', 1.5), Item('2', 'Nut', 0.25)])
+    model.append([Item('3', '', 2)])
+    assert column(model) == ['Bolt', 'Nut', 'N/A']
+    assert column(model, 1) == ['1.50', '0.25', '2.00']
+    assert model.record(2)['item_id'] == '3'
+
+
+def test_a_record_listed_on_two_pages_keeps_one_row():
+    model = items_model()
+    changed = []
+    model.dataChanged.connect(lambda top, bottom: changed.append((top.row(), bottom.row())))
+    model.append([Item('1', 'Bolt', 1.5), Item('2', 'Nut', 0.25)])
+    model.append([Item('2', 'Nut (M6)', 0.3), Item('3', 'Washer', 0.1)])
+    assert column(model) == ['Bolt', 'Nut (M6)', 'Washer']
+    assert column(model, 1) == ['1.50', '0.30', '0.10']
+    assert changed == [(1, 1)]
+    # Later appends still land below, keyed by their own rows.
+    model.append([Item('3', 'Washer (M6)', 0.1)])
+    assert column(model) == ['Bolt', 'Nut (M6)', 'Washer (M6)']
+
+
+def test_duplicates_within_a_page_and_in_set_records_are_collapsed():
+    model = items_model()
+    model.append([Item('1', 'Bolt'), Item('1', 'Bolt v2')])
+    assert column(model) == ['Bolt v2']
+    model.set_records([Item('1', 'A'), Item('2', 'B'), Item('1', 'A2')])
+    assert column(model) == ['A2', 'B']
+    model.append([Item('2', 'B2')])
+    assert column(model) == ['A2', 'B2']
+
+
+def test_filtered_model_keeps_new_rows_hidden_and_updates_shown_ones():
+    model = RecordTableModel(CONTACT_COLUMNS, key_fields=('contact_id',))
+    model.set_records([Contact('a', 'Ann'), Contact('b', 'Bob')])
+    model.set_visible_rows([1])
+    model.append([Contact('b', 'Bobby'), Contact('c', 'Cy')])
+    assert column(model) == ['Bobby']
+    model.set_visible_rows(None)
+    assert column(model) == ['Ann', 'Bobby', 'Cy']
+
+
+def test_list_model_is_keyed_by_id_after_its_placeholder():
+    model = RecordListModel(lambda item: item.name, placeholder="--- Select ---", id_field='item_id')
+    model.set_records([Item('1', 'Bolt'), Item('2', 'Nut')])
+    model.append([Item('2', 'Nut (M6)'), Item('3', 'Washer')])
+    labels = [model.data(model.index(row)) for row in range(model.rowCount())]
+    assert labels == ["--- Select ---", 'Bolt', 'Nut (M6)', 'Washer']
+    assert model.data(model.index(2), Qt.ItemDataRole.UserRole) == Item('2', 'Nut (M6)')
+    assert model.row_of(Item('3', 'Washer')) == 3
+    assert model.row_of(Item('2', 'Nut')) == -1
+    assert model.row_of(Item('9', 'Missing')) == -1
+
+
+def test_list_model_without_id_field_keeps_every_record():
+    model = RecordListModel(lambda item: item.name)
+    model.append([Item('1', 'Bolt'), Item('1', 'Bolt')])
+    assert model.rowCount() == 2
+    assert model.row_of(Item('1', 'Bolt')) == 0
@@ -0,0 +1,124 @@
+# tests/test_token_provider.py
+# TokenProvider caching, single refresh per account, persistence and background refresh.
+
+import threading
+import time
+
+import pytest
+
+from core.config_manager import ConfigManager
+from core.token_provider import TokenProvider
+
+
+class FakeAuthManager:
+    """Hands out access_1, access_2, ... and counts refreshes; `response` overrides the reply."""
+
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.refreshes = 0
+        self.response = None
+        self.error = None
+        self._lock = threading.Lock()
+
+    def refresh_access_token(self, client_id, client_secret, refresh_token):
+        time.sleep(self.delay)
+        if self.error:
+            raise ConnectionError(self.error)
+        if self.response is not None:
+            return self.response
+        with self._lock:
+            self.refreshes += 1
+            return {'access_token': f'access_{self.refreshes}', 'expires_in': 3600}
+
+
+@pytest.fixture
+def config_manager(tmp_path):
+    manager = ConfigManager()
+    manager.credentials_dir = tmp_path
+    manager.save_credentials(1, {'client_id': 'id', 'client_secret': 'secret', 'refresh_token': 'refresh'})
+    return manager
+
+
+@pytest.fixture
+def auth():
+    return FakeAuthManager()
+
+
+@pytest.fixture
+def provider(config_manager, auth):
+    provider = TokenProvider(config_manager, auth)
+    yield provider
+    provider.shutdown()
+
+
+def test_refreshes_once_and_serves_the_token_from_memory(provider, config_manager, auth):
+    assert provider.get_token(1) == 'access_1'
+    assert provider.get_token(1) == 'access_1'
+    assert auth.refreshes == 1
+    saved = config_manager.load_credentials(1)
+    assert saved['access_token'] == 'access_1'
+    assert saved['token_expiry_timestamp'] > time.time() + 3500
+    # The rest of the account file is kept.
+    assert saved['refresh_token'] == 'refresh'
+
+
+def test_valid_token_in_the_file_is_used_without_a_refresh(provider, config_manager, auth):
+    config_manager.save_credentials(1, {'access_token': 'saved', 'token_expiry_timestamp': time.time() + 600})
+    assert provider.get_token(1) == 'saved'
+    assert auth.refreshes == 0
+
+
+def test_token_about_to_expire_is_refreshed(provider, config_manager, auth):
+    config_manager.save_credentials(1, {'access_token': 'stale', 'token_expiry_timestamp': time.time() + 5})
+    assert provider.get_token(1) == 'access_1'
+
+
+def test_concurrent_callers_share_one_refresh(config_manager):
+    auth = FakeAuthManager(delay=0.2)
+    provider = TokenProvider(config_manager, auth)
+    tokens = []
+    threads = [threading.Thread(target=lambda: tokens.append(provider.get_token(1))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    provider.shutdown()
+    assert tokens == ['access_1'] * 5
+    assert auth.refreshes == 1
+
+
+def test_token_refreshed_by_another_process_is_adopted(provider, config_manager, auth):
+    assert provider.get_token(1) == 'access_1'
+    config_manager.save_credentials(1, {'access_token': 'from_other_process', 'token_expiry_timestamp': time.time() + 600})
+    provider.invalidate(1)
+    assert provider.get_token(1) == 'from_other_process'
+    assert auth.refreshes == 1
+
+
+def test_unauthorized_account_raises_value_error(provider, config_manager):
+    config_manager.save_credentials(2, {'client_id': 'id', 'client_secret': 'secret'})
+    with pytest.raises(ValueError, match='not authorized'):
+        provider.get_token(2)
+
+
+def test_failed_refresh_raises_connection_error_and_saves_nothing(provider, config_manager, auth):
+    auth.error = 'Network error'
+    with pytest.raises(ConnectionError, match='Could not refresh access token: Network error'):
+        provider.get_token(1)
+    auth.error = None
+    auth.response = {'error': 'invalid_code'}
+    with pytest.raises(ConnectionError, match='invalid_code'):
+        provider.get_token(1)
+    assert 'access_token' not in config_manager.load_credentials(1)
+
+
+def test_token_is_refreshed_in_the_background_before_it_expires(config_manager, auth):
+    # Refresh 0.1s after each new token, instead of 300s before its expiry.
+    provider = TokenProvider(config_manager, auth, refresh_ahead=3600 - 0.1)
+    assert provider.get_token(1) == 'access_1'
+    deadline = time.monotonic() + 5
+    while config_manager.load_credentials(1).get('access_token') == 'access_1' and time.monotonic() < deadline:
+        time.sleep(0.02)
+    provider.shutdown()
+    assert auth.refreshes >= 2
+    assert config_manager.load_credentials(1)['access_token'] != 'access_1'
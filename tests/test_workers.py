@@ -0,0 +1,65 @@
+# tests/test_workers.py
+# TaskRunner delivery on the UI thread, including results dropped as stale.
+
+import os
+
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+from PyQt6.QtCore import QCoreApplication, QEventLoop, QTimer
+
+from ui.workers import TaskRunner
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def run_until(condition, timeout_ms: int = 5000):
+    """Processes Qt events until condition() holds or the timeout passes."""
+    loop = QEventLoop()
+    timer = QTimer()
+    timer.timeout.connect(lambda: condition() and loop.quit())
+    timer.start(10)
+    QTimer.singleShot(timeout_ms, loop.quit)
+    loop.exec()
+    timer.stop()
+
+
+def test_result_and_progress_are_delivered(app):
+    runner = TaskRunner()
+    progress, results = [], []
+
+    def work(report):
+        report(1)
+        return 2
+
+    runner.submit(work, on_progress=progress.append, on_result=results.append)
+    run_until(lambda: results)
+    assert (progress, results) == ([1], [2])
+
+
+@pytest.mark.parametrize('fails', [False, True])
+def test_stale_outcome_is_dropped_and_reported_as_dropped(app, fails):
+    runner = TaskRunner()
+    delivered, dropped = [], []
+
+    def work():
+        if fails:
+            raise ConnectionError("offline")
+        return 'result'
+
+    runner.submit(work, on_result=delivered.append, on_error=delivered.append,
+                  is_current=lambda: False, on_dropped=lambda: dropped.append(True))
+    run_until(lambda: dropped)
+    assert delivered == [] and dropped == [True]
+
+
+def test_current_outcome_does_not_call_on_dropped(app):
+    runner = TaskRunner()
+    results, dropped = [], []
+    runner.submit(lambda: 'result', on_result=results.append, is_current=lambda: True,
+                  on_dropped=lambda: dropped.append(True))
+    run_until(lambda: results)
+    assert results == ['result'] and dropped == []
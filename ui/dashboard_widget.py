@@ -3,16 +3,43 @@
 
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QTabWidget, QLabel, QPushButton, 
                              QFormLayout, QHBoxLayout, QComboBox, QLineEdit, QTextEdit,
-                             QTableWidget, QTableWidgetItem, QHeaderView, QGroupBox,
-                             QDateEdit, QSpinBox, QAbstractItemView)
-from PyQt6.QtCore import Qt, QDate
+                             QTableWidget, QHeaderView, QGroupBox,
+                             QDateEdit, QAbstractItemView, QTableView, QCompleter)
+from PyQt6.QtCore import Qt, QDate, QDateTime, QModelIndex, QTimer
 from PyQt6.QtGui import QDoubleValidator
 
+import time
+
+from core.invoice_totals import InvoiceTotals, estimate_totals
+from core.models import Organization, RecordCache
+from core.search_index import ContactSearchIndex
+from core.validation import validate_customer, validate_invoice
+from ui.table_models import (RecordTableModel, RecordListModel, LineItemsModel,
+                             ITEM_COLUMNS, CONTACT_COLUMNS, DRAFT_INVOICE_COLUMNS)
+from ui.delegates import ItemChoiceDelegate, QuantityDelegate
+from config import settings
+
+def _customer_suggestion(contact) -> str:
+    """'Name (Company) <email>', as listed under the customer selector while typing."""
+    label = contact.contact_name or 'N/A'
+    if contact.company_name and contact.company_name != contact.contact_name:
+        label += f" ({contact.company_name})"
+    if contact.email:
+        label += f" <{contact.email}>"
+    return label
+
 class DashboardWidget(QWidget):
     """A widget that contains the dashboard's sub-tabs."""
     def __init__(self):
         super().__init__()
-        
+        # The selected organization's records, shared with the controller
+        self.records = RecordCache()
+        # Searches the contacts in the order the customer table and dropdown list them
+        self.contact_index = ContactSearchIndex()
+        self._suggested_rows = []
+        # When the cached item rates were last confirmed by Zoho (None: not yet)
+        self._item_rates_checked_at = None
+
         main_layout = QVBoxLayout(self)
         self.sub_tabs = QTabWidget()
         main_layout.addWidget(self.sub_tabs)
@@ -32,9 +59,6 @@ class DashboardWidget(QWidget):
 
         # <<< The "Send Invoice" tab is no longer added to the main tab widget here >>>
 
-        # Store item data for populating combos
-        self._item_list_data = []
-
     def _create_send_invoice_tab(self):
         """Creates the UI for sending draft invoices."""
         tab_widget = QWidget()
@@ -43,15 +67,16 @@ class DashboardWidget(QWidget):
 
         top_layout = QHBoxLayout()
         self.refresh_draft_invoices_button = QPushButton("Refresh Drafts")
+        self.export_invoices_button = QPushButton("Export Invoices...")
+        self.export_invoices_button.setToolTip("Write the organization's invoices of every status to a CSV or Parquet file.")
         top_layout.addWidget(QLabel("Showing all invoices with 'Draft' status."))
         top_layout.addStretch()
+        top_layout.addWidget(self.export_invoices_button)
         top_layout.addWidget(self.refresh_draft_invoices_button)
         main_layout.addLayout(top_layout)
 
-        self.draft_invoices_table = QTableWidget()
-        self.draft_invoices_table.setColumnCount(5)
-        self.draft_invoices_table.setHorizontalHeaderLabels(["Customer Name", "Invoice #", "Date", "Due Date", "Amount"])
-        self.draft_invoices_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.draft_invoices_model = RecordTableModel(DRAFT_INVOICE_COLUMNS, key_fields=('invoice_id', 'customer_id'), parent=self)
+        self.draft_invoices_table = self._create_record_view(self.draft_invoices_model)
         self.draft_invoices_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.draft_invoices_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.draft_invoices_table.setWordWrap(True)
@@ -88,7 +113,7 @@ class DashboardWidget(QWidget):
         main_layout.setSpacing(15)
         top_groupbox = QGroupBox("Invoice Details")
         top_layout = QFormLayout(top_groupbox)
-        self.invoice_customer_selector = QComboBox()
+        self.invoice_customer_selector = self._create_customer_selector()
         self.invoice_date_edit = QDateEdit(QDate.currentDate())
         self.invoice_date_edit.setCalendarPopup(True)
         self.invoice_due_date_edit = QDateEdit(QDate.currentDate().addDays(14))
@@ -99,11 +124,7 @@ class DashboardWidget(QWidget):
         main_layout.addWidget(top_groupbox)
         lines_groupbox = QGroupBox("Line Items")
         lines_layout = QVBoxLayout(lines_groupbox)
-        self.invoice_line_items_table = QTableWidget()
-        self.invoice_line_items_table.setColumnCount(2)
-        self.invoice_line_items_table.setHorizontalHeaderLabels(["Item*", "Quantity*"])
-        self.invoice_line_items_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
-        self.invoice_line_items_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Interactive)
+        self.invoice_line_items_table = self._create_line_items_view()
         lines_layout.addWidget(self.invoice_line_items_table)
         line_buttons_layout = QHBoxLayout()
         self.add_invoice_line_button = QPushButton("Add Line")
@@ -112,10 +133,27 @@ class DashboardWidget(QWidget):
         line_buttons_layout.addWidget(self.add_invoice_line_button)
         line_buttons_layout.addWidget(self.remove_invoice_line_button)
         lines_layout.addLayout(line_buttons_layout)
+        totals_layout = QHBoxLayout()
+        self.item_rates_status_label = QLabel()
+        self.invoice_totals_label = QLabel()
+        self.invoice_totals_label.setToolTip("Estimated from the cached item rates and taxes. "
+                                             "Zoho calculates the final amounts when the invoice is created.")
+        totals_layout.addWidget(self.item_rates_status_label)
+        totals_layout.addStretch()
+        totals_layout.addWidget(self.invoice_totals_label)
+        lines_layout.addLayout(totals_layout)
         main_layout.addWidget(lines_groupbox)
+        for signal in (self.line_items_model.dataChanged, self.line_items_model.rowsInserted,
+                       self.line_items_model.rowsRemoved, self.line_items_model.modelReset):
+            signal.connect(self._update_invoice_totals)
+        self._update_invoice_totals()
         submit_layout = QHBoxLayout()
         self.create_invoice_button = QPushButton("Create Invoice")
         self.create_invoice_button.setStyleSheet("background-color: #007BFF; color: white; padding: 10px; font-weight: bold;")
+        self.import_invoices_button = QPushButton("Import Invoices from File...")
+        self.import_invoices_button.setToolTip("CSV or XLSX with one row per line item and the columns: "
+                                               "invoice, customer, date, due_date, item, quantity.")
+        submit_layout.addWidget(self.import_invoices_button)
         submit_layout.addStretch()
         submit_layout.addWidget(self.create_invoice_button)
         main_layout.addLayout(submit_layout)
@@ -139,13 +177,19 @@ class DashboardWidget(QWidget):
         top_layout = QHBoxLayout()
         self.refresh_customers_button = QPushButton("Refresh Customer List")
         self.refresh_customers_button.setFixedWidth(180)
+        self.export_customers_button = QPushButton("Export...")
+        self.export_customers_button.setToolTip("Write the customer list to a CSV or Parquet file.")
         top_layout.addStretch()
+        top_layout.addWidget(self.export_customers_button)
         top_layout.addWidget(self.refresh_customers_button)
         main_layout.addLayout(top_layout)
-        self.customers_view_table = QTableWidget()
-        self.customers_view_table.setColumnCount(2)
-        self.customers_view_table.setHorizontalHeaderLabels(["Display Name", "Email"])
-        self.customers_view_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.customer_search_input = QLineEdit()
+        self.customer_search_input.setPlaceholderText("Search by name, company or email...")
+        self.customer_search_input.setClearButtonEnabled(True)
+        self.customer_search_input.textChanged.connect(self._filter_customers_table)
+        main_layout.addWidget(self.customer_search_input)
+        self.customers_model = RecordTableModel(CONTACT_COLUMNS, key_fields=('contact_id',), parent=self)
+        self.customers_view_table = self._create_record_view(self.customers_model)
         self.customers_view_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.customers_view_table.setWordWrap(True)
         main_layout.addWidget(self.customers_view_table)
@@ -172,6 +216,9 @@ class DashboardWidget(QWidget):
         self.submit_customers_button.setStyleSheet("background-color: #007BFF; color: white; padding: 10px;")
         buttons_layout.addWidget(self.add_customer_row_button)
         buttons_layout.addWidget(self.remove_customer_row_button)
+        self.import_customers_button = QPushButton("Import from File...")
+        self.import_customers_button.setToolTip("CSV or XLSX with the columns: display_name, email.")
+        buttons_layout.addWidget(self.import_customers_button)
         buttons_layout.addStretch()
         buttons_layout.addWidget(self.submit_customers_button)
         main_layout.addLayout(buttons_layout)
@@ -222,13 +269,14 @@ class DashboardWidget(QWidget):
         top_layout = QHBoxLayout()
         self.refresh_items_button = QPushButton("Refresh Item List")
         self.refresh_items_button.setFixedWidth(150)
+        self.export_items_button = QPushButton("Export...")
+        self.export_items_button.setToolTip("Write the item list to a CSV or Parquet file.")
         top_layout.addStretch()
+        top_layout.addWidget(self.export_items_button)
         top_layout.addWidget(self.refresh_items_button)
         main_layout.addLayout(top_layout)
-        self.items_table = QTableWidget()
-        self.items_table.setColumnCount(3)
-        self.items_table.setHorizontalHeaderLabels(["Name", "Rate", "Description"])
-        self.items_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.items_model = RecordTableModel(ITEM_COLUMNS, key_fields=('item_id',), parent=self)
+        self.items_table = self._create_record_view(self.items_model)
         self.items_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Interactive)
         self.items_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Interactive)
         self.items_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
@@ -260,6 +308,7 @@ class DashboardWidget(QWidget):
         self.email_label = QLabel("...")
         self.country_label = QLabel("...")
         self.currency_code_label = QLabel("...")
+        self.api_quota_label = QLabel("...")
         self.change_sender_name_button = QPushButton("Change Sender Name") 
         self.change_sender_name_button.setFixedWidth(160) 
         self.view_email_templates_button = QPushButton("View Email Templates")
@@ -279,39 +328,33 @@ class DashboardWidget(QWidget):
         details_layout.addRow("Email:", self.email_label)
         details_layout.addRow("Country:", self.country_label)
         details_layout.addRow("Currency:", self.currency_code_label)
+        details_layout.addRow("API Calls Left Today:", self.api_quota_label)
         details_layout.addRow("Actions:", template_actions_layout)
         layout.addLayout(details_layout)
         return tab_widget
 
-    def populate_draft_invoices_table(self, invoices: list):
-        """Populates the draft invoices table."""
-        self.draft_invoices_table.setRowCount(0)
-        if not invoices:
-            return
-        
-        self.draft_invoices_table.setRowCount(len(invoices))
-        for row, invoice in enumerate(invoices):
-            user_data = {
-                "invoice_id": invoice.get('invoice_id'),
-                "customer_id": invoice.get('customer_id')
-            }
-            customer_name_item = QTableWidgetItem(invoice.get('customer_name', 'N/A'))
-            customer_name_item.setData(Qt.ItemDataRole.UserRole, user_data)
-            self.draft_invoices_table.setItem(row, 0, customer_name_item)
-            self.draft_invoices_table.setItem(row, 1, QTableWidgetItem(invoice.get('invoice_number', '')))
-            self.draft_invoices_table.setItem(row, 2, QTableWidgetItem(invoice.get('date', '')))
-            self.draft_invoices_table.setItem(row, 3, QTableWidgetItem(invoice.get('due_date', '')))
-            self.draft_invoices_table.setItem(row, 4, QTableWidgetItem(f"{invoice.get('total', 0.0):.2f}"))
+    def _create_record_view(self, model: RecordTableModel) -> QTableView:
+        """A read-only table view over a RecordTableModel. Rows keep the default height, so the view never measures them."""
+        view = QTableView()
+        view.setModel(model)
+        view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        return view
+
+    def set_draft_invoices(self, invoices: list):
+        """Shows a new list of DraftInvoice records."""
+        self.records.replace('draft_invoices', invoices)
+        self.draft_invoices_model.set_records(invoices)
+
+    def add_draft_invoices(self, invoices: list):
+        """Appends a page of draft invoices below the rows already shown."""
+        self.records.extend('draft_invoices', invoices)
+        self.draft_invoices_model.append(invoices)
 
     def get_selected_invoice_data(self):
-        """Gets the data dictionaries of the selected rows in the draft invoices table."""
-        data_list = []
-        selected_rows = sorted(list(set(index.row() for index in self.draft_invoices_table.selectedIndexes())))
-        for row in selected_rows:
-            item = self.draft_invoices_table.item(row, 0)
-            if item and item.data(Qt.ItemDataRole.UserRole):
-                data_list.append(item.data(Qt.ItemDataRole.UserRole))
-        return data_list
+        """Gets the invoice_id, customer_id and customer_name of the selected rows in the draft invoices table."""
+        selected_rows = sorted(index.row() for index in self.draft_invoices_table.selectionModel().selectedRows())
+        return [self.draft_invoices_model.record(row) for row in selected_rows]
 
     def add_customer_input_row(self):
         self.customers_input_table.insertRow(self.customers_input_table.rowCount())
@@ -326,56 +369,143 @@ class DashboardWidget(QWidget):
         for row in range(self.customers_input_table.rowCount()):
             display_name_item = self.customers_input_table.item(row, 0)
             email_item = self.customers_input_table.item(row, 1)
-            display_name = display_name_item.text().strip() if display_name_item else ""
-            if not display_name:
-                return None, f"Row {row + 1}: Display Name is a required field and cannot be empty."
-            email_address = email_item.text().strip() if email_item else ""
-            customer_data = { "contact_name": display_name }
-            if email_address:
-                customer_data["contact_persons"] = [{ "email": email_address, "is_primary_contact": True }]
+            display_name = display_name_item.text() if display_name_item else ""
+            email_address = email_item.text() if email_item else ""
+            customer_data, error_msg = validate_customer(display_name, email_address)
+            if error_msg:
+                return None, f"Row {row + 1}: {error_msg}"
             customers_to_create.append(customer_data)
         return customers_to_create, None
 
-    def populate_customers_table(self, customers: list):
-        self.customers_view_table.setRowCount(0)
-        if not customers: return
-        self.customers_view_table.setRowCount(len(customers))
-        for row, customer in enumerate(customers):
-            email = customer.get('email', '')
-            name_item = QTableWidgetItem(customer.get('contact_name', 'N/A'))
-            email_item = QTableWidgetItem(email)
-            self.customers_view_table.setItem(row, 0, name_item)
-            self.customers_view_table.setItem(row, 1, email_item)
-
-    def populate_items_table(self, items: list):
-        self.items_table.setRowCount(0)
-        if not items: return
-        self.items_table.setRowCount(len(items))
-        for row, item in enumerate(items):
-            rate = f"{item.get('rate', 0.0):.2f}"
-            name_item = QTableWidgetItem(item.get('name', 'N/A'))
-            rate_item = QTableWidgetItem(rate)
-            desc_item = QTableWidgetItem(item.get('description', ''))
-            rate_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.items_table.setItem(row, 0, name_item)
-            self.items_table.setItem(row, 1, rate_item)
-            self.items_table.setItem(row, 2, desc_item)
-        self.items_table.resizeColumnsToContents()
-        self.items_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
+    def set_contacts(self, contacts: list):
+        """Shows a new list of Contact records in the customer table and the invoice's customer dropdown."""
+        self.records.replace('contacts', contacts)
+        self.contact_index.clear()
+        self.contact_index.add(contacts)
+        self.customers_model.set_records(contacts)
+        self.invoice_customer_model.set_records(contacts)
+        self._filter_customers_table()
+
+    def add_contacts(self, contacts: list):
+        """Adds a page of Contact records to the customer table and dropdown."""
+        self.records.extend('contacts', contacts)
+        self.contact_index.add(contacts)
+        self.customers_model.append(contacts)
+        self.invoice_customer_model.append(contacts)
+        if self.customer_search_input.text().strip():
+            self._filter_customers_table()
+
+    def _filter_customers_table(self):
+        """Narrows the customer table to the contacts matching the search box."""
+        self.customers_model.set_visible_rows(self.contact_index.search(self.customer_search_input.text()))
+
+    def _create_customer_selector(self) -> QComboBox:
+        """
+        The invoice's customer dropdown. Its list is a model over the contacts, so it
+        fills instantly however many there are; typing in it suggests the contacts
+        whose name, company or email match, from the shared search index.
+        """
+        self.invoice_customer_model = RecordListModel(lambda contact: contact.contact_name or 'N/A',
+                                                      placeholder="--- Select a Customer ---", id_field='contact_id',
+                                                      parent=self)
+        selector = QComboBox()
+        selector.setModel(self.invoice_customer_model)
+        selector.setEditable(True)
+        selector.setInsertPolicy(QComboBox.InsertPolicy.NoInsert)
+        # Sizing to the contents would measure every contact.
+        selector.setSizeAdjustPolicy(QComboBox.SizeAdjustPolicy.AdjustToMinimumContentsLengthWithIcon)
+        selector.setMinimumContentsLength(30)
+        selector.lineEdit().setPlaceholderText("Type a name, company or email to search")
+
+        self.customer_suggestions_model = RecordListModel(_customer_suggestion, parent=self)
+        completer = QCompleter(self.customer_suggestions_model, selector)
+        completer.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        completer.activated[QModelIndex].connect(self._select_suggested_customer)
+        # Set on the line edit rather than the combo box, which would look the chosen
+        # suggestion's text up among its own items and select nothing.
+        selector.lineEdit().setCompleter(completer)
+        selector.lineEdit().textEdited.connect(self._suggest_customers)
+        selector.lineEdit().editingFinished.connect(self._restore_selected_customer_text)
+        return selector
+
+    def _suggest_customers(self, text: str):
+        rows = self.contact_index.search(text, limit=settings.CUSTOMER_SEARCH_MAX_SUGGESTIONS, prefix_first=True) or []
+        self._suggested_rows = rows
+        self.customer_suggestions_model.set_records([self.contact_index.record(row) for row in rows])
+        if rows:
+            self.invoice_customer_selector.lineEdit().completer().complete()
+
+    def _select_suggested_customer(self, index: QModelIndex):
+        # Index rows match the dropdown's, after its placeholder row.
+        self.invoice_customer_selector.setCurrentIndex(self._suggested_rows[index.row()] + 1)
+        # The completer writes the suggestion's text after this; show the plain name instead.
+        QTimer.singleShot(0, self._restore_selected_customer_text)
+
+    def _restore_selected_customer_text(self):
+        """Typed text that was not turned into a selection is replaced by the selected customer's name."""
+        selector = self.invoice_customer_selector
+        selector.setEditText(selector.itemText(selector.currentIndex()))
+
+    def _create_line_items_view(self) -> QTableView:
+        """
+        The invoice's line items. Lines only store an item id and a quantity; every
+        line's item editor shares one list of the items, and the rate and line total
+        are read from the cached items when painted.
+        """
+        self.item_choices_model = RecordListModel(lambda item: item.name or 'N/A',
+                                                  placeholder="--- Select an Item ---", id_field='item_id', parent=self)
+        self.line_items_model = LineItemsModel(self.records.items, parent=self)
+        view = QTableView()
+        view.setModel(self.line_items_model)
+        view.setItemDelegateForColumn(LineItemsModel.ITEM, ItemChoiceDelegate(self.item_choices_model, self.records.items, view))
+        view.setItemDelegateForColumn(LineItemsModel.QUANTITY, QuantityDelegate(view))
+        view.setEditTriggers(QAbstractItemView.EditTrigger.AllEditTriggers)
+        view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        view.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        header = view.horizontalHeader()
+        header.setSectionResizeMode(LineItemsModel.ITEM, QHeaderView.ResizeMode.Stretch)
+        for column in (LineItemsModel.QUANTITY, LineItemsModel.RATE, LineItemsModel.LINE_TOTAL):
+            header.setSectionResizeMode(column, QHeaderView.ResizeMode.Interactive)
+        return view
+
+    def set_items(self, items: list):
+        """Shows a new list of Item records, which also become the choices of invoice lines."""
+        self.records.replace('items', items)
+        self.items_model.set_records(items)
+        self.item_choices_model.set_records(items)
+        self.line_items_model.items_changed()
+        self._fit_item_columns()
+        if self.line_items_model.rowCount() == 0:
+            self.add_invoice_line_row()
+
+    def add_items(self, items: list):
+        """Adds a page of Item records to the item table and the invoice lines' choices."""
+        self.records.extend('items', items)
+        self.items_model.append(items)
+        self.item_choices_model.append(items)
+        self.line_items_model.items_changed()
+        self._fit_item_columns()
+
+    def _fit_item_columns(self):
+        # Sized from a sample of rows (the header's resize precision), not the whole list.
+        self.items_table.resizeColumnToContents(0)
+        self.items_table.resizeColumnToContents(1)
 
     def populate_organizations_list(self, organizations: list, org_id_to_select: str = None):
-        """Populates the organization dropdown and optionally re-selects an organization."""
+        """Populates the organization dropdown with Organization records and optionally re-selects one."""
+        self.records.organizations = list(organizations)
         self.organization_selector.blockSignals(True)
         self.organization_selector.clear()
         if not organizations:
             self.organization_selector.addItem("No organizations found.", None)
         else:
             for org in organizations:
-                self.organization_selector.addItem(org.get('name', 'Unnamed Org'), org)
+                self.organization_selector.addItem(org.name or 'Unnamed Org', org)
         if org_id_to_select:
             for i in range(self.organization_selector.count()):
                 org_data = self.organization_selector.itemData(i)
-                if org_data and org_data.get('organization_id') == org_id_to_select:
+                if org_data and org_data.organization_id == org_id_to_select:
                     self.organization_selector.setCurrentIndex(i)
                     break
         self.organization_selector.blockSignals(False)
@@ -385,19 +515,27 @@ class DashboardWidget(QWidget):
         else:
              self.display_organization_details(self.organization_selector.currentData())
 
-    def display_organization_details(self, details: dict | None):
+    def display_organization_details(self, details: Organization | None):
         if not details:
             self.clear_organization_details()
             return
-        self.org_id_label.setText(details.get('organization_id', 'N/A')) 
-        self.org_name_label.setText(details.get('name', 'N/A'))
-        self.contact_name_label.setText(details.get('contact_name', 'N/A'))
-        self.email_label.setText(details.get('email', 'N/A'))
-        self.country_label.setText(details.get('country', 'N/A'))
-        self.currency_code_label.setText(
-            f"{details.get('currency_code', 'N/A')} ({details.get('currency_symbol', '')})"
-        )
+        self.org_id_label.setText(details.organization_id)
+        self.org_name_label.setText(details.name or 'N/A')
+        self.contact_name_label.setText(details.contact_name or 'N/A')
+        self.email_label.setText(details.email or 'N/A')
+        self.country_label.setText(details.country or 'N/A')
+        self.currency_code_label.setText(f"{details.currency_code or 'N/A'} ({details.currency_symbol})")
         
+    def display_api_quota(self, quota: tuple[int, int] | None):
+        """Shows the remaining daily API quota as (remaining, limit)."""
+        if not quota:
+            self.api_quota_label.setText("N/A")
+            return
+        remaining, limit = quota
+        self.api_quota_label.setText(f"{remaining} of {limit}")
+        color = "red" if remaining < limit * 0.1 else "black"
+        self.api_quota_label.setStyleSheet(f"color: {color};")
+
     def clear_organization_details(self):
         placeholder_text = "N/A - Select an authorized account in Settings"
         self.org_id_label.setText(placeholder_text) 
@@ -406,83 +544,74 @@ class DashboardWidget(QWidget):
         self.email_label.setText(placeholder_text)
         self.country_label.setText(placeholder_text)
         self.currency_code_label.setText(placeholder_text)
+        self.display_api_quota(None)
         self.organization_selector.blockSignals(True)
         self.organization_selector.clear()
         self.organization_selector.addItem("N/A", None)
         self.organization_selector.blockSignals(False)
-        self.populate_items_table([])
-        self.populate_customers_table([])
-        self.populate_draft_invoices_table([])
+        self.records.organizations = []
+        self.set_items([])
+        self.set_contacts([])
+        self.set_draft_invoices([])
 
     def clear_add_item_form(self):
         self.item_name_input.clear()
         self.item_rate_input.clear()
         self.item_description_input.clear()
 
-    def populate_invoice_customer_dropdown(self, customers: list):
-        self.invoice_customer_selector.clear()
-        self.invoice_customer_selector.addItem("--- Select a Customer ---", None)
-        for customer in customers:
-            self.invoice_customer_selector.addItem(
-                customer.get('contact_name', 'N/A'), 
-                customer
-            )
-
-    def store_item_list(self, items: list):
-        """Stores the fetched item list to be used by invoice line item combos."""
-        self._item_list_data = items
-        if self.invoice_line_items_table.rowCount() == 0:
-            self.add_invoice_line_row()
+    def invoice_totals(self) -> InvoiceTotals:
+        """The amounts of the invoice being created, estimated from the cached items."""
+        return estimate_totals(self.line_items_model.lines(), self.records.items)
+
+    def set_item_rates_checked(self, checked_at: float | None):
+        """Records when the cached items were last brought up to date with Zoho (None while they are not)."""
+        self._item_rates_checked_at = checked_at
+        self._update_invoice_totals()
+
+    def item_rates_are_stale(self) -> bool:
+        checked_at = self._item_rates_checked_at
+        return checked_at is None or time.time() - checked_at > settings.ITEM_RATE_MAX_AGE
+
+    def _update_invoice_totals(self):
+        totals = self.invoice_totals()
+        text = f"Subtotal: <b>{totals.subtotal:.2f}</b> &nbsp; Tax: <b>{totals.tax:.2f}</b> &nbsp; Total: <b>{totals.total:.2f}</b>"
+        self.invoice_totals_label.setText(text)
+        checked_at = self._item_rates_checked_at
+        if checked_at is None:
+            status = "Rates are from the local copy and have not been checked with Zoho yet."
+        else:
+            checked_time = QDateTime.fromSecsSinceEpoch(int(checked_at)).toString("HH:mm")
+            status = f"Rates checked with Zoho at {checked_time}."
+            if self.item_rates_are_stale():
+                status += " They may have changed since; refresh the item list to check."
+        self.item_rates_status_label.setText(status)
+        color = "#d9822b" if self.item_rates_are_stale() and self.records.items else "gray"
+        self.item_rates_status_label.setStyleSheet(f"color: {color};")
 
     def add_invoice_line_row(self):
         """Adds a new row to the invoice line items table."""
-        row_position = self.invoice_line_items_table.rowCount()
-        self.invoice_line_items_table.insertRow(row_position)
-        item_combo = QComboBox()
-        item_combo.addItem("--- Select an Item ---", None)
-        for item in self._item_list_data:
-            item_combo.addItem(item.get('name', 'N/A'), item.get('item_id', None))
-        quantity_spin = QSpinBox()
-        quantity_spin.setMinimum(1)
-        quantity_spin.setMaximum(9999)
-        self.invoice_line_items_table.setCellWidget(row_position, 0, item_combo)
-        self.invoice_line_items_table.setCellWidget(row_position, 1, quantity_spin)
+        row = self.line_items_model.add_line()
+        self.invoice_line_items_table.setCurrentIndex(self.line_items_model.index(row, LineItemsModel.ITEM))
 
     def remove_selected_invoice_line(self):
         """Removes the currently selected row from the invoice line item table."""
-        current_row = self.invoice_line_items_table.currentRow()
+        current_row = self.invoice_line_items_table.currentIndex().row()
         if current_row >= 0:
-            self.invoice_line_items_table.removeRow(current_row)
+            self.line_items_model.remove_line(current_row)
 
     def get_invoice_data(self):
         """Reads and validates all data from the create invoice form."""
-        customer_data = self.invoice_customer_selector.currentData()
-        if not customer_data or not customer_data.get('contact_id'):
-            return None, "You must select a customer."
-        
-        if not customer_data.get('email'):
-             return None, f"Selected customer '{customer_data.get('contact_name')}' has no email address. Please update the customer record before creating an invoice."
-
-        invoice_data = {
-            "customer_id": customer_data['contact_id'],
-            "date": self.invoice_date_edit.date().toString("yyyy-MM-dd"),
-            "due_date": self.invoice_due_date_edit.date().toString("yyyy-MM-dd"),
-            "line_items": []
-        }
-        for row in range(self.invoice_line_items_table.rowCount()):
-            item_combo = self.invoice_line_items_table.cellWidget(row, 0)
-            quantity_spin = self.invoice_line_items_table.cellWidget(row, 1)
-            item_id = item_combo.currentData()
-            quantity = quantity_spin.value()
-            if item_id:
-                invoice_data["line_items"].append({ "item_id": item_id, "quantity": quantity })
-        if not invoice_data["line_items"]:
-            return None, "Invoice must have at least one line item."
-        return invoice_data, None
+        customer = self.invoice_customer_selector.currentData()
+        return validate_invoice(
+            customer,
+            self.invoice_date_edit.date().toString("yyyy-MM-dd"),
+            self.invoice_due_date_edit.date().toString("yyyy-MM-dd"),
+            self.line_items_model.lines()
+        )
 
     def clear_invoice_form(self):
         self.invoice_customer_selector.setCurrentIndex(0)
         self.invoice_date_edit.setDate(QDate.currentDate())
         self.invoice_due_date_edit.setDate(QDate.currentDate().addDays(14))
-        self.invoice_line_items_table.setRowCount(0)
+        self.line_items_model.clear()
         self.add_invoice_line_row()
\ No newline at end of file
@@ -0,0 +1,60 @@
+# ui/delegates.py
+# Editors for the cells of the invoice line items table.
+
+from PyQt6.QtWidgets import QStyledItemDelegate, QComboBox, QCompleter, QSpinBox
+from PyQt6.QtCore import Qt
+
+class ItemChoiceDelegate(QStyledItemDelegate):
+    """
+    Edits a line's item with a searchable combo box over the shared list of items
+    (a RecordListModel with a placeholder row). Only the cell being edited has an
+    editor, and it shows the shared model instead of copying the items into it, so
+    opening it costs the same however large the catalog is. Typing suggests the
+    items whose name contains the text; picking one commits it straight away.
+    The model's EditRole for the cell is the item id, and `items` maps ids to items.
+    """
+
+    def __init__(self, choices_model, items: dict, parent=None):
+        super().__init__(parent)
+        self._choices = choices_model
+        self._items = items
+
+    def createEditor(self, parent, option, index):
+        editor = QComboBox(parent)
+        # Sizing to the contents would measure every item; set before the model and
+        # setEditable(), which would otherwise do so right away.
+        editor.setSizeAdjustPolicy(QComboBox.SizeAdjustPolicy.AdjustToMinimumContentsLengthWithIcon)
+        editor.setModel(self._choices)
+        editor.setEditable(True)
+        editor.setInsertPolicy(QComboBox.InsertPolicy.NoInsert)
+        editor.lineEdit().setPlaceholderText("Type to search items")
+        completer = editor.completer()
+        completer.setCompletionMode(QCompleter.CompletionMode.PopupCompletion)
+        completer.setFilterMode(Qt.MatchFlag.MatchContains)
+        completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        editor.activated.connect(lambda _row: self._commit(editor))
+        return editor
+
+    def _commit(self, editor):
+        self.commitData.emit(editor)
+        self.closeEditor.emit(editor)
+
+    def setEditorData(self, editor, index):
+        item = self._items.get(index.data(Qt.ItemDataRole.EditRole))
+        editor.setCurrentIndex(max(self._choices.row_of(item), 0) if item else 0)
+
+    def setModelData(self, editor, model, index):
+        # Typed text that matches no item keeps the selected one.
+        editor.setEditText(editor.itemText(editor.currentIndex()))
+        item = editor.currentData()
+        model.setData(index, item.item_id if item else None, Qt.ItemDataRole.EditRole)
+
+
+class QuantityDelegate(QStyledItemDelegate):
+    """Edits a line's quantity with a spin box limited to 1-9999."""
+
+    def createEditor(self, parent, option, index):
+        editor = QSpinBox(parent)
+        editor.setMinimum(1)
+        editor.setMaximum(9999)
+        return editor
@@ -1,12 +1,20 @@
 # ui/main_window.py
-from PyQt6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QTabWidget, QMessageBox
-from PyQt6.QtCore import Qt, QUrl, pyqtSignal
-from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile
+from PyQt6.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QTabWidget, QMessageBox
+from PyQt6.QtCore import Qt, QUrl, QTimer, pyqtSignal
 
 from .dashboard_widget import DashboardWidget
 from .settings_tab import SettingsTab
 
+def _web_engine():
+    """
+    Imports QtWebEngine on first use instead of at startup; Chromium itself starts
+    when the first profile or page is created. The application must set
+    AA_ShareOpenGLContexts before QApplication is constructed for this to work.
+    """
+    from PyQt6.QtWebEngineWidgets import QWebEngineView
+    from PyQt6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile
+    return QWebEngineView, QWebEnginePage, QWebEngineProfile
+
 class MainWindow(QMainWindow):
     redirect_url_intercepted = pyqtSignal(QUrl)
 
@@ -16,7 +24,10 @@ class MainWindow(QMainWindow):
         self.setGeometry(100, 100, 1024, 768)
         self.tabs = QTabWidget()
         self.setCentralWidget(self.tabs)
+        # One persistent profile and one view, created on first use and reused by every browser tab
+        self.browser_profile = None
         self.browser_view = None
+        self._browser_tab = None
 
         self.dashboard_widget = DashboardWidget()
         self.settings_tab = SettingsTab()
@@ -27,15 +38,27 @@ class MainWindow(QMainWindow):
         self.tabs.setTabsClosable(True)
         self.tabs.tabCloseRequested.connect(self.close_tab)
         self.statusBar().showMessage('Ready')
+
+    def schedule_browser_warm_up(self):
+        """Loads QtWebEngine shortly after the window is shown, if enabled in settings."""
+        from config import settings
+        if settings.WEBENGINE_WARM_UP_DELAY_MS is not None:
+            QTimer.singleShot(settings.WEBENGINE_WARM_UP_DELAY_MS, self.warm_up_browser)
+
+    def warm_up_browser(self):
+        """Creates the shared profile and the hidden browser view ahead of time, without opening a tab."""
+        try:
+            self._ensure_browser_view()
+        except ImportError as e:
+            # Not fatal; opening a browser tab will report the problem.
+            print(f"Could not preload the embedded browser: {e}")
     
     def on_url_changed(self, url: QUrl):
         from config import settings
         if url.toString().startswith(settings.REDIRECT_URI):
             self.redirect_url_intercepted.emit(url)
-            for i in range(self.tabs.count()):
-                if self.browser_view and self.tabs.widget(i) == self.browser_view.parent():
-                    self.close_tab(i)
-                    break
+            if self._browser_tab is not None:
+                self.close_tab(self.tabs.indexOf(self._browser_tab))
 
     # <<< RE-INTRODUCED 'on_load_finished' with new JavaScript >>>
     def on_load_finished(self, ok):
@@ -51,60 +74,80 @@ class MainWindow(QMainWindow):
             # This JS tries to find the main content editor of the template page.
             # Selectors are based on educated guesses and may need tweaking if Zoho
             # changes its web page structure.
+            # The editor is rendered by Zoho's scripts after the page loads, so a
+            # MutationObserver waits for it to appear instead of polling the DOM.
             js_code = """
+            (() => {
                 const selector = "div.email-template-edit-page"; // A likely container for the editor
-                
-                const findElementInterval = setInterval(() => {
-                    const targetElement = document.querySelector(selector);
 
+                const isolate = (targetElement) => {
+                    // Style the body for a clean, dialog-like appearance
+                    document.body.innerHTML = ''; 
+                    document.body.style.backgroundColor = '#f0f2f5';
+                    document.body.style.display = 'flex';
+                    document.body.style.justifyContent = 'center';
+                    document.body.style.alignItems = 'flex-start';
+                    document.body.style.padding = '20px';
+                    document.body.style.height = '100vh';
+                    document.body.style.overflow = 'auto';
+
+                    // Style the isolated element to look modern
+                    targetElement.style.width = '100%';
+                    targetElement.style.maxWidth = '1200px';
+                    targetElement.style.margin = '0';
+
+                    // Append only our target element back to the now-empty body
+                    document.body.appendChild(targetElement);
+                };
+
+                const existingElement = document.querySelector(selector);
+                if (existingElement) {
+                    isolate(existingElement);
+                    return;
+                }
+                const observer = new MutationObserver(() => {
+                    const targetElement = document.querySelector(selector);
                     if (targetElement) {
-                        // Element found, stop polling
-                        clearInterval(findElementInterval);
-                        
-                        // Style the body for a clean, dialog-like appearance
-                        document.body.innerHTML = ''; 
-                        document.body.style.backgroundColor = '#f0f2f5';
-                        document.body.style.display = 'flex';
-                        document.body.style.justifyContent = 'center';
-                        document.body.style.alignItems = 'flex-start';
-                        document.body.style.padding = '20px';
-                        document.body.style.height = '100vh';
-                        document.body.style.overflow = 'auto';
-
-                        // Style the isolated element to look modern
-                        targetElement.style.width = '100%';
-                        targetElement.style.maxWidth = '1200px';
-                        targetElement.style.margin = '0';
-
-                        // Append only our target element back to the now-empty body
-                        document.body.appendChild(targetElement);
+                        // Element found, stop observing
+                        observer.disconnect();
+                        isolate(targetElement);
                     }
-                }, 200); // Check every 200 milliseconds
+                });
+                observer.observe(document.documentElement, { childList: true, subtree: true });
 
-                // Add a timeout to stop polling after 10 seconds
-                setTimeout(() => {
-                    clearInterval(findElementInterval);
-                }, 10000);
+                // Stop observing after 10 seconds
+                setTimeout(() => observer.disconnect(), 10000);
+            })();
             """
             page.runJavaScript(js_code)
 
-    def open_url_in_browser_tab(self, url_string: str):
-        if self.browser_view and self.browser_view.parent() is not None:
-             self.browser_view.setUrl(QUrl(url_string))
-             self.tabs.setCurrentWidget(self.browser_view.parent())
-             return
-
-        self.browser_view = QWebEngineView()
-        persistent_profile = QWebEngineProfile("storage", self.browser_view)
-        new_page = QWebEnginePage(persistent_profile, self.browser_view)
+    def _ensure_browser_view(self):
+        """
+        Returns the shared browser view, creating it on first use. Its persistent
+        profile belongs to the application, so the disk cache and cookies are loaded
+        once, and the view (with its renderer) outlives the tabs that show it.
+        """
+        if self.browser_view is not None:
+            return self.browser_view
+        QWebEngineView, QWebEnginePage, QWebEngineProfile = _web_engine()
+        if self.browser_profile is None:
+            self.browser_profile = QWebEngineProfile("storage", QApplication.instance())
+
+        self.browser_view = QWebEngineView(self)
+        self.browser_view.hide()
+        new_page = QWebEnginePage(self.browser_profile, self.browser_view)
 
         # <<< RE-INTRODUCED the connection to on_load_finished >>>
         new_page.loadFinished.connect(self.on_load_finished)
 
         self.browser_view.setPage(new_page)
         self.browser_view.page().urlChanged.connect(self.on_url_changed)
-        self.browser_view.setUrl(QUrl(url_string))
-        
+        return self.browser_view
+
+    def open_url_in_browser_tab(self, url_string: str):
+        browser_view = self._ensure_browser_view()
+        browser_view.setUrl(QUrl(url_string))
+
         tab_title = "Browser"
         if "accounts.zoho.com" in url_string:
             tab_title = "Authorization"
@@ -114,11 +157,18 @@ class MainWindow(QMainWindow):
         elif "/settings/emails/templates/edit" in url_string:
             tab_title = "Template Editor"
 
+        if self._browser_tab is not None:
+            index = self.tabs.indexOf(self._browser_tab)
+            self.tabs.setTabText(index, tab_title)
+            self.tabs.setCurrentIndex(index)
+            return
 
         browser_tab = QWidget()
         layout = QVBoxLayout(browser_tab)
         layout.setContentsMargins(0,0,0,0)
-        layout.addWidget(self.browser_view)
+        layout.addWidget(browser_view)
+        browser_view.show()
+        self._browser_tab = browser_tab
         
         index = self.tabs.addTab(browser_tab, tab_title)
         self.tabs.setCurrentIndex(index)
@@ -129,8 +179,12 @@ class MainWindow(QMainWindow):
             
         widget = self.tabs.widget(index)
         if widget:
-            if self.browser_view and widget == self.browser_view.parent():
-                self.browser_view = None
+            if widget is self._browser_tab:
+                # Keep the view (and its renderer) for the next browser tab.
+                self.browser_view.setUrl(QUrl("about:blank"))
+                self.browser_view.hide()
+                self.browser_view.setParent(self)
+                self._browser_tab = None
             widget.deleteLater()
             
         self.tabs.removeTab(index)
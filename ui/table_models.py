@@ -0,0 +1,357 @@
+# ui/table_models.py
+# Read-only models for the dashboard's item, customer and draft invoice lists and dropdowns.
+
+from array import array
+
+from PyQt6.QtCore import QAbstractListModel, QAbstractTableModel, QModelIndex, Qt
+
+TEXT = 'text'
+MONEY = 'money'
+
+# Columns shown by each list: (header, record attribute, kind, text shown when it is empty)
+ITEM_COLUMNS = (
+    ("Name", 'name', TEXT, 'N/A'),
+    ("Rate", 'rate', MONEY, None),
+    ("Description", 'description', TEXT, ''),
+)
+CONTACT_COLUMNS = (
+    ("Display Name", 'contact_name', TEXT, 'N/A'),
+    ("Company", 'company_name', TEXT, ''),
+    ("Email", 'email', TEXT, ''),
+)
+DRAFT_INVOICE_COLUMNS = (
+    ("Customer Name", 'customer_name', TEXT, 'N/A'),
+    ("Invoice #", 'invoice_number', TEXT, ''),
+    ("Date", 'date', TEXT, ''),
+    ("Due Date", 'due_date', TEXT, ''),
+    ("Amount", 'total', MONEY, None),
+)
+
+
+class RecordTableModel(QAbstractTableModel):
+    """
+    A read-only list of records (see core.models) for a QTableView.
+
+    Only the displayed attributes and the `key_fields` (ids needed to act on a row)
+    are kept, column by column: a list of strings per text column and a packed array of
+    doubles per money column. No per-cell objects exist; the view asks data() for
+    the cells it paints, and they are formatted then. append() adds a page below
+    the rows already shown, so long lists can be displayed as they download.
+    set_visible_rows() filters the list down to the given rows, e.g. search results.
+    Rows are keyed by the first key field, the record id, like RecordCache: a record
+    whose id is already shown (e.g. listed on two pages of a sync) updates that row.
+    """
+
+    def __init__(self, columns: tuple, key_fields: tuple = (), parent=None):
+        super().__init__(parent)
+        self._columns = columns
+        self._key_fields = key_fields
+        self._id_field = key_fields[0] if key_fields else None
+        self._row_count = 0
+        self._data = self._empty_columns()
+        self._rows = {}
+        self._visible = None
+
+    def _empty_columns(self) -> dict:
+        data = {field: [] for field in self._key_fields}
+        for _, field, kind, _ in self._columns:
+            data[field] = array('d') if kind == MONEY else []
+        return data
+
+    # --- QAbstractTableModel ---
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return self._row_count if self._visible is None else len(self._visible)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        _, field, kind, _ = self._columns[index.column()]
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            value = self._data[field][self._source_row(index.row())]
+            return f"{value:.2f}" if kind == MONEY else value
+        if role == Qt.ItemDataRole.TextAlignmentRole and kind == MONEY:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self._columns[section][0]
+        return super().headerData(section, orientation, role)
+
+    # --- Contents ---
+
+    def _source_row(self, row: int) -> int:
+        return row if self._visible is None else self._visible[row]
+
+    def _extend(self, data: dict, records: list):
+        for field in self._key_fields:
+            data[field].extend(getattr(record, field) for record in records)
+        for _, field, kind, default in self._columns:
+            if kind == MONEY:
+                data[field].extend(getattr(record, field) for record in records)
+            else:
+                data[field].extend(getattr(record, field) or default for record in records)
+
+    def _set_row(self, row: int, record):
+        for field in self._key_fields:
+            self._data[field][row] = getattr(record, field)
+        for _, field, kind, default in self._columns:
+            value = getattr(record, field)
+            self._data[field][row] = value if kind == MONEY else value or default
+
+    def _new_records(self, records: list) -> list:
+        """
+        Updates the rows of records whose id is already shown and returns the others,
+        one per id (the last one listed wins), after reserving their rows.
+        """
+        if self._id_field is None:
+            return records
+        new, updated_rows = {}, []
+        for record in records:
+            record_id = getattr(record, self._id_field)
+            row = self._rows.get(record_id)
+            if row is None:
+                new[record_id] = record
+            else:
+                self._set_row(row, record)
+                updated_rows.append(row)
+        if updated_rows and self.rowCount():
+            if self._visible is None:
+                first_row, last_row = min(updated_rows), max(updated_rows)
+            else:
+                first_row, last_row = 0, self.rowCount() - 1
+            self.dataChanged.emit(self.index(first_row, 0), self.index(last_row, len(self._columns) - 1))
+        for offset, record_id in enumerate(new):
+            self._rows[record_id] = self._row_count + offset
+        return list(new.values())
+
+    def append(self, records: list):
+        """
+        Adds a page of records below the rows already shown; records already shown
+        update their row instead. While the list is filtered new rows stay hidden
+        until set_visible_rows() is called again.
+        """
+        records = self._new_records(records)
+        if not records:
+            return
+        if self._visible is not None:
+            self._extend(self._data, records)
+            self._row_count += len(records)
+            return
+        first_row = self._row_count
+        self.beginInsertRows(QModelIndex(), first_row, first_row + len(records) - 1)
+        self._extend(self._data, records)
+        self._row_count += len(records)
+        self.endInsertRows()
+
+    def set_records(self, records: list):
+        """Replaces every row."""
+        if self._id_field is not None:
+            records = list({getattr(record, self._id_field): record for record in records}.values())
+            rows = {getattr(record, self._id_field): row for row, record in enumerate(records)}
+        else:
+            rows = {}
+        data = self._empty_columns()
+        self._extend(data, records)
+        self.beginResetModel()
+        self._data = data
+        self._rows = rows
+        self._row_count = len(records)
+        self._visible = None
+        self.endResetModel()
+
+    def set_visible_rows(self, rows: list[int] | None):
+        """Shows only the given rows (positions in the full list), or every row for None."""
+        self.beginResetModel()
+        self._visible = rows
+        self.endResetModel()
+
+    def record(self, row: int) -> dict:
+        """The key and displayed fields of one (visible) row."""
+        row = self._source_row(row)
+        return {field: values[row] for field, values in self._data.items()}
+
+
+class RecordListModel(QAbstractListModel):
+    """
+    A list of records for a combo box or completer popup. Each row shows label(record)
+    and carries the record itself as its UserRole data. A `placeholder` row with no
+    record can head the list, e.g. "--- Select a Customer ---". With an `id_field`,
+    rows are keyed by record id like RecordCache, and a record already listed
+    replaces its row instead of being added again.
+    """
+
+    def __init__(self, label, placeholder: str = None, id_field: str = None, parent=None):
+        super().__init__(parent)
+        self._label = label
+        self._placeholder = placeholder
+        self._id_field = id_field
+        self._records = []
+        self._rows = {}
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._records) + (self._placeholder is not None)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if self._placeholder is not None:
+            if row == 0:
+                # An editable combo box shows the EditRole text; leave it empty for typing.
+                if role == Qt.ItemDataRole.DisplayRole:
+                    return self._placeholder
+                return '' if role == Qt.ItemDataRole.EditRole else None
+            row -= 1
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return self._label(self._records[row])
+        if role == Qt.ItemDataRole.UserRole:
+            return self._records[row]
+        return None
+
+    def row_of(self, record) -> int:
+        """The row showing `record`, or -1."""
+        if self._id_field is not None:
+            row = self._rows.get(getattr(record, self._id_field))
+            if row is None or self._records[row] != record:
+                return -1
+        else:
+            try:
+                row = self._records.index(record)
+            except ValueError:
+                return -1
+        return row + (self._placeholder is not None)
+
+    def append(self, records: list):
+        if self._id_field is not None:
+            new = {}
+            for record in records:
+                record_id = getattr(record, self._id_field)
+                row = self._rows.get(record_id)
+                if row is None:
+                    new[record_id] = record
+                else:
+                    self._records[row] = record
+                    model_row = row + (self._placeholder is not None)
+                    self.dataChanged.emit(self.index(model_row), self.index(model_row))
+            for offset, record_id in enumerate(new):
+                self._rows[record_id] = len(self._records) + offset
+            records = list(new.values())
+        if not records:
+            return
+        first_row = self.rowCount()
+        self.beginInsertRows(QModelIndex(), first_row, first_row + len(records) - 1)
+        self._records.extend(records)
+        self.endInsertRows()
+
+    def set_records(self, records: list):
+        if self._id_field is not None:
+            records = {getattr(record, self._id_field): record for record in records}.values()
+        self.beginResetModel()
+        self._records = list(records)
+        self._rows = ({getattr(record, self._id_field): row for row, record in enumerate(self._records)}
+                      if self._id_field is not None else {})
+        self.endResetModel()
+
+
+class LineItemsModel(QAbstractTableModel):
+    """
+    The editable line items of the invoice being created. Each line holds only an
+    item id and a quantity; the item's name and rate are read from the shared
+    `items` dict (item id -> Item), so the columns follow the cached catalog and no
+    line keeps its own copy of it. Rate and line total are read-only.
+    """
+
+    ITEM, QUANTITY, RATE, LINE_TOTAL = range(4)
+    _HEADERS = ("Item*", "Quantity*", "Rate", "Line Total")
+
+    def __init__(self, items: dict, parent=None):
+        super().__init__(parent)
+        self._items = items
+        self._lines = []
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._lines)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self._HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.column() in (self.ITEM, self.QUANTITY):
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        line = self._lines[index.row()]
+        item = self._items.get(line['item_id'])
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == self.ITEM:
+                return (item.name or 'N/A') if item else "--- Select an Item ---"
+            if column == self.QUANTITY:
+                return line['quantity']
+            if not item:
+                return ''
+            return f"{item.rate:.2f}" if column == self.RATE else f"{item.rate * line['quantity']:.2f}"
+        if role == Qt.ItemDataRole.EditRole:
+            return line['item_id'] if column == self.ITEM else line['quantity']
+        if role == Qt.ItemDataRole.TextAlignmentRole and column in (self.RATE, self.LINE_TOTAL):
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+        line = self._lines[index.row()]
+        if index.column() == self.ITEM:
+            line['item_id'] = value
+        elif index.column() == self.QUANTITY:
+            line['quantity'] = int(value)
+        else:
+            return False
+        # The rate and line total follow the item and quantity
+        self.dataChanged.emit(self.index(index.row(), self.ITEM), self.index(index.row(), self.LINE_TOTAL))
+        return True
+
+    def add_line(self) -> int:
+        """Appends an empty line and returns its row."""
+        row = len(self._lines)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._lines.append({'item_id': None, 'quantity': 1})
+        self.endInsertRows()
+        return row
+
+    def remove_line(self, row: int):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._lines[row]
+        self.endRemoveRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self._lines = []
+        self.endResetModel()
+
+    def lines(self) -> list[dict]:
+        """The lines as {"item_id", "quantity"} dicts."""
+        return [dict(line) for line in self._lines]
+
+    def items_changed(self):
+        """Repaints the item-derived columns after the cached items were replaced or extended."""
+        if self._lines:
+            self.dataChanged.emit(self.index(0, self.ITEM), self.index(len(self._lines) - 1, self.LINE_TOTAL))
@@ -0,0 +1,115 @@
+# ui/workers.py
+# Qt wrappers that run long core operations off the UI thread and report back through signals.
+
+from PyQt6.QtCore import QObject, QRunnable, QThread, QThreadPool, pyqtSignal
+
+from core.bulk_sender import BulkInvoiceSender
+
+class _TaskSignals(QObject):
+    result = pyqtSignal(object)
+    error = pyqtSignal(object)
+    progress = pyqtSignal(object)
+    done = pyqtSignal()
+
+
+class _Task(QRunnable):
+    """Runs one callable on the thread pool and reports through _TaskSignals."""
+
+    def __init__(self, fn, args, kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = _TaskSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.error.emit(e)
+        else:
+            self.signals.result.emit(result)
+        finally:
+            self.signals.done.emit()
+
+
+class TaskRunner(QObject):
+    """
+    Runs blocking calls (HTTP, token refresh) on a QThreadPool and delivers
+    their outcome back on the UI thread.
+    """
+
+    def __init__(self, parent=None, max_threads: int = None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        if max_threads:
+            self.pool.setMaxThreadCount(max_threads)
+        self._running = set()
+
+    def submit(self, fn, *args, on_result=None, on_error=None, on_progress=None, is_current=None,
+               on_dropped=None, **kwargs):
+        """
+        Runs fn(*args, **kwargs) in the background.
+        on_result/on_error/on_progress are called on the UI thread. When on_progress is
+        given, fn receives a `report` keyword argument it can call with partial results.
+        When is_current is given, results arriving after it returns False are dropped,
+        e.g. because the user has switched to another account or organization; if the
+        final result or error is dropped, on_dropped() is called instead.
+        """
+        task = _Task(fn, args, kwargs)
+
+        def guarded(callback, final: bool = False):
+            def deliver(value):
+                if is_current is None or is_current():
+                    if callback:
+                        callback(value)
+                elif final and on_dropped:
+                    on_dropped()
+            return deliver
+
+        if on_progress:
+            kwargs['report'] = task.signals.progress.emit
+            task.signals.progress.connect(guarded(on_progress))
+        if on_result or on_dropped:
+            task.signals.result.connect(guarded(on_result, final=True))
+        if on_error or on_dropped:
+            task.signals.error.connect(guarded(on_error, final=True))
+        # Keep the signal object alive until its last queued emission is delivered.
+        self._running.add(task.signals)
+        task.signals.done.connect(lambda: self._running.discard(task.signals))
+        self.pool.start(task)
+        return task
+
+class BulkSendWorker(QThread):
+    """Runs a SendQueue job through a BulkInvoiceSender on a background thread."""
+    # (invoice_info, error message or "" on success), emitted once per invoice
+    invoice_sent = pyqtSignal(dict, str)
+    # (success_count, failed_entries), emitted once every in-flight send has drained
+    sending_finished = pyqtSignal(int, list)
+
+    # the error raised while obtaining an access token, before anything was sent
+    sending_failed = pyqtSignal(object)
+
+    def __init__(self, invoice_api, get_access_token, send_queue, job_id: int, parent=None):
+        super().__init__(parent)
+        self.sender_engine = BulkInvoiceSender(invoice_api)
+        self.get_access_token = get_access_token
+        self.send_queue = send_queue
+        self.job_id = job_id
+
+    def cancel(self):
+        self.sender_engine.cancel()
+
+    def run(self):
+        try:
+            access_token = self.get_access_token()
+        except Exception as e:
+            self.sending_failed.emit(e)
+            return
+        success_count, failed_entries = self.sender_engine.run_job(
+            access_token,
+            self.send_queue,
+            self.job_id,
+            on_result=lambda info, error: self.invoice_sent.emit(info, error or "")
+        )
+        self.sending_finished.emit(success_count, failed_entries)